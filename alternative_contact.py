@@ -7,11 +7,13 @@ When email is not found on product page:
 """
 
 import re
-import requests
+from urllib.parse import quote
 from bs4 import BeautifulSoup
 from typing import Optional, Dict
 import time
 
+from http_client import get_sync_client
+
 class AlternativeContactFinder:
     """Find vendor contact info through alternative methods"""
     
@@ -19,6 +21,8 @@ class AlternativeContactFinder:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # Shared keep-alive pool (this class is built once per vendor)
+        self.http = get_sync_client()
     
     def find_contact_email(self, vendor_name: str, product_url: str = None) -> Optional[str]:
         """
@@ -54,9 +58,9 @@ class AlternativeContactFinder:
         try:
             # Clean vendor name for search
             search_query = f'"{vendor_name}" contact email'
-            search_url = f"https://www.google.com/search?q={requests.utils.quote(search_query)}"
+            search_url = f"https://www.google.com/search?q={quote(search_query)}"
             
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = self.http.get(search_url, headers=self.headers, timeout=10)
             
             if response.status_code != 200:
                 return None
@@ -100,7 +104,7 @@ class AlternativeContactFinder:
     def _scrape_website_for_email(self, url: str, vendor_name: str) -> Optional[str]:
         """Scrape a website contact page for email"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             
             if response.status_code != 200:
                 return None
@@ -134,7 +138,7 @@ class AlternativeContactFinder:
             
             print(f"    → Checking vendor profile: {vendor_profile[:60]}...")
             
-            response = requests.get(vendor_profile, headers=self.headers, timeout=10)
+            response = self.http.get(vendor_profile, headers=self.headers, timeout=10)
             
             if response.status_code != 200:
                 return None
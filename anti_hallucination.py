@@ -9,6 +9,9 @@ import json
 from typing import Dict, Any, Tuple, List
 from datetime import datetime
 
+from text_matching import compile_any
+from vendor_history import VendorHistory
+
 class DataQualityChecker:
     """Detects fake/placeholder/hallucinated data"""
     
@@ -49,6 +52,17 @@ class DataQualityChecker:
         'chinese_company': r'(Shenzhen|Guangzhou|Dongguan|Foshan|Beijing|Shanghai).+(Co\.|Ltd\.|Technology|Electronics|Display)',
     }
     
+    # Compiled once: one regex per pattern list
+    PLACEHOLDER_REGEX = {
+        'email': compile_any(PLACEHOLDER_PATTERNS['email'], re.IGNORECASE),
+        'url': compile_any(PLACEHOLDER_PATTERNS['url'], re.IGNORECASE),
+        'vendor_name': compile_any(PLACEHOLDER_PATTERNS['vendor_name'], re.IGNORECASE),
+    }
+    REAL_DATA_REGEX = {
+        'url': re.compile(REAL_DATA_PATTERNS['url']),
+        'chinese_company': re.compile(REAL_DATA_PATTERNS['chinese_company']),
+    }
+    
     @staticmethod
     def is_placeholder_email(email: str, vendor_name: str = None) -> Tuple[bool, str]:
         """Check if email is a placeholder or fabricated from vendor name"""
@@ -56,9 +70,8 @@ class DataQualityChecker:
             return True, "Email is null/None"
         
         # Check known placeholder patterns
-        for pattern in DataQualityChecker.PLACEHOLDER_PATTERNS['email']:
-            if re.match(pattern, email, re.IGNORECASE):
-                return True, f"Placeholder email pattern: {email}"
+        if DataQualityChecker.PLACEHOLDER_REGEX['email'].match(email):
+            return True, f"Placeholder email pattern: {email}"
         
         # NEW: Check if email was fabricated from vendor name
         # Example: "Shenzhen HYY Technology" -> sales@shenzhyy.com or sales@hyytech.com
@@ -96,12 +109,11 @@ class DataQualityChecker:
         if not url or url == "null" or url == "None":
             return True, "URL is null/None"
         
-        for pattern in DataQualityChecker.PLACEHOLDER_PATTERNS['url']:
-            if re.match(pattern, url, re.IGNORECASE):
-                return True, f"Placeholder URL pattern: {url}"
+        if DataQualityChecker.PLACEHOLDER_REGEX['url'].match(url):
+            return True, f"Placeholder URL pattern: {url}"
         
         # Check if it's a real URL
-        if not re.match(DataQualityChecker.REAL_DATA_PATTERNS['url'], url):
+        if not DataQualityChecker.REAL_DATA_REGEX['url'].match(url):
             return True, "URL doesn't match real URL format"
         
         return False, "URL appears real"
@@ -128,12 +140,11 @@ class DataQualityChecker:
         if not name or name == "null" or name == "None":
             return True, "Vendor name is null/None"
         
-        for pattern in DataQualityChecker.PLACEHOLDER_PATTERNS['vendor_name']:
-            if re.match(pattern, name, re.IGNORECASE):
-                return True, f"Generic vendor name: {name}"
+        if DataQualityChecker.PLACEHOLDER_REGEX['vendor_name'].match(name):
+            return True, f"Generic vendor name: {name}"
         
         # Check if it looks like a real Chinese company
-        if re.search(DataQualityChecker.REAL_DATA_PATTERNS['chinese_company'], name):
+        if DataQualityChecker.REAL_DATA_REGEX['chinese_company'].search(name):
             return False, "Vendor name matches Chinese company pattern"
         
         # Too short names are suspicious
@@ -143,32 +154,32 @@ class DataQualityChecker:
         return False, "Vendor name appears real"
     
     @staticmethod
-    def check_data_uniqueness(data: Dict[str, Any], historical_data: List[Dict[str, Any]]) -> Tuple[bool, str]:
-        """Check if this data is unique (not a duplicate hallucination)"""
+    def check_data_uniqueness(data: Dict[str, Any], historical_data) -> Tuple[bool, str]:
+        """
+        Check if this data is unique (not a duplicate hallucination)
+        historical_data: VendorHistory (hash-map lookups) or a list of vendor dicts
+        """
+        history = VendorHistory.of(historical_data)
         
         # If we see the same email for multiple vendors, it's likely hallucinated
         current_email = data.get('contact_email')
         if current_email:
-            email_count = sum(1 for h in historical_data if h.get('contact_email') == current_email)
+            email_count = history.email_count(current_email)
             if email_count > 3:  # Same email for 3+ vendors = suspicious
                 return False, f"Email '{current_email}' appears in {email_count} vendors (likely hallucinated)"
         
         # If we see the same price for multiple vendors, suspicious
         current_price = data.get('price_per_unit')
         if current_price:
-            price_count = sum(1 for h in historical_data 
-                            if h.get('price_per_unit') == current_price)
+            price_count = history.price_count(current_price)
             if price_count > 5:  # Same exact price for 5+ vendors = suspicious
                 return False, f"Price ${current_price} appears in {price_count} vendors (likely hallucinated)"
         
         # If vendor name + product URL combo exists, it's a duplicate
         vendor_name = data.get('vendor_name')
         product_url = data.get('product_url')
-        if vendor_name and product_url:
-            for h in historical_data:
-                if (h.get('vendor_name') == vendor_name and 
-                    h.get('product_url') == product_url):
-                    return False, f"Duplicate: {vendor_name} + {product_url}"
+        if vendor_name and product_url and history.has_pair(vendor_name, product_url):
+            return False, f"Duplicate: {vendor_name} + {product_url}"
         
         return True, "Data appears unique"
     
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-vendor text scanning, before vs after text_matching.py
+Compares the old inline checks (repeated lowercasing, any(word in ...) lists,
+re.match over pattern lists, red-flag loop) with the shared matchers.
+No network, no Ollama.
+
+Usage:
+    python benchmark_text_matching.py [vendors]
+"""
+
+import re
+import sys
+import time
+
+from anti_hallucination import DataQualityChecker
+from config import RED_FLAGS
+from rule_extractor import CARD_KEYWORDS, RuleBasedExtractor
+from text_matching import AHOCORASICK_AVAILABLE, keyword_matcher
+
+SAMPLE_CARD = """Vendor/Supplier: Shenzhen {n} Display Technology Co., Ltd.
+Title: 15.6 Inch Android 11 Wall Mount Smart Display with PoE and NFC
+Price: US$ 78-95 / Piece
+MOQ: 10 Pieces
+Product URL: https://www.made-in-china.com/product/{n}/smart-display.html
+
+FULL PRODUCT CARD TEXT:
+15.6 inch IPS 1920x1080 capacitive touch screen, RK3568 quad core, 2GB RAM 16GB ROM,
+Android 11, PoE power, 12V DC adapter, VESA 75 wall mount bracket, 5MP front camera,
+OEM/ODM customization of logo and boot animation, digital signage CMS supported.
+Contact: sales{n}@szdisplay{n}.com
+""" * 3
+
+LEGACY_KEYWORD_LISTS = [
+    ['android'],
+    ['non-touch', 'without touch', 'no touch'],
+    ['touch screen', 'touchscreen', 'touch panel', 'capacitive'],
+    ['front camera', 'front-facing camera', 'webcam'],
+    ['wall mount', 'wall-mount', 'vesa', 'bracket'],
+    ['portable', 'handheld', 'tablet pc'],
+    ['no battery', 'without battery', 'battery-free', 'battery free'],
+    ['battery', 'rechargeable', 'built-in battery'],
+    ['dc adapter', '12v', 'wall powered', 'ac adapter'],
+    ['digital signage', 'smart display', 'advertising display', 'menu board'],
+    ['tablet pc', 'portable tablet'],
+    ['made-in-china', 'alibaba', 'globalsources'],
+]
+
+
+def legacy_scan(raw_text: str, data: dict) -> tuple:
+    """The per-vendor scanning as it was done before (one lowercase + search per call site)"""
+    keywords = tuple(any(word in raw_text.lower() for word in words) for words in LEGACY_KEYWORD_LISTS)
+
+    # Placeholder checks: re.match over each pattern string
+    email = data['contact_email']
+    placeholder = any(re.match(p, email, re.IGNORECASE) for p in DataQualityChecker.PLACEHOLDER_PATTERNS['email'])
+    placeholder |= any(re.match(p, data['product_url'], re.IGNORECASE)
+                       for p in DataQualityChecker.PLACEHOLDER_PATTERNS['url'])
+    placeholder |= any(re.match(p, data['vendor_name'], re.IGNORECASE)
+                       for p in DataQualityChecker.PLACEHOLDER_PATTERNS['vendor_name'])
+
+    # Red flags: one lowercase + substring search per flag
+    description = data['description'].lower()
+    flags = [flag for flag in RED_FLAGS if flag.lower() in description]
+
+    # Factual check: source lowercased per critical field
+    factual = [str(data[field]).lower() in raw_text.lower() for field in ('vendor_name', 'price_per_unit')]
+    return keywords, placeholder, flags, factual
+
+
+def shared_scan(raw_text: str, data: dict) -> tuple:
+    """Same answers through text_matching (one lowercase, one scan, compiled patterns)"""
+    text_lower = raw_text.lower()
+    hits = CARD_KEYWORDS.scan(text_lower, lowered=True)
+    keywords = tuple(hits.any(group) for group in CARD_KEYWORDS.groups)
+
+    regex = DataQualityChecker.PLACEHOLDER_REGEX
+    placeholder = bool(regex['email'].match(data['contact_email']) or regex['url'].match(data['product_url'])
+                       or regex['vendor_name'].match(data['vendor_name']))
+
+    flag_hits = keyword_matcher(tuple(RED_FLAGS)).scan(data['description'])
+    flags = [flag for flag in RED_FLAGS if flag.lower() in flag_hits.found]
+
+    factual = [str(data[field]).lower() in text_lower for field in ('vendor_name', 'price_per_unit')]
+    return keywords, placeholder, flags, factual
+
+
+def run(vendors: int = 2000):
+    cards = [SAMPLE_CARD.format(n=n) for n in range(vendors)]
+    extractor = RuleBasedExtractor()
+    records = [extractor.extract(card)[0] for card in cards]
+    for record in records:
+        record['description'] = (record['description'] or '') + ' wall mounted, no battery, tablet pc'
+
+    for card, record in zip(cards, records):
+        assert legacy_scan(card, record) == shared_scan(card, record), "Matchers disagree"
+
+    timings = {}
+    for name, scan in (('legacy', legacy_scan), ('text_matching', shared_scan)):
+        start = time.perf_counter()
+        for card, record in zip(cards, records):
+            scan(card, record)
+        timings[name] = (time.perf_counter() - start) / vendors * 1e6
+
+    saving = timings['legacy'] - timings['text_matching']
+    print(f"Text scanning, {vendors} vendors, {len(cards[0])} chars/card "
+          f"(Aho-Corasick: {'pyahocorasick' if AHOCORASICK_AVAILABLE else 'not installed, substring fallback'})")
+    print(f"  legacy:        {timings['legacy']:8.1f} µs/vendor")
+    print(f"  text_matching: {timings['text_matching']:8.1f} µs/vendor")
+    print(f"  saving:        {saving:8.1f} µs/vendor ({saving / timings['legacy'] * 100:.0f}%)")
+    return timings
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - Shared Playwright Chromium for the scrapers
+Launches Chromium ONCE per run and hands out isolated pages per search
+(instead of a cold Chromium start for every keyword)
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+# Optional import - only needed if actually scraping
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+from config import BROWSER_POOL
+
+
+class _PageSlot:
+    """A browser context + page pair checked out of the pool"""
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.broken = False
+
+
+class BrowserPool:
+    """Long-lived Chromium shared by all Playwright scrapes of a run"""
+
+    def __init__(self, headless: bool = None, max_pages: int = None, max_page_uses: int = None,
+                 user_agent: str = None):
+        self.headless = BROWSER_POOL['headless'] if headless is None else headless
+        self.max_pages = max_pages or BROWSER_POOL['max_pages']
+        self.max_page_uses = max_page_uses or BROWSER_POOL['max_page_uses']
+        self.user_agent = user_agent or BROWSER_POOL['user_agent']
+
+        self._playwright = None
+        self._browser = None
+        self._idle: List[_PageSlot] = []
+        self._lock = None
+        self._slots = None
+
+        # Timing stats so the saving vs. per-keyword launches can be measured
+        self.stats = {
+            'launches': 0,
+            'launch_seconds': [],
+            'pages_created': 0,
+            'pages_recycled': 0,
+            'page_uses': 0,
+            'page_seconds': [],
+        }
+
+    def _ensure_primitives(self):
+        """Create asyncio primitives lazily (inside the running event loop)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_pages)
+
+    async def _ensure_browser(self):
+        """Launch Chromium on first use (or relaunch if it crashed)"""
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            start = time.perf_counter()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            elapsed = time.perf_counter() - start
+
+            self._idle = []  # Slots from a dead browser are unusable
+            self.stats['launches'] += 1
+            self.stats['launch_seconds'].append(elapsed)
+            print(f"  🚀 Chromium launched in {elapsed:.2f}s (shared browser pool)")
+            return self._browser
+
+    async def _checkout(self) -> _PageSlot:
+        """Reuse an idle page or open a fresh isolated context"""
+        browser = await self._ensure_browser()
+
+        while self._idle:
+            slot = self._idle.pop()
+            if not slot.page.is_closed():
+                return slot
+
+        context = await browser.new_context(user_agent=self.user_agent)
+        page = await context.new_page()
+        self.stats['pages_created'] += 1
+        return _PageSlot(context, page)
+
+    async def _checkin(self, slot: _PageSlot):
+        """Return a page to the pool, recycling it after max_page_uses"""
+        slot.uses += 1
+
+        if slot.broken or slot.uses >= self.max_page_uses or not self._browser or not self._browser.is_connected():
+            self.stats['pages_recycled'] += 1
+            await self._close_slot(slot)
+            return
+
+        try:
+            # Keep searches isolated from each other
+            await slot.context.clear_cookies()
+            await slot.page.goto('about:blank')
+            self._idle.append(slot)
+        except Exception:
+            self.stats['pages_recycled'] += 1
+            await self._close_slot(slot)
+
+    async def _close_slot(self, slot: _PageSlot):
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Borrow a page for one search:
+            async with pool.page() as page:
+                await page.goto(url)
+        """
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("Playwright not installed")
+
+        self._ensure_primitives()
+        await self._slots.acquire()
+        slot: Optional[_PageSlot] = None
+        start = time.perf_counter()
+        try:
+            slot = await self._checkout()
+            try:
+                yield slot.page
+            except BaseException:
+                slot.broken = True
+                raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats['page_uses'] += 1
+            self.stats['page_seconds'].append(elapsed)
+            if slot is not None:
+                await self._checkin(slot)
+            self._slots.release()
+
+    async def close(self):
+        """Shut down all pages, the browser and Playwright"""
+        for slot in self._idle:
+            await self._close_slot(slot)
+        self._idle = []
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+        if self.stats['launches']:
+            print(self.get_timing_report())
+
+    def get_timing_stats(self) -> Dict:
+        """Summarize launch and per-page timings"""
+        launches = self.stats['launch_seconds']
+        pages = self.stats['page_seconds']
+        return {
+            'launches': self.stats['launches'],
+            'total_launch_seconds': sum(launches),
+            'avg_launch_seconds': sum(launches) / len(launches) if launches else 0.0,
+            'pages_created': self.stats['pages_created'],
+            'pages_recycled': self.stats['pages_recycled'],
+            'page_uses': self.stats['page_uses'],
+            'avg_page_seconds': sum(pages) / len(pages) if pages else 0.0,
+        }
+
+    def get_timing_report(self) -> str:
+        """Human-readable pool timing report"""
+        s = self.get_timing_stats()
+        # Launches avoided = every page use would have been a cold start before
+        avoided = max(0, s['page_uses'] - s['launches'])
+        return (
+            f"\n=== BROWSER POOL ===\n"
+            f"  Chromium launches: {s['launches']} (avg {s['avg_launch_seconds']:.2f}s)\n"
+            f"  Page uses: {s['page_uses']} (avg {s['avg_page_seconds']:.2f}s/page)\n"
+            f"  Pages created/recycled: {s['pages_created']}/{s['pages_recycled']}\n"
+            f"  Cold starts avoided: {avoided} (~{avoided * s['avg_launch_seconds']:.1f}s saved)\n"
+        )
@@ -153,3 +153,155 @@ RATE_LIMITS = {
     "email_daily_limit": 50,  # Max emails per day
     "max_vendors_per_day": 30  # Max new vendors to scrape per day
 }
+
+# ==================== CONCURRENT DISCOVERY ====================
+DISCOVERY = {
+    "platforms": SEARCH_PLATFORMS,  # Platforms scraped in parallel per keyword
+    "max_concurrent_requests": 4,  # Global cap on in-flight page fetches
+    "keywords_per_batch": 4,  # Keywords scraped together per batch (main_v2)
+}
+
+# Per-host politeness (token bucket): rate = requests/second, burst = bucket size
+# Hosts not listed here get 1 request per search_delay_seconds
+HOST_RATE_LIMITS = {
+    "www.alibaba.com": {"rate": 1 / 5, "burst": 1},
+    "www.made-in-china.com": {"rate": 1 / 5, "burst": 1},
+    "www.globalsources.com": {"rate": 1 / 5, "burst": 1},
+}
+
+# ==================== BROWSER POOL ====================
+BROWSER_POOL = {
+    "headless": True,  # Headless to save RAM
+    "max_pages": 2,  # Max concurrent pages in the shared Chromium (8GB RAM)
+    "max_page_uses": 5,  # Recycle a page (and its context) after N searches
+    "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+}
+
+# ==================== HTTP CLIENT ====================
+HTTP_CLIENT = {
+    "timeout_seconds": 15,  # Read timeout per request
+    "connect_timeout_seconds": 5,
+    "retries": 2,  # Extra attempts on connection errors / 429 / 5xx
+    "backoff_seconds": 1.0,  # Doubles on each retry (clients without a host rate limiter)
+    "max_retry_after_seconds": 60,  # Longer Retry-After: give up and return the 429/503
+    "max_connections": 10,  # Connection pool size (shared across hosts)
+    "max_keepalive_connections": 5,
+    "http2": True,  # Used when the h2 package is installed
+}
+
+# ==================== HTTP RESPONSE CACHE ====================
+HTTP_CACHE = {
+    "enabled": True,
+    "dir": os.path.join(DATA_DIR, "http_cache"),  # zlib-compressed bodies + SQLite index
+    "max_bytes": 200 * 1024 * 1024,  # LRU eviction above this (compressed size)
+    "offline": False,  # Serve only from cache (stale OK), never hit the network
+    # Freshness per URL class; stale entries are revalidated with ETag/Last-Modified
+    "ttl_seconds": {
+        "search": 12 * 3600,  # Search result pages change daily
+        "product": 3 * 86400,  # Product pages / cards
+        "profile": 7 * 86400,  # company-profile.html pages rarely change
+        "default": 86400,
+    },
+}
+
+# ==================== RECORD / REPLAY ====================
+REPLAY = {
+    "recordings_dir": os.path.join(DATA_DIR, "recordings"),  # One folder per recorded run
+    "format_version": 1,  # Bump when the archive layout changes
+}
+
+# ==================== LLM EXTRACTION ====================
+EXTRACTION = {
+    "batch_size": 3,  # Product cards per Ollama call (1 = one prompt per vendor)
+    "structured_output": True,  # Ollama format=<JSON schema from VENDOR_SCHEMA> (needs Ollama >= 0.5)
+}
+
+# ==================== LLM RESPONSE CACHE ====================
+LLM_CACHE = {
+    "enabled": True,
+    "db": os.path.join(DATA_DIR, "llm_cache.db"),  # Keyed on (model, temperature, prompt hash)
+    "max_entries": 20000,  # LRU eviction above this
+}
+
+# ==================== RULE-BASED PRE-EXTRACTION ====================
+RULE_EXTRACTION = {
+    "min_confidence": 0.7,  # Fields below this go to a targeted LLM prompt
+}
+
+# ==================== PARALLEL AGENT RUNNER ====================
+AGENT_RUNNER = {
+    # Vendors extracted concurrently (the pipeline's extract workers); match Ollama's
+    # OLLAMA_NUM_PARALLEL (more workers than Ollama slots just queue inside Ollama)
+    "concurrency": int(os.getenv("OLLAMA_NUM_PARALLEL", "2")),
+}
+
+# ==================== STREAMING PIPELINE ====================
+PIPELINE = {
+    "queue_size": 20,  # Bounded queues between stages (backpressure)
+    "results_per_keyword": 2,  # Products per keyword per platform
+    "workers": {
+        "dedupe": 1,
+        "extract": AGENT_RUNNER["concurrency"],  # One per Ollama slot
+        "score": 2,
+        "save": 1,  # Single SQLite writer
+        "notify": 1,
+    },
+}
+
+# ==================== PRE-LLM DEDUPLICATION ====================
+DEDUP = {
+    "enabled": True,
+    # Cards that were rejected / failed extraction are skipped for this many days,
+    # then retried (validation rules and prompts change)
+    "recheck_rejected_days": 30,
+}
+
+# ==================== NEAR-DUPLICATE DETECTION ====================
+MINHASH = {
+    "enabled": True,
+    "db": os.path.join(DATA_DIR, "minhash.db"),  # Signatures of saved vendors
+    "num_perm": 64,  # MinHash signature length
+    "bands": 16,  # LSH bands (64 / 16 = 4 rows → candidates from ~50% similarity)
+    "threshold": 0.7,  # Estimated Jaccard similarity that counts as the same product
+    "shingle_words": 3,  # Word n-gram size for card text
+}
+
+# ==================== PRICE / MOQ ANOMALY DETECTION ====================
+ANOMALY_DETECTION = {
+    "min_samples": 10,  # No anomaly verdicts before this many saved vendors
+    "method": "robust_z",  # "robust_z" (z_threshold) or "iqr" (Tukey fences at iqr_k)
+    "z_threshold": 3.5,  # |robust z| above this is an anomaly (log scale)
+    "iqr_k": 3.0,  # Tukey "far out" fence multiplier
+}
+
+# ==================== WRITE-BEHIND VENDOR WRITES ====================
+VENDOR_WRITER = {
+    "batch_size": 20,  # Flush once this many vendors are pending...
+    "flush_interval": 2.0,  # ...or this many seconds after the oldest pending one
+}
+
+# ==================== LLM CLIENT REGISTRY ====================
+LLM_REGISTRY = {
+    "keep_alive": -1,  # Pin the model in Ollama's memory while the agent runs (Ollama's default: unload after 5m idle)
+    "idle_keep_alive": "5m",  # Restored at exit, so the model unloads once the run is over
+    "prewarm": True,  # Load the model in the background at startup (first vendor skips the cold load)
+    "prewarm_timeout": 120,  # Seconds to wait for a cold load before giving up
+}
+
+# ==================== PROMPT COMPACTION ====================
+PROMPT_COMPACTION = {
+    "card_tokens": 512,  # Card text budget in a single-card (targeted) prompt
+    "batch_card_tokens": 256,  # Per-card budget in batch prompts (keeps 3 cards inside num_ctx)
+    # Local tokenizer.json of OLLAMA_MODEL, used only for the reported token counts (never downloaded)
+    "tokenizer_file": os.path.join(DATA_DIR, "tokenizer.json"),
+    "chars_per_token": 3.5,  # Budget estimate - identical on every install, so prompts replay byte-for-byte
+    "max_line_chars": 300,  # Longer lines (description blobs) are cut before budgeting
+}
+
+# ==================== STREAMED JSON ANSWERS ====================
+LLM_STREAMING = {
+    "enabled": True,  # Stream extraction / reply-parsing answers and disconnect at the closing brace
+    "extraction_num_predict": 768,  # Decode cap for extraction (a batch of 3 full objects fits)
+    "reply_num_predict": 256,  # Decode cap for vendor reply parsing
+    "stop": ["\nNote:", "\nExplanation:"],  # Chatter after the JSON (never valid inside a JSON string)
+}
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Database Layer - Every vendors.db connection goes through here
+- WAL journal + tuned pragmas (reporting readers don't block the writer)
+- One connection per thread and database file, reused across calls
+- Versioned migrations (schema_version table) applied once per process
+Callers keep the usual pattern:
+    conn = db.connect()
+    cursor = conn.cursor()
+    ...
+    conn.commit()
+    conn.close()   # Hands the connection back; uncommitted work is rolled back
+"""
+
+import atexit
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import VENDORS_DB
+
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # Safe with WAL; fsync at checkpoints instead of every commit
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",  # 16 MB page cache
+    "PRAGMA foreign_keys=ON",
+]
+
+_local = threading.local()
+_all_connections: List[sqlite3.Connection] = []
+_registry_lock = threading.Lock()
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+class PooledConnection:
+    """Handle on the thread's shared connection; close() returns it instead of closing"""
+
+    def __init__(self, conn: sqlite3.Connection, handles: Dict[str, int], db_path: str):
+        self._conn = conn
+        self._handles = handles
+        self._db_path = db_path
+        self._closed = False
+        self.row_factory = None  # Per handle, so one caller's sqlite3.Row doesn't leak into another's
+        handles[db_path] = handles.get(db_path, 0) + 1
+
+    def cursor(self) -> sqlite3.Cursor:
+        cursor = self._conn.cursor()
+        cursor.row_factory = self.row_factory
+        return cursor
+
+    def execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._handles[self._db_path] -= 1
+        # Same effect as closing a private connection: pending changes are discarded
+        if self._handles[self._db_path] == 0 and self._conn.in_transaction:
+            self._conn.rollback()
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _open(db_path: str) -> sqlite3.Connection:
+    # check_same_thread=False only so close_all() can run at exit; each connection stays on its thread
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    with _registry_lock:
+        _all_connections.append(conn)
+    return conn
+
+
+def connect(db_path: str = None) -> PooledConnection:
+    """This thread's connection to db_path (default vendors.db), created on first use"""
+    db_path = db_path or VENDORS_DB
+    if not hasattr(_local, 'connections'):
+        _local.connections = {}
+        _local.handles = {}
+    conn = _local.connections.get(db_path)
+    if conn is None:
+        conn = _local.connections[db_path] = _open(db_path)
+    return PooledConnection(conn, _local.handles, db_path)
+
+
+def close_all():
+    """Checkpoint the WAL into the main file and close every connection (runs at exit)"""
+    with _registry_lock:
+        connections = list(_all_connections)
+        _all_connections.clear()
+    for conn in connections:
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.close()
+        except sqlite3.Error:
+            pass
+    if hasattr(_local, 'connections'):
+        _local.connections.clear()
+
+
+atexit.register(close_all)
+
+
+# ==================== MIGRATIONS ====================
+def column_exists(conn, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def table_exists(conn, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+
+def add_column(conn, table: str, column: str, column_type: str):
+    """ALTER TABLE ADD COLUMN unless it is already there"""
+    if not column_exists(conn, table, column):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
+def execute_all(conn, script: str):
+    """Statements one by one (executescript would COMMIT the migration's transaction)"""
+    for statement in script.split(';'):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def _base_schema(conn):
+    """vendors + validation_logs; older databases get the columns added since V1"""
+    execute_all(conn, """
+        CREATE TABLE IF NOT EXISTS vendors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vendor_name TEXT NOT NULL,
+            url TEXT,
+            platform TEXT,
+            moq INTEGER,
+            price_per_unit REAL,
+            customizable BOOLEAN,
+            os TEXT,
+            screen_size TEXT,
+            touchscreen BOOLEAN,
+            camera_front BOOLEAN,
+            wall_mount BOOLEAN,
+            has_battery BOOLEAN,
+            product_type TEXT,
+            score INTEGER,
+            status TEXT,
+            raw_data TEXT,
+            contacted BOOLEAN DEFAULT 0,
+            contact_date TEXT,
+            reply_received BOOLEAN DEFAULT 0,
+            reply_date TEXT,
+            reply_content TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            -- Learning and conversation features
+            discovered_date TEXT,
+            contact_email TEXT,
+            product_description TEXT,
+            product_name TEXT,
+            product_url TEXT,
+            keywords_used TEXT,
+            validation_status TEXT,
+            rejection_reason TEXT,
+            email_sent_count INTEGER DEFAULT 0,
+            last_email_date TEXT,
+            email_response TEXT,
+            price_quoted REAL,
+            moq_quoted INTEGER,
+            customization_confirmed TEXT,
+            response_time_hours REAL,
+            last_response_date TEXT,
+            content_fingerprint TEXT,
+            -- Deduplication tracking
+            UNIQUE(vendor_name, product_url)
+        );
+        CREATE TABLE IF NOT EXISTS validation_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vendor_id INTEGER,
+            validation_passed BOOLEAN,
+            layer_results TEXT,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (vendor_id) REFERENCES vendors (id)
+        )
+    """)
+    # Formerly migrate_database.py and the ALTER in setup_database
+    for column, column_type in [
+        ("discovered_date", "TEXT"), ("contact_email", "TEXT"), ("product_description", "TEXT"),
+        ("product_name", "TEXT"), ("product_url", "TEXT"), ("keywords_used", "TEXT"),
+        ("validation_status", "TEXT"), ("rejection_reason", "TEXT"),
+        ("email_sent_count", "INTEGER DEFAULT 0"), ("last_email_date", "TEXT"),
+        ("email_response", "TEXT"), ("price_quoted", "REAL"), ("moq_quoted", "INTEGER"),
+        ("customization_confirmed", "TEXT"), ("response_time_hours", "REAL"),
+        ("last_response_date", "TEXT"), ("wall_mount", "BOOLEAN"), ("has_battery", "BOOLEAN"),
+        ("product_type", "TEXT"), ("content_fingerprint", "TEXT"),
+    ]:
+        add_column(conn, "vendors", column, column_type)
+
+
+def _feedback_schema(conn):
+    """
+    Human feedback columns + learned pattern tables (formerly created by every collector)
+    feedback_patterns: Telegram collectors (feature, sentiment) counts
+    relevance_patterns: FeedbackCollector (pattern, impact) confidences - it used to
+    share the feedback_patterns name with an incompatible schema
+    """
+    for column in ("human_feedback", "feedback_reason", "feedback_date", "feedback_notes"):
+        add_column(conn, "vendors", column, "TEXT")
+    add_column(conn, "vendors", "telegram_message_id", "INTEGER")
+
+    if table_exists(conn, "feedback_patterns") and column_exists(conn, "feedback_patterns", "pattern_type"):
+        conn.execute("ALTER TABLE feedback_patterns RENAME TO relevance_patterns")
+    execute_all(conn, """
+        CREATE TABLE IF NOT EXISTS feedback_patterns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature_type TEXT NOT NULL,
+            feature_value TEXT NOT NULL,
+            sentiment TEXT NOT NULL,
+            count INTEGER DEFAULT 1,
+            last_seen TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(feature_type, feature_value, sentiment)
+        );
+        CREATE TABLE IF NOT EXISTS relevance_patterns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pattern_type TEXT NOT NULL,
+            pattern_value TEXT NOT NULL,
+            relevance_impact TEXT NOT NULL,
+            confidence REAL DEFAULT 0.5,
+            sample_count INTEGER DEFAULT 1,
+            last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(pattern_type, pattern_value)
+        )
+    """)
+
+
+def _hot_column_indexes(conn):
+    """Indexes for the columns reporters, outreach and feedback filter on"""
+    _base_schema(conn)  # A new database has no vendors table yet: this is its first migration
+    for column, column_type in [("telegram_message_id", "INTEGER"), ("last_response_date", "TEXT"),
+                                ("email_sent_count", "INTEGER DEFAULT 0"), ("discovered_date", "TEXT"),
+                                ("contact_email", "TEXT"), ("response_time_hours", "REAL")]:
+        add_column(conn, "vendors", column, column_type)
+    execute_all(conn, """
+        CREATE INDEX IF NOT EXISTS idx_vendors_name_date ON vendors(vendor_name, discovered_date);
+        CREATE INDEX IF NOT EXISTS idx_vendors_date_score ON vendors(discovered_date, score, vendor_name);
+        CREATE INDEX IF NOT EXISTS idx_vendors_score ON vendors(score);
+        CREATE INDEX IF NOT EXISTS idx_vendors_contact_email ON vendors(contact_email);
+        CREATE INDEX IF NOT EXISTS idx_vendors_telegram_message ON vendors(telegram_message_id);
+        CREATE INDEX IF NOT EXISTS idx_vendors_last_response ON vendors(last_response_date, response_time_hours);
+        CREATE INDEX IF NOT EXISTS idx_vendors_outreach ON vendors(email_sent_count, score);
+        CREATE INDEX IF NOT EXISTS idx_validation_logs_vendor ON validation_logs(vendor_id)
+    """)
+
+
+# Old wide-row columns → (normalized table alias, column); the vendors view keeps these names
+VENDOR_VIEW_COLUMNS = [
+    ("id", "p.id"), ("vendor_name", "c.name"), ("url", "c.url"), ("platform", "c.platform"),
+    ("moq", "p.moq"), ("price_per_unit", "p.price_per_unit"), ("customizable", "p.customizable"),
+    ("os", "p.os"), ("screen_size", "p.screen_size"), ("touchscreen", "p.touchscreen"),
+    ("camera_front", "p.camera_front"), ("wall_mount", "p.wall_mount"), ("has_battery", "p.has_battery"),
+    ("product_type", "p.product_type"), ("score", "p.score"), ("status", "p.status"),
+    ("raw_data", "p.raw_data"), ("contacted", "COALESCE(ct.contacted, 0)"),
+    ("contact_date", "ct.contact_date"), ("reply_received", "COALESCE(cv.reply_received, 0)"),
+    ("reply_date", "cv.reply_date"), ("reply_content", "cv.reply_content"),
+    ("created_at", "p.created_at"), ("updated_at", "p.updated_at"),
+    ("discovered_date", "p.discovered_date"), ("contact_email", "ct.email"),
+    ("product_description", "p.product_description"), ("product_name", "p.product_name"),
+    ("product_url", "p.product_url"), ("keywords_used", "p.keywords_used"),
+    ("validation_status", "p.validation_status"), ("rejection_reason", "p.rejection_reason"),
+    ("email_sent_count", "COALESCE(ct.email_sent_count, 0)"), ("last_email_date", "ct.last_email_date"),
+    ("email_response", "cv.email_response"), ("price_quoted", "cv.price_quoted"),
+    ("moq_quoted", "cv.moq_quoted"), ("customization_confirmed", "cv.customization_confirmed"),
+    ("response_time_hours", "cv.response_time_hours"), ("last_response_date", "cv.last_response_date"),
+    ("content_fingerprint", "p.content_fingerprint"), ("human_feedback", "p.human_feedback"),
+    ("feedback_reason", "p.feedback_reason"), ("feedback_date", "p.feedback_date"),
+    ("feedback_notes", "p.feedback_notes"), ("telegram_message_id", "p.telegram_message_id"),
+]
+PRODUCT_COLUMNS = [column for column, source in VENDOR_VIEW_COLUMNS if source.startswith("p.")]
+
+
+def _normalize_vendors(conn):
+    """
+    Split the wide vendors row (company × product × outreach × reply state) into
+    companies / products / contacts / conversations; `vendors` becomes a read-only view
+    products keep the old vendors.id, so validation_logs, Telegram and near-duplicate keys stay valid
+    """
+    execute_all(conn, """
+        CREATE TABLE IF NOT EXISTS companies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            url TEXT,
+            platform TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL REFERENCES companies (id),
+            email TEXT NOT NULL,
+            contacted BOOLEAN DEFAULT 0,
+            contact_date TEXT,
+            email_sent_count INTEGER DEFAULT 0,
+            last_email_date TEXT,
+            UNIQUE(company_id, email)
+        );
+        CREATE TABLE IF NOT EXISTS conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL UNIQUE REFERENCES companies (id),
+            reply_received BOOLEAN DEFAULT 0,
+            reply_date TEXT,
+            reply_content TEXT,
+            email_response TEXT,
+            price_quoted REAL,
+            moq_quoted INTEGER,
+            customization_confirmed TEXT,
+            response_time_hours REAL,
+            last_response_date TEXT
+        );
+        CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_id INTEGER NOT NULL REFERENCES companies (id),
+            contact_id INTEGER REFERENCES contacts (id),
+            product_name TEXT,
+            product_url TEXT,
+            product_description TEXT,
+            moq INTEGER,
+            price_per_unit REAL,
+            customizable BOOLEAN,
+            os TEXT,
+            screen_size TEXT,
+            touchscreen BOOLEAN,
+            camera_front BOOLEAN,
+            wall_mount BOOLEAN,
+            has_battery BOOLEAN,
+            product_type TEXT,
+            score INTEGER,
+            status TEXT,
+            raw_data TEXT,
+            discovered_date TEXT,
+            keywords_used TEXT,
+            validation_status TEXT,
+            rejection_reason TEXT,
+            content_fingerprint TEXT,
+            human_feedback TEXT,
+            feedback_reason TEXT,
+            feedback_date TEXT,
+            feedback_notes TEXT,
+            telegram_message_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(company_id, product_url)
+        )
+    """)
+
+    if table_exists(conn, "vendors"):
+        execute_all(conn, """
+            INSERT OR IGNORE INTO companies (name, url, platform, created_at)
+                SELECT vendor_name, MAX(url), MAX(platform), MIN(created_at) FROM vendors GROUP BY vendor_name;
+            INSERT OR IGNORE INTO contacts (company_id, email, contacted, contact_date, email_sent_count, last_email_date)
+                SELECT c.id, v.contact_email, MAX(COALESCE(v.contacted, 0)), MAX(v.contact_date),
+                       MAX(COALESCE(v.email_sent_count, 0)), MAX(v.last_email_date)
+                FROM vendors v JOIN companies c ON c.name = v.vendor_name
+                WHERE v.contact_email IS NOT NULL AND v.contact_email != ''
+                GROUP BY c.id, v.contact_email;
+            INSERT OR IGNORE INTO conversations (company_id, reply_received, reply_date, reply_content, email_response,
+                                                 price_quoted, moq_quoted, customization_confirmed,
+                                                 response_time_hours, last_response_date)
+                SELECT c.id, MAX(COALESCE(v.reply_received, 0)), MAX(v.reply_date), MAX(v.reply_content),
+                       MAX(v.email_response), MAX(v.price_quoted), MAX(v.moq_quoted),
+                       MAX(v.customization_confirmed), MIN(v.response_time_hours), MAX(v.last_response_date)
+                FROM vendors v JOIN companies c ON c.name = v.vendor_name
+                WHERE v.reply_received OR v.email_response IS NOT NULL OR v.last_response_date IS NOT NULL
+                GROUP BY c.id
+        """)
+        columns = ', '.join(PRODUCT_COLUMNS)
+        conn.execute(f"""
+            INSERT INTO products (company_id, contact_id, {columns})
+            SELECT c.id, ct.id, {', '.join('v.' + column for column in PRODUCT_COLUMNS)}
+            FROM vendors v
+            JOIN companies c ON c.name = v.vendor_name
+            LEFT JOIN contacts ct ON ct.company_id = c.id AND ct.email = v.contact_email
+        """)
+
+        # validation_logs pointed at vendors(id); rebuild it against products(id)
+        execute_all(conn, """
+            CREATE TABLE validation_logs_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                vendor_id INTEGER,
+                validation_passed BOOLEAN,
+                layer_results TEXT,
+                timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (vendor_id) REFERENCES products (id)
+            );
+            INSERT INTO validation_logs_new (id, vendor_id, validation_passed, layer_results, timestamp)
+                SELECT id, CASE WHEN vendor_id IN (SELECT id FROM products) THEN vendor_id END,
+                       validation_passed, layer_results, timestamp
+                FROM validation_logs;
+            DROP TABLE validation_logs;
+            ALTER TABLE validation_logs_new RENAME TO validation_logs;
+            DROP TABLE vendors
+        """)
+
+    conn.execute("DROP VIEW IF EXISTS vendors")
+    conn.execute(f"""
+        CREATE VIEW vendors AS
+        SELECT {', '.join(f'{source} AS {column}' for column, source in VENDOR_VIEW_COLUMNS)}
+        FROM products p
+        JOIN companies c ON c.id = p.company_id
+        LEFT JOIN contacts ct ON ct.id = p.contact_id
+        LEFT JOIN conversations cv ON cv.company_id = p.company_id
+    """)
+    execute_all(conn, """
+        CREATE INDEX IF NOT EXISTS idx_products_company ON products(company_id, score);
+        CREATE INDEX IF NOT EXISTS idx_products_date_score ON products(discovered_date, score, company_id);
+        CREATE INDEX IF NOT EXISTS idx_products_score ON products(score);
+        CREATE INDEX IF NOT EXISTS idx_products_contact ON products(contact_id, score);
+        CREATE INDEX IF NOT EXISTS idx_products_telegram_message ON products(telegram_message_id);
+        CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email);
+        CREATE INDEX IF NOT EXISTS idx_contacts_outreach ON contacts(email_sent_count, last_email_date);
+        CREATE INDEX IF NOT EXISTS idx_conversations_last_response ON conversations(last_response_date, response_time_hours);
+        CREATE INDEX IF NOT EXISTS idx_validation_logs_vendor ON validation_logs(vendor_id)
+    """)
+
+
+def _pipeline_state_tables(conn):
+    """
+    Tables the pipeline keeps next to the vendors (formerly created on every connect/save)
+    seen_cards: DedupIndex cards already judged (fingerprint → outcome)
+    running_stats: VendorStats P² quantile state per metric
+    """
+    execute_all(conn, """
+        CREATE TABLE IF NOT EXISTS seen_cards (
+            fingerprint TEXT PRIMARY KEY,
+            vendor_name TEXT,
+            product_url TEXT,
+            outcome TEXT,
+            last_seen REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS running_stats (
+            metric TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            updated_at TEXT
+        )
+    """)
+
+
+# (version, description, migration) - append only, never renumber; every migration must be idempotent
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "indexes on hot vendor columns", _hot_column_indexes),
+    (2, "base vendors / validation_logs schema", _base_schema),
+    (3, "human feedback columns and pattern tables", _feedback_schema),
+    (4, "normalize vendors into companies / products / contacts / conversations", _normalize_vendors),
+    (5, "seen_cards and running_stats tables", _pipeline_state_tables),
+]
+
+
+def migrate(db_path: str = None) -> int:
+    """Apply pending migrations in order, each in its own transaction; returns the schema version"""
+    db_path = db_path or VENDORS_DB
+    conn = connect(db_path)
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.commit()
+        current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+        for version, description, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            try:
+                conn.execute("BEGIN")  # DDL included: a failed migration leaves nothing behind
+                migration(conn)
+                conn.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                             (version, description))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            print(f"  🗄️  Migration {version}: {description}")
+            current = version
+        return current
+    finally:
+        conn.close()
+
+
+def ensure_schema(db_path: str = None):
+    """migrate() once per process and database file - cheap to call from constructors"""
+    db_path = db_path or VENDORS_DB
+    with _migrate_lock:
+        if db_path not in _migrated:
+            migrate(db_path)
+            _migrated.add(db_path)
+
+
+# ==================== NORMALIZED VENDOR WRITES ====================
+def _insert_or_get(conn, insert_sql: str, insert_args: Tuple, select_sql: str, select_args: Tuple) -> int:
+    cursor = conn.execute(insert_sql, insert_args)
+    if cursor.rowcount == 1:
+        return cursor.lastrowid
+    return conn.execute(select_sql, select_args).fetchone()[0]
+
+
+def upsert_company(conn, name: str, url: str = None, platform: str = None) -> int:
+    """companies.id for a vendor name (created on first sight)"""
+    return _insert_or_get(conn, "INSERT OR IGNORE INTO companies (name, url, platform) VALUES (?, ?, ?)",
+                          (name, url, platform), "SELECT id FROM companies WHERE name = ?", (name,))
+
+
+def upsert_contact(conn, company_id: int, email: str) -> int:
+    """contacts.id for one email address of a company"""
+    return _insert_or_get(conn, "INSERT OR IGNORE INTO contacts (company_id, email) VALUES (?, ?)",
+                          (company_id, email),
+                          "SELECT id FROM contacts WHERE company_id = ? AND email = ?", (company_id, email))
+
+
+def upsert_conversation(conn, company_id: int, **fields):
+    """Set reply state on the company's single conversations row"""
+    columns = list(fields)
+    conn.execute(
+        f"INSERT INTO conversations (company_id, {', '.join(columns)}) "
+        f"VALUES (?, {', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(company_id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns)}",
+        (company_id, *fields.values())
+    )
+
+
+def company_id_of(conn, vendor_id: int = None, vendor_name: str = None) -> Optional[int]:
+    """companies.id from a vendors/products id or a vendor name"""
+    if vendor_id is not None:
+        row = conn.execute("SELECT company_id FROM products WHERE id = ?", (vendor_id,)).fetchone()
+    else:
+        row = conn.execute("SELECT id FROM companies WHERE name = ?", (vendor_name,)).fetchone()
+    return row[0] if row else None
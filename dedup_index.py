@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pre-LLM Deduplication Index - Skip already-known vendors before extraction
+Loaded once per run from the vendors table (+ cards seen in earlier runs):
+- normalized product URLs
+- normalized vendor names
+- content fingerprints of the scraped card text
+Checked straight after scraping, so repeats across overlapping
+SEARCH_KEYWORDS never cost an LLM call
+"""
+
+import hashlib
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import db
+from config import VENDORS_DB, DEDUP
+
+WHITESPACE = re.compile(r'\s+')
+NON_WORD = re.compile(r'[^\w\s]')
+COMPANY_SUFFIXES = re.compile(
+    r'\b(co|company|ltd|limited|inc|corp|corporation|llc|group|factory|'
+    r'technology|technologies|tech|electronics?|industrial|manufacturing)\b'
+)
+
+
+def normalize_url(url: Optional[str]) -> str:
+    """Host + path, lowercase, no scheme/www/query/fragment/trailing slash"""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip() if '//' in url else '//' + url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.rstrip('/')
+    return f"{host}{path.lower()}" if host else ''
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """'Shenzhen ABC Technology Co., Ltd.' → 'shenzhen abc'"""
+    if not name:
+        return ''
+    name = NON_WORD.sub(' ', name.lower())
+    name = COMPANY_SUFFIXES.sub(' ', name)
+    return WHITESPACE.sub(' ', name).strip()
+
+
+def content_fingerprint(raw_text: Optional[str]) -> str:
+    """Hash of the card text, insensitive to case and whitespace"""
+    text = WHITESPACE.sub(' ', (raw_text or '').lower()).strip()
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class DedupIndex:
+    """In-memory sets of known URLs / names / fingerprints, backed by vendors.db"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or VENDORS_DB
+        self.urls = set()
+        self.names_without_url = set()  # Vendors saved without a product page
+        self.fingerprints = set()
+        self._lock = threading.Lock()
+        self.stats = {'loaded': 0, 'checked': 0, 'url': 0, 'name': 0, 'fingerprint': 0}
+        db.ensure_schema(self.db_path)  # vendors view + seen_cards: db.py migrations, once per process
+
+    @classmethod
+    def load(cls, db_path: str = None) -> 'DedupIndex':
+        index = cls(db_path)
+        index._load()
+        return index
+
+    def _load(self):
+        conn = db.connect(self.db_path)
+        try:
+            rows = conn.execute("SELECT vendor_name, product_url, content_fingerprint FROM vendors").fetchall()
+            for vendor_name, product_url, fingerprint in rows:
+                self._add(vendor_name, product_url, fingerprint)
+            self.stats['loaded'] = len(rows)
+
+            # Rejected / failed cards are retried once they are old enough
+            cutoff = time.time() - DEDUP['recheck_rejected_days'] * 86400
+            for (fingerprint,) in conn.execute(
+                    "SELECT fingerprint FROM seen_cards WHERE outcome = 'saved' OR last_seen >= ?", (cutoff,)):
+                self.fingerprints.add(fingerprint)
+        finally:
+            conn.close()
+
+    def _add(self, vendor_name: str, product_url: str, fingerprint: str = None):
+        url = normalize_url(product_url)
+        if url:
+            self.urls.add(url)
+        elif normalize_name(vendor_name):
+            self.names_without_url.add(normalize_name(vendor_name))
+        if fingerprint:
+            self.fingerprints.add(fingerprint)
+
+    def check(self, vendor_data: Dict) -> Tuple[bool, str]:
+        """
+        (is_duplicate, reason) for a raw scraper dict
+        Not a duplicate → registered immediately, so later copies in this run are caught
+        """
+        fingerprint = content_fingerprint(vendor_data.get('raw_text'))
+        url = normalize_url(vendor_data.get('product_url'))
+        name = normalize_name(vendor_data.get('vendor_name'))
+
+        with self._lock:
+            self.stats['checked'] += 1
+            if fingerprint in self.fingerprints:
+                self.stats['fingerprint'] += 1
+                return True, 'same card content'
+            if url and url in self.urls:
+                self.stats['url'] += 1
+                return True, 'known product URL'
+            if not url and name and name in self.names_without_url:
+                self.stats['name'] += 1
+                return True, 'known vendor name'
+
+            self.fingerprints.add(fingerprint)
+            self._add(vendor_data.get('vendor_name'), vendor_data.get('product_url'))
+            return False, ''
+
+    def mark_processed(self, vendor_data: Dict, outcome: str):
+        """Remember a card across runs (saved cards are also in vendors, but may have been renamed by the LLM)"""
+        with self._lock:
+            conn = db.connect(self.db_path)
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO seen_cards (fingerprint, vendor_name, product_url, outcome, last_seen)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    content_fingerprint(vendor_data.get('raw_text')),
+                    vendor_data.get('vendor_name'),
+                    vendor_data.get('product_url'),
+                    outcome,
+                    time.time()
+                ))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_stats_report(self) -> str:
+        s = self.stats
+        skipped = s['url'] + s['name'] + s['fingerprint']
+        return (f"Dedup index: {s['loaded']} known vendors, {len(self.fingerprints)} fingerprints; "
+                f"skipped {skipped}/{s['checked']} cards "
+                f"({s['fingerprint']} same content, {s['url']} URL, {s['name']} name)")
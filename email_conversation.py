@@ -10,11 +10,12 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
-import sqlite3
 import re
 from typing import List, Dict, Optional
-from config import VENDORS_DB, OLLAMA_MODEL
-from langchain_ollama import OllamaLLM
+import db
+from config import VENDORS_DB, OLLAMA_MODEL, LLM_STREAMING
+from llm_registry import get_llm
+from json_stream import invoke_json
 
 class EmailConversationManager:
     """Manages ongoing email conversations with vendors"""
@@ -27,7 +28,8 @@ class EmailConversationManager:
         self.imap_server = imap_server
         self.imap_port = 993
         self.db_path = VENDORS_DB
-        self.llm = OllamaLLM(model=OLLAMA_MODEL, temperature=0.4)
+        self.llm = get_llm(OLLAMA_MODEL, temperature=0.4)  # Shared client (llm_registry.py)
+        self.parse_llm = get_llm(OLLAMA_MODEL, temperature=0.4, num_predict=LLM_STREAMING['reply_num_predict'])
     
     def check_for_replies(self, days_back: int = 7) -> List[Dict]:
         """Check email inbox for vendor replies (ONLY from contacted vendors!)"""
@@ -171,7 +173,8 @@ Output ONLY valid JSON, nothing else:
 """
         
         try:
-            response = self.llm.invoke(prompt)
+            # Streamed: generation stops at the closing brace of the JSON
+            response = invoke_json(self.parse_llm, prompt)
             
             # Try to parse JSON from response
             import json
@@ -227,7 +230,8 @@ Output ONLY the email body, no subject line:
 """
         
         try:
-            follow_up = self.llm.invoke(prompt)
+            # Not cached: each follow-up should be freshly written
+            follow_up = self.llm.invoke(prompt, use_cache=False)
             return follow_up.strip()
         except Exception as e:
             print(f"Error generating follow-up: {e}")
@@ -257,18 +261,22 @@ Output ONLY the email body, no subject line:
     
     def update_vendor_with_reply(self, vendor_name: str, reply_data: Dict):
         """Update vendor database with reply information"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         import json
         extracted = reply_data.get('extracted_data', {})
         
+        company_id = db.company_id_of(conn, vendor_name=vendor_name)
+        if company_id is None:
+            conn.close()
+            return
+        
         # Calculate response time
         cursor.execute("""
-            SELECT last_email_date FROM vendors 
-            WHERE vendor_name = ?
-            ORDER BY discovered_date DESC LIMIT 1
-        """, (vendor_name,))
+            SELECT MAX(last_email_date) FROM contacts 
+            WHERE company_id = ?
+        """, (company_id,))
         
         result = cursor.fetchone()
         response_time_hours = None
@@ -277,25 +285,16 @@ Output ONLY the email body, no subject line:
             last_email = datetime.strptime(result[0], '%Y-%m-%d')
             response_time_hours = (datetime.now() - last_email).total_seconds() / 3600
         
-        # Update vendor record
-        cursor.execute("""
-            UPDATE vendors 
-            SET email_response = ?,
-                price_quoted = ?,
-                moq_quoted = ?,
-                customization_confirmed = ?,
-                response_time_hours = ?,
-                last_response_date = ?
-            WHERE vendor_name = ?
-        """, (
-            reply_data.get('raw_body', '')[:1000],
-            extracted.get('price_quoted'),
-            extracted.get('moq'),
-            extracted.get('customization_available'),
-            response_time_hours,
-            datetime.now().strftime('%Y-%m-%d'),
-            vendor_name
-        ))
+        # Update the vendor's conversation (one row, not every product row)
+        db.upsert_conversation(
+            conn, company_id,
+            email_response=reply_data.get('raw_body', '')[:1000],
+            price_quoted=extracted.get('price_quoted'),
+            moq_quoted=extracted.get('moq'),
+            customization_confirmed=extracted.get('customization_available'),
+            response_time_hours=response_time_hours,
+            last_response_date=datetime.now().strftime('%Y-%m-%d')
+        )
         
         conn.commit()
         conn.close()
@@ -364,7 +363,7 @@ Output ONLY the email body, no subject line:
                                 results["follow_ups_sent"] += 1
                                 
                                 # Update email count in DB
-                                self._increment_email_count(vendor_name)
+                                self._increment_email_count(vendor_name, to_email)
                 
             except Exception as e:
                 results["errors"].append(str(e))
@@ -390,33 +389,34 @@ Output ONLY the email body, no subject line:
         
         return None
     
-    def _increment_email_count(self, vendor_name: str):
-        """Increment email sent count for vendor"""
-        conn = sqlite3.connect(self.db_path)
+    def _increment_email_count(self, vendor_name: str, to_email: str):
+        """Increment email sent count for the vendor contact we wrote to"""
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            UPDATE vendors 
-            SET email_sent_count = email_sent_count + 1,
-                last_email_date = ?
-            WHERE vendor_name = ?
-        """, (datetime.now().strftime('%Y-%m-%d'), vendor_name))
+        company_id = db.company_id_of(conn, vendor_name=vendor_name)
+        if company_id is not None:
+            cursor.execute("""
+                UPDATE contacts 
+                SET email_sent_count = email_sent_count + 1,
+                    last_email_date = ?
+                WHERE id = ?
+            """, (datetime.now().strftime('%Y-%m-%d'), db.upsert_contact(conn, company_id, to_email)))
         
         conn.commit()
         conn.close()
     
     def _get_contacted_vendor_emails(self) -> List[str]:
         """Get list of vendor emails we've already contacted (from database)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         # Get all vendors where we sent at least one email
         cursor.execute("""
-            SELECT DISTINCT contact_email 
-            FROM vendors 
+            SELECT DISTINCT email 
+            FROM contacts 
             WHERE email_sent_count > 0 
-            AND contact_email IS NOT NULL 
-            AND contact_email != ''
+            AND email != ''
         """)
         
         results = cursor.fetchall()
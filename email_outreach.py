@@ -5,12 +5,12 @@ Sends templated emails to vendors via Gmail SMTP
 """
 
 import smtplib
-import sqlite3
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from typing import List, Dict
 
+import db
 from config import EMAIL_TEMPLATE, VENDORS_DB, RATE_LIMITS
 
 class EmailOutreach:
@@ -64,7 +64,7 @@ class EmailOutreach:
         """Send inquiry email to a vendor"""
         
         # Get vendor details from database
-        conn = sqlite3.connect(VENDORS_DB)
+        conn = db.connect(VENDORS_DB)
         cursor = conn.cursor()
         
         cursor.execute('SELECT vendor_name FROM vendors WHERE id = ?', (vendor_id,))
@@ -76,6 +76,7 @@ class EmailOutreach:
             return False
         
         vendor_name = result[0]
+        company_id = db.company_id_of(conn, vendor_id=vendor_id)
         
         # Customize email template
         subject = "Inquiry for 15.6\" Android Touchscreen Device - Pilot Order"
@@ -85,12 +86,13 @@ class EmailOutreach:
         success = self.send_email(vendor_email, subject, body)
         
         if success:
-            # Update database
+            # Update database (outreach state lives on the contact row)
+            contact_id = db.upsert_contact(conn, company_id, vendor_email)
             cursor.execute('''
-                UPDATE vendors 
+                UPDATE contacts 
                 SET contacted = 1, contact_date = ?
                 WHERE id = ?
-            ''', (datetime.now().isoformat(), vendor_id))
+            ''', (datetime.now().isoformat(), contact_id))
             
             conn.commit()
         
@@ -107,15 +109,19 @@ class EmailOutreach:
         print("BATCH EMAIL OUTREACH")
         print("=" * 60)
         
-        conn = sqlite3.connect(VENDORS_DB)
+        conn = db.connect(VENDORS_DB)
         cursor = conn.cursor()
         
-        # Get uncontacted high-score vendors WITH contact emails
+        # Get uncontacted high-score vendors WITH contact emails (one email per contact, best product)
         cursor.execute('''
-            SELECT id, vendor_name, url, contact_email, product_name, price_per_unit, moq
-            FROM vendors
-            WHERE email_sent_count = 0 AND score >= ? AND contact_email IS NOT NULL
-            ORDER BY score DESC
+            SELECT ct.id, c.name, c.url, ct.email, p.product_name, p.price_per_unit, p.moq
+            FROM contacts ct
+            JOIN companies c ON c.id = ct.company_id
+            JOIN products p ON p.id = (
+                SELECT id FROM products WHERE contact_id = ct.id ORDER BY score DESC LIMIT 1
+            )
+            WHERE ct.email_sent_count = 0 AND p.score >= ?
+            ORDER BY p.score DESC
             LIMIT ?
         ''', (min_score, self.daily_limit))
         
@@ -132,7 +138,7 @@ class EmailOutreach:
         sent_count = 0
         failed_count = 0
         
-        for vendor_id, vendor_name, url, contact_email, product_name, price, moq in vendors:
+        for contact_id, vendor_name, url, contact_email, product_name, price, moq in vendors:
             print(f"\n→ Vendor: {vendor_name}")
             print(f"  Email: {contact_email}")
             print(f"  Product: {product_name or 'N/A'}")
@@ -167,13 +173,13 @@ class EmailOutreach:
             if success:
                 # Mark as contacted and update email tracking
                 cursor.execute('''
-                    UPDATE vendors 
+                    UPDATE contacts 
                     SET contacted = 1, 
                         contact_date = ?,
                         email_sent_count = email_sent_count + 1,
                         last_email_date = ?
                     WHERE id = ?
-                ''', (datetime.now().isoformat(), today, vendor_id))
+                ''', (datetime.now().isoformat(), today, contact_id))
                 sent_count += 1
                 print(f"  ✅ Email sent successfully!")
             else:
@@ -210,14 +216,13 @@ class EmailOutreach:
     
     def log_vendor_reply(self, vendor_id: int, reply_content: str):
         """Log a reply received from a vendor"""
-        conn = sqlite3.connect(VENDORS_DB)
-        cursor = conn.cursor()
+        conn = db.connect(VENDORS_DB)
         
-        cursor.execute('''
-            UPDATE vendors
-            SET reply_received = 1, reply_date = ?, reply_content = ?
-            WHERE id = ?
-        ''', (datetime.now().isoformat(), reply_content, vendor_id))
+        # Reply state is per vendor: one conversations row
+        company_id = db.company_id_of(conn, vendor_id=vendor_id)
+        if company_id is not None:
+            db.upsert_conversation(conn, company_id, reply_received=1,
+                                   reply_date=datetime.now().isoformat(), reply_content=reply_content)
         
         conn.commit()
         conn.close()
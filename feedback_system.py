@@ -5,10 +5,10 @@ Allows users to mark vendors as relevant/irrelevant via Telegram
 Improves agent learning over time
 """
 
-import sqlite3
 import json
 from datetime import datetime
 from typing import Dict, List, Tuple
+import db
 from telegram_reporter import TelegramReporter
 
 class FeedbackCollector:
@@ -17,51 +17,7 @@ class FeedbackCollector:
     def __init__(self, db_path: str, telegram_reporter: TelegramReporter = None):
         self.db_path = db_path
         self.telegram = telegram_reporter
-        self._setup_feedback_tables()
-    
-    def _setup_feedback_tables(self):
-        """Create feedback tracking tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Add feedback columns to vendors table if they don't exist
-        cursor.execute("PRAGMA table_info(vendors)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'human_feedback' not in columns:
-            cursor.execute("""
-                ALTER TABLE vendors 
-                ADD COLUMN human_feedback TEXT DEFAULT NULL
-            """)
-        
-        if 'feedback_date' not in columns:
-            cursor.execute("""
-                ALTER TABLE vendors 
-                ADD COLUMN feedback_date TEXT DEFAULT NULL
-            """)
-        
-        if 'feedback_notes' not in columns:
-            cursor.execute("""
-                ALTER TABLE vendors 
-                ADD COLUMN feedback_notes TEXT DEFAULT NULL
-            """)
-        
-        # Create feedback learning table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS feedback_patterns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pattern_type TEXT NOT NULL,
-                pattern_value TEXT NOT NULL,
-                relevance_impact TEXT NOT NULL,
-                confidence REAL DEFAULT 0.5,
-                sample_count INTEGER DEFAULT 1,
-                last_updated TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(pattern_type, pattern_value)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        db.ensure_schema(self.db_path)  # Feedback columns / tables: db.py migrations, once per process
     
     def request_feedback_for_vendor(self, vendor_id: int) -> bool:
         """Send Telegram message requesting feedback for a specific vendor"""
@@ -69,7 +25,7 @@ class FeedbackCollector:
             print("⚠️  Telegram not configured, skipping feedback request")
             return False
         
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -112,14 +68,14 @@ Reply with:
     
     def record_feedback(self, vendor_id: int, is_relevant: bool, notes: str = None) -> bool:
         """Record human feedback for a vendor"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         feedback = 'relevant' if is_relevant else 'irrelevant'
         today = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         cursor.execute("""
-            UPDATE vendors 
+            UPDATE products 
             SET human_feedback = ?,
                 feedback_date = ?,
                 feedback_notes = ?
@@ -137,7 +93,7 @@ Reply with:
     
     def _learn_from_feedback(self, vendor_id: int, is_relevant: bool):
         """Extract patterns from feedback to improve future detection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         # Get vendor details
@@ -203,7 +159,7 @@ Reply with:
         # Update or insert patterns
         for pattern_type, pattern_value, relevance_impact in patterns_to_learn:
             cursor.execute("""
-                INSERT INTO feedback_patterns (pattern_type, pattern_value, relevance_impact, confidence, sample_count)
+                INSERT INTO relevance_patterns (pattern_type, pattern_value, relevance_impact, confidence, sample_count)
                 VALUES (?, ?, ?, 0.6, 1)
                 ON CONFLICT(pattern_type, pattern_value) DO UPDATE SET
                     confidence = MIN(1.0, confidence + 0.1),
@@ -251,12 +207,12 @@ Reply with:
     
     def get_learned_patterns(self) -> List[Dict]:
         """Get all learned patterns with confidence scores"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
             SELECT pattern_type, pattern_value, relevance_impact, confidence, sample_count
-            FROM feedback_patterns
+            FROM relevance_patterns
             WHERE confidence > 0.5
             ORDER BY confidence DESC, sample_count DESC
         """)
@@ -281,7 +237,7 @@ Reply with:
         Returns:
             (relevance_score: float, matching_patterns: List[str])
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         relevance_score = 0.5  # Start neutral
@@ -317,7 +273,7 @@ Reply with:
             
             cursor.execute("""
                 SELECT relevance_impact, confidence
-                FROM feedback_patterns
+                FROM relevance_patterns
                 WHERE pattern_type = ? AND pattern_value = ?
             """, (pattern_type, pattern_value))
             
@@ -342,7 +298,7 @@ Reply with:
     
     def get_feedback_summary(self) -> Dict:
         """Get summary of all feedback"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -358,7 +314,7 @@ Reply with:
         total, relevant, irrelevant = row if row else (0, 0, 0)
         
         # Get pattern count
-        cursor.execute("SELECT COUNT(*) FROM feedback_patterns")
+        cursor.execute("SELECT COUNT(*) FROM relevance_patterns")
         pattern_count = cursor.fetchone()[0]
         
         conn.close()
@@ -218,31 +218,20 @@ def run_mini_test():
     print_header("Running Mini End-to-End Test")
     
     try:
-        from oem_search import build_agent
+        from oem_search import build_agent, make_initial_state
         
         print("Building agent...")
         agent = build_agent()
         
         print("Testing with sample vendor...")
         
-        test_state = {
-            "task": "test",
-            "search_query": "",
-            "raw_html": """
+        test_state = make_initial_state("""
             Test Company Ltd.
             15.6 inch Android tablet
             Price: $130/unit
             MOQ: 150 pieces
             Touchscreen: Yes
-            """,
-            "extracted_data": {},
-            "validation_results": [],
-            "validated_data": {},
-            "historical_vendors": [],
-            "retry_count": 0,
-            "error_log": "",
-            "status": "initialized"
-        }
+            """)
         
         print("Processing...")
         result = agent.invoke(test_state)
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+HTTP Client - Pooled HTTP layer for scraper fallbacks and contact lookups
+- Keep-alive connection pooling (no fresh TCP/TLS handshake per request)
+- HTTP/2 when httpx + h2 are installed
+- Configurable timeouts and retries: Retry-After when the server sends one, otherwise a fresh
+  per-host token (rate_limiter.py) or exponential backoff
+- On-disk response cache with ETag/Last-Modified revalidation (response_cache.py)
+Async client for the scrapers, sync client for AlternativeContactFinder
+"""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Optional: httpx gives a native async client (+ HTTP/2 with h2)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2
+    HTTP2_AVAILABLE = HTTPX_AVAILABLE
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import HTTP_CLIENT
+from response_cache import CacheEntry, ResponseCache, get_response_cache
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HTTPClientError(Exception):
+    """Network failure or HTTP error status"""
+    def __init__(self, message: str, status_code: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class HTTPResponse:
+    """Transport-independent response"""
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str],
+                 encoding: str = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPClientError(f"HTTP {self.status_code} for {self.url}", self.status_code)
+
+
+def _from_httpx(response) -> HTTPResponse:
+    return HTTPResponse(str(response.url), response.status_code, response.content,
+                        dict(response.headers), response.encoding)
+
+
+def _from_requests(response) -> HTTPResponse:
+    return HTTPResponse(response.url, response.status_code, response.content,
+                        dict(response.headers), response.encoding)
+
+
+def _charset(headers: Dict[str, str]) -> Optional[str]:
+    for key, value in headers.items():
+        if key.lower() == 'content-type' and 'charset=' in value:
+            return value.split('charset=')[-1].split(';')[0].strip()
+    return None
+
+
+def _retry_after(headers: Dict[str, str]) -> Optional[float]:
+    """Retry-After in seconds (delta-seconds or HTTP-date), None when absent or unparseable"""
+    for key, value in headers.items():
+        if key.lower() != 'retry-after':
+            continue
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _cache_lookup(cache: Optional[ResponseCache], url: str, headers: Dict[str, str]):
+    """
+    Returns (cached_response, entry, send_headers):
+    cached_response is set when the cache can answer without the network
+    """
+    if cache is None:
+        return None, None, headers
+
+    entry = cache.lookup(url, headers)
+    body = cache.read_body(entry) if entry else None
+    if entry and body is None:
+        entry = None  # Body file lost - treat as a miss
+
+    if entry and (entry.fresh or cache.offline):
+        return HTTPResponse(url, entry.status_code, body, entry.headers, _charset(entry.headers)), entry, headers
+    if cache.offline:
+        raise HTTPClientError(f"Offline mode: {url} not in HTTP cache")
+
+    return None, entry, {**headers, **cache.conditional_headers(entry)}
+
+
+def _cache_update(cache: Optional[ResponseCache], url: str, headers: Dict[str, str],
+                  entry: Optional[CacheEntry], response: HTTPResponse) -> Optional[HTTPResponse]:
+    """
+    Store fresh 200s; turn a 304 into the cached response
+    Returns None when the cached body is gone by the time the 304 arrives: the entry is
+    dropped and the caller refetches without conditional headers
+    """
+    if cache is None:
+        return response
+    if response.status_code == 304 and entry is not None:
+        body = cache.read_body(entry)
+        if body is None:
+            cache.forget(entry)
+            return None
+        cache.mark_revalidated(entry, response.headers)
+        return HTTPResponse(url, entry.status_code, body, entry.headers, _charset(entry.headers))
+    if response.status_code == 200:
+        cache.store(url, headers, response.status_code, response.headers, response.content)
+    return response
+
+
+def _requests_session(settings: Dict) -> requests.Session:
+    """requests.Session with a keep-alive pool sized like the httpx client"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=settings['max_keepalive_connections'],
+                          pool_maxsize=settings['max_connections'])
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class _BaseHTTPClient:
+    """
+    Settings, cache lookup/update, retry policy and stats shared by both clients
+    Subclasses only supply the transport: _get_client, _send, _fetch, get and close
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None, **overrides):
+        self.settings = {**HTTP_CLIENT, **overrides}
+        self.cache = cache if cache is not None else get_response_cache()
+        self.rate_limiter = None  # HostRateLimiter (async client only)
+        self._client = None
+        self.stats = {'requests': 0, 'retries': 0, 'errors': 0, 'seconds': 0.0}
+
+    def _httpx_options(self) -> Dict:
+        """Keyword arguments for httpx.Client / httpx.AsyncClient"""
+        return dict(
+            http2=self.settings['http2'] and HTTP2_AVAILABLE,
+            follow_redirects=True,
+            timeout=httpx.Timeout(self.settings['timeout_seconds'],
+                                  connect=self.settings['connect_timeout_seconds']),
+            limits=httpx.Limits(max_connections=self.settings['max_connections'],
+                                max_keepalive_connections=self.settings['max_keepalive_connections'])
+        )
+
+    def _requests_timeouts(self, timeout: float):
+        return (self.settings['connect_timeout_seconds'], timeout)
+
+    def is_cached(self, url: str, headers: Dict[str, str] = None) -> bool:
+        """Fresh cache hit pending - get() will answer without touching the network"""
+        return self.cache is not None and self.cache.is_fresh(url, headers)
+
+    def _before_send(self, url: str, headers: Dict[str, str], use_cache: bool):
+        """Returns (cache, cached_response, entry, send_headers) - see _cache_lookup"""
+        cache = self.cache if use_cache else None
+        return (cache, *_cache_lookup(cache, url, headers))
+
+    def _attempts(self):
+        """Yields (attempt, is_last_attempt) for the configured number of retries"""
+        attempts = self.settings['retries'] + 1
+        for attempt in range(attempts):
+            yield attempt, attempt == attempts - 1
+
+    def _check_status(self, response: HTTPResponse, last_attempt: bool) -> HTTPResponse:
+        """
+        429/5xx are retried like connection errors, except on the last attempt
+        or when Retry-After asks for longer than max_retry_after_seconds
+        """
+        if response.status_code in RETRY_STATUSES and not last_attempt:
+            retry_after = _retry_after(response.headers)
+            if retry_after is None or retry_after <= self.settings['max_retry_after_seconds']:
+                raise HTTPClientError(f"HTTP {response.status_code}", response.status_code, retry_after)
+        return response
+
+    def _backoff(self, error: HTTPClientError, attempt: int, last_attempt: bool) -> float:
+        """
+        Seconds to sleep before the next attempt; re-raises after the last one
+        Retry-After wins; with a rate limiter the next attempt waits for a fresh host token instead
+        """
+        if last_attempt:
+            self.stats['errors'] += 1
+            raise error
+        self.stats['retries'] += 1
+        if error.retry_after is not None:
+            return error.retry_after
+        if self.rate_limiter is not None:
+            return 0.0
+        return self.settings['backoff_seconds'] * (2 ** attempt)
+
+    def _record(self, start: float):
+        self.stats['requests'] += 1
+        self.stats['seconds'] += time.perf_counter() - start
+
+
+class AsyncHTTPClient(_BaseHTTPClient):
+    """
+    Async pooled client (httpx.AsyncClient, or requests.Session in a thread)
+    With a HostRateLimiter every network attempt, retries included, takes a host token
+    and then a global fetch slot; cache hits take neither
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None, rate_limiter=None, **overrides):
+        super().__init__(cache, **overrides)
+        self.rate_limiter = rate_limiter
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(**self._httpx_options()) if HTTPX_AVAILABLE \
+                else _requests_session(self.settings)
+        return self._client
+
+    async def _send(self, url: str, headers: Dict, timeout: float) -> HTTPResponse:
+        client = self._get_client()
+        if HTTPX_AVAILABLE:
+            try:
+                return _from_httpx(await client.get(url, headers=headers, timeout=timeout))
+            except httpx.HTTPError as e:
+                raise HTTPClientError(f"{type(e).__name__}: {e}")
+        try:
+            response = await asyncio.to_thread(client.get, url, headers=headers,
+                                               timeout=self._requests_timeouts(timeout))
+        except requests.exceptions.RequestException as e:
+            raise HTTPClientError(f"{type(e).__name__}: {e}")
+        return _from_requests(response)
+
+    async def _polite_send(self, url: str, headers: Dict, timeout: float) -> HTTPResponse:
+        if self.rate_limiter is None:
+            return await self._send(url, headers, timeout)
+        await self.rate_limiter.wait(url)
+        async with self.rate_limiter.slot():
+            return await self._send(url, headers, timeout)
+
+    async def _fetch(self, url: str, headers: Dict, timeout: float) -> HTTPResponse:
+        """Network GET with retries on connection errors and 429/5xx"""
+        start = time.perf_counter()
+        try:
+            for attempt, last_attempt in self._attempts():
+                try:
+                    return self._check_status(await self._polite_send(url, headers, timeout), last_attempt)
+                except HTTPClientError as e:
+                    await asyncio.sleep(self._backoff(e, attempt, last_attempt))
+        finally:
+            self._record(start)
+
+    async def get(self, url: str, headers: Dict[str, str] = None, timeout: float = None,
+                  use_cache: bool = True) -> HTTPResponse:
+        """GET through the response cache, with retries on connection errors and 429/5xx"""
+        headers = headers or {}
+        cache, cached, entry, send_headers = self._before_send(url, headers, use_cache)
+        if cached is not None:
+            return cached
+
+        timeout = timeout or self.settings['timeout_seconds']
+        response = _cache_update(cache, url, headers, entry, await self._fetch(url, send_headers, timeout))
+        if response is None:  # 304 for a body we lost - refetch unconditionally
+            response = _cache_update(cache, url, headers, None, await self._fetch(url, headers, timeout))
+        return response
+
+    async def close(self):
+        if self._client is None:
+            return
+        if HTTPX_AVAILABLE:
+            await self._client.aclose()
+        else:
+            self._client.close()
+        self._client = None
+
+
+class HTTPClient(_BaseHTTPClient):
+    """Sync pooled client (httpx.Client or requests.Session)"""
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = httpx.Client(**self._httpx_options()) if HTTPX_AVAILABLE \
+                else _requests_session(self.settings)
+        return self._client
+
+    def _send(self, url: str, headers: Dict, timeout: float) -> HTTPResponse:
+        client = self._get_client()
+        if HTTPX_AVAILABLE:
+            try:
+                return _from_httpx(client.get(url, headers=headers, timeout=timeout))
+            except httpx.HTTPError as e:
+                raise HTTPClientError(f"{type(e).__name__}: {e}")
+        try:
+            return _from_requests(client.get(url, headers=headers, timeout=self._requests_timeouts(timeout)))
+        except requests.exceptions.RequestException as e:
+            raise HTTPClientError(f"{type(e).__name__}: {e}")
+
+    def _fetch(self, url: str, headers: Dict, timeout: float) -> HTTPResponse:
+        """Network GET with retries on connection errors and 429/5xx"""
+        start = time.perf_counter()
+        try:
+            for attempt, last_attempt in self._attempts():
+                try:
+                    return self._check_status(self._send(url, headers, timeout), last_attempt)
+                except HTTPClientError as e:
+                    time.sleep(self._backoff(e, attempt, last_attempt))
+        finally:
+            self._record(start)
+
+    def get(self, url: str, headers: Dict[str, str] = None, timeout: float = None,
+            use_cache: bool = True) -> HTTPResponse:
+        """GET through the response cache, with retries on connection errors and 429/5xx"""
+        headers = headers or {}
+        cache, cached, entry, send_headers = self._before_send(url, headers, use_cache)
+        if cached is not None:
+            return cached
+
+        timeout = timeout or self.settings['timeout_seconds']
+        response = _cache_update(cache, url, headers, entry, self._fetch(url, send_headers, timeout))
+        if response is None:  # 304 for a body we lost - refetch unconditionally
+            response = _cache_update(cache, url, headers, None, self._fetch(url, headers, timeout))
+        return response
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+_shared_sync_client: Optional[HTTPClient] = None
+
+
+def get_sync_client() -> HTTPClient:
+    """Process-wide sync client so every caller shares one connection pool"""
+    global _shared_sync_client
+    if _shared_sync_client is None:
+        _shared_sync_client = HTTPClient()
+    return _shared_sync_client
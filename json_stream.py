@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+JSON Streaming - Stop generation as soon as the JSON answer is complete
+Small models keep writing after the closing brace (explanations, notes, a
+second example); every one of those tokens is CPU decode time we throw away.
+- JSONScanner: incremental brace/bracket balance (string- and escape-aware)
+- invoke_json(): streams the answer and closes the stream at the top-level
+  close (Ollama cancels the generation when the client disconnects);
+  non-streaming LLMs get their answer trimmed the same way
+- Stop sequences (LLM_STREAMING['stop']) catch chatter the scanner can't see,
+  num_predict (set on the registry clients) caps runaway answers
+- Counts tokens decoded and early stops; tokens saved are measured on full
+  answers (tokens after the JSON) and bounded for live streams (num_predict cap
+  minus tokens decoded: the model can't have written more than that)
+
+Usage:
+    response = invoke_json(llm, prompt)               # one object
+    response = invoke_json(llm, prompt, openers='[{')  # batch answer (array or object)
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+from config import LLM_STREAMING
+
+_stats = {'calls': 0, 'streamed': 0, 'early_stops': 0, 'decoded_tokens': 0, 'trailing_tokens': 0,
+          'capped_stops': 0, 'saved_at_most': 0}
+_stats_lock = threading.Lock()  # Extraction runs on several worker threads
+
+
+def _count(**amounts):
+    with _stats_lock:
+        for name, amount in amounts.items():
+            _stats[name] += amount
+
+
+class JSONScanner:
+    """Feed text chunks; complete once the first top-level JSON value has closed"""
+
+    def __init__(self, openers: str = '{'):
+        self.openers = openers
+        self.parts: List[str] = []
+        self.length = 0
+        self.start = -1
+        self.end = -1
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    @property
+    def complete(self) -> bool:
+        return self.end != -1
+
+    def feed(self, chunk: str) -> bool:
+        """Scan one chunk; True once the value is complete (later chunks are kept, not scanned)"""
+        offset = self.length
+        self.parts.append(chunk)
+        self.length += len(chunk)
+        if self.complete:
+            return True
+        for i, char in enumerate(chunk):
+            if self.start == -1:
+                if char in self.openers:
+                    self.start, self.depth = offset + i, 1
+                continue
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = offset + i + 1
+                    return True
+        return False
+
+    def result(self) -> Tuple[str, str]:
+        """(JSON text, text after it); everything is returned as-is when the value never closed"""
+        text = ''.join(self.parts)
+        if not self.complete:
+            return text, ''
+        return text[self.start:self.end], text[self.end:]
+
+
+def _count_tokens(text: str) -> int:
+    from prompt_compaction import measure_tokens  # Model tokenizer (or estimate), loaded on first use
+    return measure_tokens(text) if text.strip() else 0
+
+
+def trim_json(response: str, openers: str = '{') -> str:
+    """Cut a complete answer down to its JSON value (counts the trimmed tail)"""
+    scanner = JSONScanner(openers)
+    scanner.feed(response or '')
+    text, trailing = scanner.result()
+    _count(calls=1, trailing_tokens=_count_tokens(trailing))
+    return text
+
+
+def stream_json(llm, prompt: str, openers: str = '{', **kwargs) -> str:
+    """Stream from a LangChain LLM and disconnect once the JSON value has closed"""
+    scanner = JSONScanner(openers)
+    chunks = llm.stream(prompt, **kwargs)
+    decoded = 0
+    stopped = False
+    try:
+        for chunk in chunks:
+            decoded += 1  # Ollama streams one token per chunk
+            if scanner.feed(chunk):
+                stopped = True
+                break
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()  # Closes the HTTP stream → Ollama stops decoding
+
+    # What the model would still have written is unknown; num_predict bounds it
+    cap = kwargs.get('num_predict') or getattr(llm, 'num_predict', None)
+    capped = stopped and isinstance(cap, int) and cap > 0
+    _count(calls=1, streamed=1, decoded_tokens=decoded, early_stops=int(stopped), capped_stops=int(capped),
+           saved_at_most=max(cap - decoded, 0) if capped else 0)
+    text, _ = scanner.result()
+    return text
+
+
+def invoke_json(llm, prompt: str, openers: str = '{', **kwargs) -> str:
+    """
+    Answer that ends at the JSON value's closing brace/bracket
+    Wrappers (cache, record/replay) implement invoke_json themselves; raw LangChain LLMs are
+    streamed; anything else is invoked normally and trimmed
+    """
+    kwargs.setdefault('stop', LLM_STREAMING['stop'])
+    if hasattr(type(llm), 'invoke_json'):
+        return llm.invoke_json(prompt, openers=openers, **kwargs)
+    if LLM_STREAMING['enabled'] and hasattr(llm, 'stream'):
+        return stream_json(llm, prompt, openers, **kwargs)
+    return trim_json(llm.invoke(prompt, **kwargs), openers)
+
+
+def get_stats_report(vendors: Optional[int] = None) -> str:
+    with _stats_lock:
+        s = dict(_stats)
+    per = max(vendors or s['calls'], 1)
+    unit = 'vendor' if vendors else 'call'
+    report = (f"JSON streaming: {s['calls']} LLM calls ({s['streamed']} streamed, "
+              f"{s['early_stops']} stopped at the closing brace), {s['decoded_tokens']} tokens decoded "
+              f"({s['decoded_tokens'] / per:.0f}/{unit})")
+    if s['capped_stops']:
+        report += (f"; live early stops saved at most {s['saved_at_most']} tokens "
+                   f"({s['saved_at_most'] / per:.0f}/{unit}, num_predict cap - tokens decoded)")
+    if s['streamed'] < s['calls']:
+        report += (f"; full answers had {s['trailing_tokens']} tokens after the JSON "
+                   f"({s['trailing_tokens'] / per:.1f}/{unit} decode an early stop saves)")
+    return report
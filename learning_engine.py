@@ -3,25 +3,25 @@ Learning Engine - Self-improving AI that learns from past vendor interactions
 Analyzes historical data to improve keyword generation and search strategies
 """
 
-import sqlite3
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Set
 from collections import Counter
 import re
+import db
 from config import VENDORS_DB, DATA_DIR, OLLAMA_MODEL
-from langchain_ollama import OllamaLLM
+from llm_registry import get_llm
 
 class LearningEngine:
     """Self-learning system that improves search strategies over time"""
     
     def __init__(self):
         self.db_path = VENDORS_DB
-        self.llm = OllamaLLM(model=OLLAMA_MODEL, temperature=0.3)
+        self.llm = get_llm(OLLAMA_MODEL, temperature=0.3)  # Shared client (llm_registry.py)
         
     def analyze_successful_vendors(self, days_back: int = 30) -> Dict:
         """Analyze vendors that scored well to learn patterns"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         # Get high-scoring vendors from past X days
@@ -80,7 +80,7 @@ class LearningEngine:
     
     def analyze_failed_vendors(self, days_back: int = 30) -> Dict:
         """Analyze vendors that scored poorly to learn what to avoid"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cutoff_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
@@ -197,7 +197,7 @@ Output ONLY the keywords as a comma-separated list, nothing else.
     
     def should_retry_vendor(self, vendor_name: str) -> bool:
         """Decide if we should retry contacting a vendor based on past interactions"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache - Persistent cache for Ollama calls
+Keyed on (model, temperature, prompt hash), so the same product card,
+vendor reply or keyword analysis costs a lookup instead of CPU inference
+- SQLite-backed, shared across runs
+- Hit/miss counters
+- LRU eviction above max_entries
+- Per-call opt-out: llm.invoke(prompt, use_cache=False)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from config import LLM_CACHE
+from json_stream import invoke_json
+
+
+class LLMCache:
+    """SQLite store of prompt → response"""
+
+    def __init__(self, db_path: str = None, max_entries: int = None):
+        self.db_path = db_path or LLM_CACHE['db']
+        self.max_entries = max_entries or LLM_CACHE['max_entries']
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                temperature REAL,
+                prompt_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+        self._conn.commit()
+
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str, params: Dict = None) -> tuple:
+        """Returns (key, prompt_hash); extra call params (format, stop, ...) are part of the key"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        extra = json.dumps(params or {}, sort_keys=True, default=str)
+        key = hashlib.sha256(f"{model}|{temperature}|{prompt_hash}|{extra}".encode('utf-8')).hexdigest()
+        return key, prompt_hash
+
+    def get(self, model: str, temperature: float, prompt: str, params: Dict = None) -> Optional[str]:
+        key, _ = self.make_key(model, temperature, prompt, params)
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self.stats['hits'] += 1
+            return row[0]
+
+    def put(self, model: str, temperature: float, prompt: str, response: str, params: Dict = None):
+        key, prompt_hash = self.make_key(model, temperature, prompt, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO llm_cache
+                    (key, model, temperature, prompt_hash, response, created_at, last_access, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """, (key, model, temperature, prompt_hash, response, now, now))
+            self.stats['stored'] += 1
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self):
+        """Drop least-recently-used entries (10% headroom so we don't evict on every put)"""
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?
+            )
+        """, (excess,))
+        self.stats['evicted'] += excess
+
+    def get_stats_report(self) -> str:
+        s = self.stats
+        lookups = s['hits'] + s['misses']
+        hit_rate = s['hits'] / lookups * 100 if lookups else 0.0
+        return (f"LLM cache: {s['hits']} hits / {s['misses']} misses ({hit_rate:.0f}% hit rate), "
+                f"{s['stored']} stored, {s['evicted']} evicted")
+
+
+class CachedLLM:
+    """Drop-in wrapper: llm.invoke(prompt) goes through the cache unless use_cache=False"""
+
+    def __init__(self, llm, model: str, temperature: float, cache: LLMCache = None):
+        self.llm = llm
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache if cache is not None else get_llm_cache()
+
+    def invoke(self, prompt: str, use_cache: bool = True, **kwargs) -> str:
+        if not use_cache or self.cache is None:
+            return self.llm.invoke(prompt, **kwargs)
+
+        cached = self.cache.get(self.model, self.temperature, prompt, kwargs)
+        if cached is not None:
+            return cached
+
+        response = self.llm.invoke(prompt, **kwargs)
+        if response and response.strip():  # Never cache empty answers
+            self.cache.put(self.model, self.temperature, prompt, response, kwargs)
+        return response
+
+    def invoke_json(self, prompt: str, openers: str = '{', use_cache: bool = True, **kwargs) -> str:
+        """Like invoke(), but the answer ends at its JSON value (streamed, see json_stream.py)"""
+        if not use_cache or self.cache is None:
+            return invoke_json(self.llm, prompt, openers, **kwargs)
+
+        params = dict(kwargs, json_openers=openers)  # Keyed apart from invoke(): the answer is cut short
+        cached = self.cache.get(self.model, self.temperature, prompt, params)
+        if cached is not None:
+            return cached
+
+        response = invoke_json(self.llm, prompt, openers, **kwargs)
+        if response and response.strip():
+            self.cache.put(self.model, self.temperature, prompt, response, params)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+_shared_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache (None when disabled in config)"""
+    global _shared_cache
+    if not LLM_CACHE['enabled']:
+        return None
+    if _shared_cache is None:
+        _shared_cache = LLMCache()
+    return _shared_cache
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+LLM Client Registry - One shared Ollama client per (model, params)
+- Clients are created on first use (no langchain import / client construction at import time)
+- Every client is wrapped in CachedLLM and sets keep_alive, so Ollama keeps
+  the model loaded for the whole run instead of reloading it between sparse calls
+- prewarm(): loads the model in a background thread at startup and measures
+  load time and first-token latency
+- At exit the model goes back to Ollama's normal idle timeout
+
+Usage:
+    llm = get_llm(OLLAMA_MODEL, temperature=0.3)
+    prewarm()  # once, at startup
+"""
+
+import atexit
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from config import LLM_REGISTRY, OLLAMA_MODEL, OLLAMA_TEMPERATURE
+from llm_cache import CachedLLM
+
+_clients: Dict[Tuple, CachedLLM] = {}
+_lock = threading.Lock()
+_warm: Dict[str, Dict] = {}  # model → {'thread', 'load_seconds', 'first_token_seconds', 'error'}
+_pinned: Set[str] = set()  # Models given keep_alive by get_llm or prewarm - released at exit
+
+
+def get_llm(model: str = None, temperature: float = None, **params) -> CachedLLM:
+    """Shared (cached) client for this model and sampling params, created on first use"""
+    model = model or OLLAMA_MODEL
+    temperature = OLLAMA_TEMPERATURE if temperature is None else temperature
+    key = (model, temperature, tuple(sorted(params.items())))
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            from langchain_ollama import OllamaLLM
+            client = CachedLLM(
+                OllamaLLM(model=model, temperature=temperature, keep_alive=LLM_REGISTRY['keep_alive'], **params),
+                model,
+                temperature
+            )
+            _clients[key] = client
+            _pinned.add(model)
+        return client
+
+
+def _ollama_client(timeout: float):
+    import ollama  # Installed with langchain-ollama
+    return ollama.Client(timeout=timeout)
+
+
+def _load_model(model: str):
+    """One-token generation: loads the model (pinned) and times the cold start"""
+    stats = _warm[model]
+    try:
+        client = _ollama_client(LLM_REGISTRY['prewarm_timeout'])
+        start = time.perf_counter()
+        for chunk in client.generate(model=model, prompt='OK', stream=True,
+                                     keep_alive=LLM_REGISTRY['keep_alive'], options={'num_predict': 1}):
+            if stats['first_token_seconds'] is None:
+                stats['first_token_seconds'] = time.perf_counter() - start
+            if chunk.get('done'):
+                stats['load_seconds'] = (chunk.get('load_duration') or 0) / 1e9  # Ollama reports ns
+        print(f"  🔥 {model} warm: loaded in {stats['load_seconds'] or 0:.1f}s, "
+              f"first token after {stats['first_token_seconds'] or 0:.1f}s")
+    except Exception as e:
+        stats['error'] = str(e)[:100]
+        print(f"  ⚠️  Model prewarm skipped: {stats['error']}")
+
+
+def prewarm(model: str = None, wait: bool = False) -> Optional[threading.Thread]:
+    """Load the model in the background (once per process); wait=True blocks until it is loaded"""
+    if not LLM_REGISTRY['prewarm']:
+        return None
+    model = model or OLLAMA_MODEL
+    with _lock:
+        _pinned.add(model)
+        if model not in _warm:
+            _warm[model] = {'load_seconds': None, 'first_token_seconds': None, 'error': None}
+            _warm[model]['thread'] = threading.Thread(target=_load_model, args=(model,),
+                                                      name=f'prewarm-{model}', daemon=True)
+            _warm[model]['thread'].start()
+        thread = _warm[model]['thread']
+    if wait:
+        thread.join()
+    return thread
+
+
+def release():
+    """Hand the pinned models back to Ollama's idle timeout (runs at exit)"""
+    if not _pinned or LLM_REGISTRY['keep_alive'] == LLM_REGISTRY['idle_keep_alive']:
+        return
+    try:
+        client = _ollama_client(5)
+        for model in sorted(_pinned):
+            client.generate(model=model, keep_alive=LLM_REGISTRY['idle_keep_alive'])  # No prompt: only re-arms the timer
+    except Exception:
+        pass
+
+
+atexit.register(release)
+
+
+def get_stats_report() -> str:
+    lines = []
+    for model, stats in _warm.items():
+        if stats['error']:
+            lines.append(f"{model} prewarm failed ({stats['error']})")
+        elif stats['first_token_seconds'] is None:
+            lines.append(f"{model} still loading")
+        else:
+            lines.append(f"{model} load {stats['load_seconds'] or 0:.1f}s, "
+                         f"first token {stats['first_token_seconds']:.1f}s")
+    return (f"LLM registry: {len(_clients)} shared clients, keep_alive={LLM_REGISTRY['keep_alive']}"
+            + (f"; {'; '.join(lines)}" if lines else ""))
@@ -9,7 +9,7 @@ import sys
 from datetime import datetime
 
 # Import all modules
-from oem_search import setup_database, build_agent
+from oem_search import setup_database, build_agent, make_initial_state
 from scraper import VendorScraper
 from email_outreach import EmailOutreach
 from reporting import ReportGenerator
@@ -60,18 +60,7 @@ class DailyOrchestrator:
         for i, vendor in enumerate(vendors, 1):
             print(f"\n--- Processing vendor {i}/{len(vendors)} ---")
             
-            initial_state = {
-                "task": "extract_and_validate_vendor",
-                "search_query": "",
-                "raw_html": vendor.get('raw_text', ''),
-                "extracted_data": {},
-                "validation_results": [],
-                "validated_data": {},
-                "historical_vendors": [],
-                "retry_count": 0,
-                "error_log": "",
-                "status": "initialized"
-            }
+            initial_state = make_initial_state(vendor.get('raw_text', ''))
             
             try:
                 final_state = self.agent.invoke(initial_state)
@@ -174,18 +163,7 @@ class DailyOrchestrator:
             print(f"TESTING VENDOR {i}: {vendor['vendor_name']}")
             print(f"{'='*60}")
             
-            initial_state = {
-                "task": "extract_and_validate_vendor",
-                "search_query": "",
-                "raw_html": vendor['raw_text'],
-                "extracted_data": {},
-                "validation_results": [],
-                "validated_data": {},
-                "historical_vendors": [],
-                "retry_count": 0,
-                "error_log": "",
-                "status": "initialized"
-            }
+            initial_state = make_initial_state(vendor['raw_text'])
             
             final_state = self.agent.invoke(initial_state)
             
@@ -10,21 +10,28 @@ IMMEDIATE ENGAGEMENT STRATEGY:
 
 import time
 from datetime import datetime
-from scraper import VendorScraper
-from oem_search import build_agent, setup_database
-from reporting import ReportGenerator
-from email_outreach import EmailOutreach
-from email_conversation import EmailConversationManager  # RE-ENABLED with fixes
+from oem_search import (
+    build_agent, setup_database, make_initial_state, set_llm, get_extraction_llm, get_rule_extractor,
+    get_extraction_stats_report
+)
 from learning_engine import LearningEngine
-from telegram_reporter import TelegramReporter
 from config import SEARCH_KEYWORDS, RATE_LIMITS
+from llm_cache import get_llm_cache
+import llm_registry
+import prompt_compaction
+import json_stream
+from vendor_history import get_vendor_history
 import os
 
+# Scraper (playwright, bs4, httpx), pipeline, replay, reporting, email and Telegram modules
+# are imported where they are used, so test mode and replay start without them
+
 class SmartDailyOrchestrator:
     """Self-learning orchestrator with Telegram notifications"""
     
-    def __init__(self, test_mode=False, runtime_hours=1.0):  # FIXED: 1 hour default
+    def __init__(self, test_mode=False, runtime_hours=1.0, record=False):  # FIXED: 1 hour default
         self.test_mode = test_mode
+        self.record = record  # Record scraper payloads + LLM responses for replay
         self.runtime_hours = runtime_hours
         self.runtime_seconds = runtime_hours * 3600
         self.learning_engine = LearningEngine()
@@ -38,21 +45,22 @@ class SmartDailyOrchestrator:
         self.email_password = os.getenv('EMAIL_PASSWORD', '')
         
         # Telegram reporter for notifications to YOU
-        self.telegram_reporter = TelegramReporter(
-            self.telegram_bot_token,
-            self.telegram_chat_id
-        ) if (self.telegram_bot_token and self.telegram_chat_id) else None
+        self.telegram_reporter = None
+        if self.telegram_bot_token and self.telegram_chat_id:
+            from telegram_reporter import TelegramReporter
+            self.telegram_reporter = TelegramReporter(self.telegram_bot_token, self.telegram_chat_id)
         
         # Email conversation manager RE-ENABLED with critical fix
         # Now only checks emails from vendors we actually contacted
-        self.conversation_manager = EmailConversationManager(
-            self.user_email,
-            self.email_password
-        ) if self.email_password else None
-        
-        # Email outreach for IMMEDIATE vendor contact
-        self.outreach_manager = EmailOutreach() if self.email_password else None
-        if self.outreach_manager:
+        self.conversation_manager = None
+        self.outreach_manager = None
+        if self.email_password:
+            from email_conversation import EmailConversationManager
+            from email_outreach import EmailOutreach
+            self.conversation_manager = EmailConversationManager(self.user_email, self.email_password)
+            
+            # Email outreach for IMMEDIATE vendor contact
+            self.outreach_manager = EmailOutreach()
             self.outreach_manager.configure(self.user_email, self.email_password)
     
     async def run_daily_workflow(self):
@@ -72,6 +80,9 @@ class SmartDailyOrchestrator:
         # Initialize database
         setup_database()
         
+        # Load the model in the background while replies / learning run (first vendor skips the cold load)
+        llm_registry.prewarm()
+        
         # ============ STEP 1: CHECK VENDOR REPLIES (FIXED!) ============
         print("\n� STEP 1: Checking Vendor Email Responses")
         print("-" * 70)
@@ -113,95 +124,51 @@ class SmartDailyOrchestrator:
             print("\n🌐 STEP 4: Intelligent Web Scraping (Time-boxed to 1 hour)")
             print("-" * 70)
             
+            from scraper import VendorScraper
+            from pipeline import VendorPipeline
+            from replay import RunRecorder, RecordingLLM
+            
+            scraper = None
+            recorder = None
             try:
+                if self.record:
+                    recorder = RunRecorder()
+                    set_llm(RecordingLLM(get_extraction_llm(), recorder))
+                    print(f"✓ Recording run to {recorder.path}")
+                
                 scraper = VendorScraper()
-                agent = build_agent()
+                pipeline = VendorPipeline(
+                    scraper,
+                    learning_engine=self.learning_engine,
+                    recorder=recorder,
+                    deadline=start_time + self.runtime_seconds,
+                    max_vendors=max_vendors
+                )
                 
                 print(f"✓ Scraper initialized")
-                print(f"✓ Validation agent built")
+                print(f"✓ Streaming pipeline: scrape → dedupe → extract → score → save → notify")
                 print(f"✓ Starting keyword loop with {len(all_keywords)} keywords...")
                 
-                for i, keyword in enumerate(all_keywords):
-                    # Check runtime limit
-                    elapsed = time.time() - start_time
-                    if elapsed >= self.runtime_seconds:
-                        print(f"\n⏰ Runtime limit reached ({self.runtime_hours}h). Stopping.")
-                        break
-                    
-                    if vendors_processed >= max_vendors:
-                        print(f"\n✋ Max vendors reached ({max_vendors}). Stopping.")
-                        break
-                    
-                    remaining_time = (self.runtime_seconds - elapsed) / 60
-                    print(f"\n[{i+1}/{len(all_keywords)}] '{keyword}' | ⏱️  {remaining_time:.1f} min left")
-                    
-                    # Scrape vendors (try Made-in-China instead of Alibaba)
-                    try:
-                        # Alibaba blocks GitHub Actions IPs - use Made-in-China instead
-                        # REDUCED to 2 products per keyword (we now fetch full product pages)
-                        vendors = await scraper.scrape_made_in_china(keyword, max_results=2)
-                        print(f"  📥 Scraped {len(vendors)} vendors")
-                        
-                        for vendor_data in vendors:
-                            # Check time again
-                            if time.time() - start_time >= self.runtime_seconds:
-                                print("  ⏰ Time limit reached, stopping.")
-                                break
-                            
-                            vendor_name = vendor_data.get('vendor_name', 'Unknown')
-                            
-                            # Learning: Should we retry this vendor?
-                            if not self.learning_engine.should_retry_vendor(vendor_name):
-                                print(f"  ⏭️  Skipping '{vendor_name}' (learned to avoid)")
-                                continue
-                            
-                            # Process through validation agent
-                            print(f"  🔄 Processing: {vendor_name}")
-                            
-                            initial_state = {
-                                "task": "extract_and_validate_vendor",
-                                "search_query": keyword,
-                                "raw_html": vendor_data.get('raw_text', str(vendor_data)),
-                                "extracted_data": {},
-                                "validation_results": [],
-                                "validated_data": {},
-                                "historical_vendors": [],
-                                "retry_count": 0,
-                                "error_log": "",
-                                "status": "initialized"
-                            }
-                            
-                            try:
-                                final_state = agent.invoke(initial_state)
-                                
-                                if final_state['status'] == 'saved':
-                                    vendors_processed += 1
-                                    score = final_state.get('validated_data', {}).get('score', 0)
-                                    print(f"  ✅ Saved (Score: {score}/100)")
-                                else:
-                                    print(f"  ⚠️  Status: {final_state['status']}")
-                                    
-                            except Exception as e:
-                                print(f"  ❌ Processing error: {str(e)[:100]}")
-                            
-                            # Rate limiting
-                            time.sleep(RATE_LIMITS['search_delay_seconds'])
-                        
-                    except Exception as e:
-                        print(f"  ❌ Scraping error for '{keyword}': {str(e)[:200]}")
-                        import traceback
-                        print(f"  Stack trace: {traceback.format_exc()[:300]}")
-                    
-                    # Delay between keywords
-                    time.sleep(RATE_LIMITS['search_delay_seconds'] * 2)
+                # Scraping keeps running while earlier vendors are extracted/scored/saved;
+                # bounded queues pause the scraper when the LLM falls behind
+                vendors_processed = await pipeline.run(all_keywords)
                 
                 print(f"\n✅ Scraping complete. Vendors processed: {vendors_processed}")
+                print(pipeline.get_report())
                 
             except Exception as e:
                 print(f"\n❌ CRITICAL ERROR in scraping setup: {e}")
                 import traceback
                 print(f"Stack trace:\n{traceback.format_exc()}")
                 vendors_processed = 0
+            
+            finally:
+                # Shut down the shared Chromium once, after all keywords
+                if scraper:
+                    await scraper.close()
+                if recorder:
+                    recorder.finalize()
+                    set_llm(None)
         
         else:
             print("\n🌐 STEP 4: Intelligent Web Scraping [SKIPPED - Test Mode]")
@@ -239,6 +206,7 @@ class SmartDailyOrchestrator:
         
         # Text report (always generated)
         try:
+            from reporting import ReportGenerator
             reporter = ReportGenerator()
             report = reporter.generate_daily_report()
             report_path = reporter.save_report(report)
@@ -269,6 +237,15 @@ class SmartDailyOrchestrator:
         print(f"📨 Outreach emails sent: {emails_sent}")
         print(f"💬 Vendor replies: {conversation_results.get('replies_found', 0)}")
         print(f"📄 Report: {report_path}")
+        print(f"⚡ {get_rule_extractor().get_stats_report()}")
+        print(f"🧾 {get_extraction_stats_report()}")
+        print(f"✂️  {prompt_compaction.get_stats_report()}")
+        print(f"🛑 {json_stream.get_stats_report(vendors_processed)}")
+        llm_cache = get_llm_cache()
+        if llm_cache:
+            print(f"🧠 {llm_cache.get_stats_report()}")
+        print(f"🔥 {llm_registry.get_stats_report()}")
+        print(f"📈 Price/MOQ stats: {get_vendor_history().stats.get_report()}")
         if self.telegram_reporter:
             print(f"📱 Telegram: Report sent!")
         print("="*70 + "\n")
@@ -299,18 +276,7 @@ class SmartDailyOrchestrator:
             print(f"\nTesting: {vendor['vendor_name']}")
             print("-" * 70)
             
-            initial_state = {
-                "task": "extract_and_validate_vendor",
-                "search_query": "test",
-                "raw_html": str(vendor),
-                "extracted_data": {},
-                "validation_results": [],
-                "validated_data": {},
-                "historical_vendors": [],
-                "retry_count": 0,
-                "error_log": "",
-                "status": "initialized"
-            }
+            initial_state = make_initial_state(str(vendor), "test")
             
             try:
                 final_state = agent.invoke(initial_state)
@@ -349,10 +315,17 @@ if __name__ == "__main__":
     
     mode = sys.argv[1] if len(sys.argv) > 1 else "test"
     
+    if mode == "replay":
+        # Offline benchmark: python main_v2.py replay [recording_dir]
+        from replay import run_replay
+        run_replay(sys.argv[2] if len(sys.argv) > 2 else None)
+        sys.exit(0)
+    
     # 1 FULL HOUR for production
     orchestrator = SmartDailyOrchestrator(
         test_mode=(mode == "test"),
-        runtime_hours=0.08 if mode == "test" else 1.0
+        runtime_hours=0.08 if mode == "test" else 1.0,
+        record="--record" in sys.argv
     )
     
     if mode == "test":
@@ -6,7 +6,7 @@ Runs daily workflow: learning -> scraping -> validation -> conversations -> repo
 import time
 from datetime import datetime
 from scraper import VendorScraper
-from oem_search import build_agent, setup_database
+from oem_search import build_agent, setup_database, make_initial_state
 from reporting import ReportGenerator
 from email_outreach import EmailOutreach
 from learning_engine import LearningEngine
@@ -150,20 +150,7 @@ class SmartDailyOrchestrator:
                         # Process through validation agent
                         print(f"  🔄 Processing: {vendor_name}")
                         
-                        initial_state = {
-                            "raw_text": str(vendor_data),
-                            "extracted_data": {},
-                            "validation_results": {},
-                            "score": 0,
-                            "status": "new",
-                            "retry_count": 0,
-                            "error_log": "",
-                            "metadata": {
-                                "source_url": vendor_data.get('url', ''),
-                                "keywords_used": [keyword],
-                                "discovered_date": datetime.now().strftime('%Y-%m-%d')
-                            }
-                        }
+                        initial_state = make_initial_state(str(vendor_data), keyword)
                         
                         try:
                             final_state = agent.invoke(initial_state)
@@ -280,20 +267,7 @@ class SmartDailyOrchestrator:
             print(f"\nTesting: {vendor['vendor_name']}")
             print("-" * 70)
             
-            initial_state = {
-                "raw_text": str(vendor),
-                "extracted_data": {},
-                "validation_results": {},
-                "score": 0,
-                "status": "new",
-                "retry_count": 0,
-                "error_log": "",
-                "metadata": {
-                    "source_url": vendor.get('url', ''),
-                    "keywords_used": ["test"],
-                    "discovered_date": datetime.now().strftime('%Y-%m-%d')
-                }
-            }
+            initial_state = make_initial_state(str(vendor), "test")
             
             try:
                 final_state = agent.invoke(initial_state)
@@ -9,7 +9,7 @@ FIXED VERSION:
 import time
 from datetime import datetime
 from scraper import VendorScraper
-from oem_search import build_agent, setup_database
+from oem_search import build_agent, setup_database, make_initial_state
 from reporting import ReportGenerator
 from email_outreach import EmailOutreach
 from learning_engine import LearningEngine
@@ -128,18 +128,7 @@ class SmartDailyOrchestrator:
                         # Process through validation agent
                         print(f"  🔄 Processing: {vendor_name}")
                         
-                        initial_state = {
-                            "task": "extract_and_validate_vendor",
-                            "search_query": keyword,
-                            "raw_html": vendor_data.get('raw_text', str(vendor_data)),
-                            "extracted_data": {},
-                            "validation_results": [],
-                            "validated_data": {},
-                            "historical_vendors": [],
-                            "retry_count": 0,
-                            "error_log": "",
-                            "status": "initialized"
-                        }
+                        initial_state = make_initial_state(vendor_data.get('raw_text', str(vendor_data)), keyword)
                         
                         try:
                             final_state = agent.invoke(initial_state)
@@ -240,18 +229,7 @@ class SmartDailyOrchestrator:
             print(f"\nTesting: {vendor['vendor_name']}")
             print("-" * 70)
             
-            initial_state = {
-                "task": "extract_and_validate_vendor",
-                "search_query": "test",
-                "raw_html": str(vendor),
-                "extracted_data": {},
-                "validation_results": [],
-                "validated_data": {},
-                "historical_vendors": [],
-                "retry_count": 0,
-                "error_log": "",
-                "status": "initialized"
-            }
+            initial_state = make_initial_state(str(vendor), "test")
             
             try:
                 final_state = agent.invoke(initial_state)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection - MinHash + LSH over product card text
+Made-in-China lists the same product under slightly different titles/keywords;
+exact fingerprints (dedup_index.py) miss those
+- Signature: MinHash over word shingles of raw_text + character shingles of the vendor name
+- LSH banding: lookup only touches cards sharing a band bucket (sublinear)
+- Candidates are confirmed by estimated Jaccard similarity >= threshold
+- Persisted in DATA_DIR/minhash.db next to vendors.db, updated on each save
+"""
+
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from config import MINHASH
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 64) - 1
+TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def shingles(raw_text: str, vendor_name: str = '', words: int = None) -> set:
+    """Word n-grams of the card text + character trigrams of the vendor name"""
+    words = words or MINHASH['shingle_words']
+    tokens = TOKEN.findall((raw_text or '').lower())
+    result = {' '.join(tokens[i:i + words]) for i in range(max(1, len(tokens) - words + 1))} if tokens else set()
+
+    name = ' '.join(TOKEN.findall((vendor_name or '').lower()))
+    result.update(f"n:{name[i:i + 3]}" for i in range(max(0, len(name) - 2)))
+    return result
+
+
+class MinHasher:
+    """num_perm universal hash functions (a*x + b) mod p over 64-bit shingle hashes"""
+
+    def __init__(self, num_perm: int = None, seed: int = 1):
+        self.num_perm = num_perm or MINHASH['num_perm']
+        rng = random.Random(seed)  # Fixed seed: signatures must be comparable across runs
+        self.permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                             for _ in range(self.num_perm)]
+
+    @staticmethod
+    def _hash(shingle: str) -> int:
+        return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def signature(self, shingle_set: set) -> Tuple[int, ...]:
+        if not shingle_set:
+            return tuple([MAX_HASH] * self.num_perm)
+        hashes = [self._hash(s) for s in shingle_set]
+        return tuple(
+            min((a * x + b) % MERSENNE_PRIME for x in hashes)
+            for a, b in self.permutations
+        )
+
+    @staticmethod
+    def similarity(sig1: Tuple[int, ...], sig2: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity"""
+        return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+class NearDuplicateIndex:
+    """LSH buckets in memory, signatures in SQLite"""
+
+    def __init__(self, db_path: str = None, threshold: float = None, bands: int = None):
+        self.db_path = db_path or MINHASH['db']
+        self.threshold = threshold or MINHASH['threshold']
+        self.hasher = MinHasher()
+        self.bands = bands or MINHASH['bands']
+        self.rows = self.hasher.num_perm // self.bands
+
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self.buckets: List[Dict[int, List[str]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+        self.stats = {'queries': 0, 'candidates': 0, 'matches': 0, 'added': 0}
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS minhash_signatures (
+                key TEXT PRIMARY KEY,
+                num_perm INTEGER NOT NULL,
+                signature BLOB NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._load()
+
+    def _load(self):
+        rows = self._conn.execute(
+            "SELECT key, signature FROM minhash_signatures WHERE num_perm = ?", (self.hasher.num_perm,)
+        )
+        for key, blob in rows:
+            self._insert(key, tuple(array('Q', blob)))
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, hash(signature[band * self.rows:(band + 1) * self.rows])
+
+    def _insert(self, key: str, signature: Tuple[int, ...]):
+        self.signatures[key] = signature
+        for band, bucket in self._band_keys(signature):
+            self.buckets[band].setdefault(bucket, []).append(key)
+
+    def signature_for(self, raw_text: str, vendor_name: str = '') -> Tuple[int, ...]:
+        return self.hasher.signature(shingles(raw_text, vendor_name))
+
+    def query(self, raw_text: str = '', vendor_name: str = '',
+              signature: Tuple[int, ...] = None) -> Optional[Tuple[str, float]]:
+        """Most similar indexed card above threshold: (key, similarity) or None"""
+        signature = signature or self.signature_for(raw_text, vendor_name)
+        with self._lock:
+            self.stats['queries'] += 1
+            candidates = set()
+            for band, bucket in self._band_keys(signature):
+                candidates.update(self.buckets[band].get(bucket, ()))
+            self.stats['candidates'] += len(candidates)
+
+            best = None
+            for key in candidates:
+                score = MinHasher.similarity(signature, self.signatures[key])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+            if best:
+                self.stats['matches'] += 1
+            return best
+
+    def add(self, key: str, raw_text: str = '', vendor_name: str = '',
+            signature: Tuple[int, ...] = None, persist: bool = True) -> Tuple[int, ...]:
+        """
+        Index a card; key is 'vendor:<id>' for saved vendors
+        persist=False keeps it for this run only (cards not saved yet)
+        """
+        signature = signature or self.signature_for(raw_text, vendor_name)
+        with self._lock:
+            if key not in self.signatures:
+                self._insert(key, signature)
+                self.stats['added'] += 1
+            if persist:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO minhash_signatures (key, num_perm, signature) VALUES (?, ?, ?)",
+                    (key, self.hasher.num_perm, array('Q', signature).tobytes())
+                )
+                self._conn.commit()
+        return signature
+
+    def get_stats_report(self) -> str:
+        s = self.stats
+        avg_candidates = s['candidates'] / s['queries'] if s['queries'] else 0.0
+        return (f"Near-duplicate index: {len(self.signatures)} cards, {s['queries']} lookups "
+                f"(avg {avg_candidates:.1f} candidates), {s['matches']} near-duplicates, {s['added']} added")
+
+
+_shared_index: Optional[NearDuplicateIndex] = None
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """Process-wide index (None when disabled in config)"""
+    global _shared_index
+    if not MINHASH['enabled']:
+        return None
+    if _shared_index is None:
+        _shared_index = NearDuplicateIndex()
+    return _shared_index
+
+
+def set_near_duplicate_index(index: Optional[NearDuplicateIndex]) -> Optional[NearDuplicateIndex]:
+    """Swap the process-wide index (replay uses a scratch one); returns the previous index"""
+    global _shared_index
+    previous, _shared_index = _shared_index, index
+    return previous
@@ -7,15 +7,24 @@ No Hallucinations - Fact-Based Only
 
 import os
 import json
+import threading
 import time
-import sqlite3
+from concurrent.futures import Future
 from datetime import datetime
-from typing import TypedDict, List, Dict, Any
-from langchain_ollama import OllamaLLM
-from langgraph.graph import StateGraph, END
+from typing import TypedDict, List, Dict, Any, Optional
 
+import db
 from config import *
 from validators import MultiLayerValidator, ValidationResult
+from llm_registry import get_llm
+from rule_extractor import RuleBasedExtractor, build_targeted_prompt
+from prompt_compaction import compact_text
+from json_stream import invoke_json
+from dedup_index import content_fingerprint
+from near_duplicates import get_near_duplicate_index
+from vendor_history import VendorHistory, get_vendor_history
+from vendor_writer import get_vendor_writer
+from text_matching import KeywordMatcher
 from anti_hallucination import (
     DataQualityChecker, 
     AgentPerformanceTracker,
@@ -31,7 +40,9 @@ class AgentState(TypedDict):
     extracted_data: Dict[str, Any]  # Extracted vendor info
     validation_results: List[tuple]  # Validation layer results
     validated_data: Dict[str, Any]  # Final validated output
-    historical_vendors: List[Dict[str, Any]]  # Past vendors for consistency check
+    historical_vendors: VendorHistory  # Indexed snapshot of saved vendors for consistency checks
+    save_future: Future  # Resolves to (vendor_id, inserted) when the write-behind batch commits
+    vendor_id: int  # Row id once saved (resolved by the notify node)
     retry_count: int  # Retry counter
     error_log: str  # Error messages
     status: str  # Current status
@@ -43,85 +54,67 @@ def setup_database():
     os.makedirs(LOGS_DIR, exist_ok=True)
     os.makedirs(REPORTS_DIR, exist_ok=True)
     
-    conn = sqlite3.connect(VENDORS_DB)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS vendors (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            vendor_name TEXT NOT NULL,
-            url TEXT,
-            platform TEXT,
-            moq INTEGER,
-            price_per_unit REAL,
-            customizable BOOLEAN,
-            os TEXT,
-            screen_size TEXT,
-            touchscreen BOOLEAN,
-            camera_front BOOLEAN,
-            wall_mount BOOLEAN,
-            has_battery BOOLEAN,
-            product_type TEXT,
-            score INTEGER,
-            status TEXT,
-            raw_data TEXT,
-            contacted BOOLEAN DEFAULT 0,
-            contact_date TEXT,
-            reply_received BOOLEAN DEFAULT 0,
-            reply_date TEXT,
-            reply_content TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            -- New fields for learning and conversation features
-            discovered_date TEXT,
-            contact_email TEXT,
-            product_description TEXT,
-            product_name TEXT,
-            product_url TEXT,
-            keywords_used TEXT,
-            validation_status TEXT,
-            rejection_reason TEXT,
-            email_sent_count INTEGER DEFAULT 0,
-            last_email_date TEXT,
-            email_response TEXT,
-            price_quoted REAL,
-            moq_quoted INTEGER,
-            customization_confirmed TEXT,
-            response_time_hours REAL,
-            last_response_date TEXT,
-            -- Deduplication tracking
-            UNIQUE(vendor_name, product_url)
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS validation_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            vendor_id INTEGER,
-            validation_passed BOOLEAN,
-            layer_results TEXT,
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (vendor_id) REFERENCES vendors (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    db.ensure_schema(VENDORS_DB)  # Versioned migrations in db.py (WAL, tables, indexes)
     print("✓ Database initialized")
 
 # ==================== OLLAMA LLM SETUP ====================
-print(f"Initializing Ollama with model: {OLLAMA_MODEL}")
-llm = OllamaLLM(
-    model=OLLAMA_MODEL,
-    temperature=OLLAMA_TEMPERATURE,
-    top_p=OLLAMA_TOP_P
-)
+_llm_override = None  # Set by the record/replay harness
+
+def get_extraction_llm():
+    """Extraction LLM: the shared registry client (llm_registry.py) unless swapped by set_llm"""
+    return _llm_override or get_llm(OLLAMA_MODEL, OLLAMA_TEMPERATURE, top_p=OLLAMA_TOP_P,
+                                    num_predict=LLM_STREAMING['extraction_num_predict'])
+
+def set_llm(new_llm):
+    """Swap the extraction LLM (record/replay harness; None = shared client); returns the previous override"""
+    global _llm_override
+    previous, _llm_override = _llm_override, new_llm
+    return previous
+
+# ==================== SHARED INSTANCES (created on first use) ====================
+_validator: Optional[MultiLayerValidator] = None
+_rule_extractor: Optional[RuleBasedExtractor] = None
+_performance_tracker: Optional[AgentPerformanceTracker] = None
 
-# ==================== VALIDATOR INSTANCE ====================
-validator = MultiLayerValidator()
+def get_validator() -> MultiLayerValidator:
+    """Process-wide validator (its log feeds the validation report)"""
+    global _validator
+    if _validator is None:
+        _validator = MultiLayerValidator()
+    return _validator
 
-# ==================== PERFORMANCE TRACKER ====================
-performance_tracker = AgentPerformanceTracker(VENDORS_DB)
+def get_rule_extractor() -> RuleBasedExtractor:
+    """Process-wide rule-based pre-extractor (its stats feed the run summary)"""
+    global _rule_extractor
+    if _rule_extractor is None:
+        _rule_extractor = RuleBasedExtractor()
+    return _rule_extractor
+
+def get_performance_tracker() -> AgentPerformanceTracker:
+    """Process-wide points tracker for this session"""
+    global _performance_tracker
+    if _performance_tracker is None:
+        _performance_tracker = AgentPerformanceTracker(VENDORS_DB)
+    return _performance_tracker
+
+# ==================== INITIAL STATE ====================
+def make_initial_state(raw_text: str, search_query: str = "",
+                       extracted_data: Dict[str, Any] = None) -> AgentState:
+    """Fresh agent state for one scraped vendor (extracted_data: pre-filled by batch extraction)"""
+    return {
+        "task": "extract_and_validate_vendor",
+        "search_query": search_query,
+        "raw_html": raw_text,
+        "extracted_data": extracted_data or {},
+        "validation_results": [],
+        "validated_data": {},
+        "historical_vendors": get_vendor_history(),
+        "save_future": None,
+        "vendor_id": None,
+        "retry_count": 0,
+        "error_log": "",
+        "status": "initialized"
+    }
 
 # ==================== SCHEMA DEFINITIONS ====================
 VENDOR_SCHEMA = {
@@ -144,27 +137,28 @@ VENDOR_SCHEMA = {
     "product_url": (str, type(None)),    # NEW: direct product page URL
 }
 
-# ==================== NODE 1: EXTRACTION ====================
-def extract_vendor_info(state: AgentState) -> AgentState:
-    """
-    Extract vendor information from raw HTML/text
-    Using LLM with strict prompting to minimize hallucinations
-    """
-    print("\n>>> NODE 1: Extracting vendor information...")
-    
-    raw_text = state['raw_html'][:5000]  # Limit to 5000 chars to save RAM
-    
-    if not raw_text or len(raw_text) < 50:
-        return {
-            **state,
-            "extracted_data": {},
-            "error_log": "No content to extract from",
-            "status": "extraction_failed"
-        }
-    
-    extraction_prompt = f"""Extract product information from this text. Return ONLY valid JSON.
+# Ollama structured output: VENDOR_SCHEMA as a JSON schema, so the model can only emit valid, typed JSON
+# The first listed type is the canonical one; every field may be null ("use null if missing")
+JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
 
-CRITICAL RULES:
+def vendor_json_schema(fields: List[str] = None) -> Dict[str, Any]:
+    """JSON schema of one extraction object (fields: subset of VENDOR_SCHEMA, default all)"""
+    fields = list(fields or VENDOR_SCHEMA)
+    properties = {}
+    for field in fields:
+        types = VENDOR_SCHEMA[field] if isinstance(VENDOR_SCHEMA[field], tuple) else (VENDOR_SCHEMA[field],)
+        properties[field] = {"type": [JSON_TYPES[types[0]], "null"]}
+    return {"type": "object", "properties": properties, "required": fields}
+
+def batch_json_schema(card_ids: List[str]) -> Dict[str, Any]:
+    """JSON schema of a batch answer: exactly one object per card, tagged with its card_id"""
+    item = vendor_json_schema()
+    item["properties"] = {"card_id": {"type": "string", "enum": list(card_ids)}, **item["properties"]}
+    item["required"] = ["card_id"] + item["required"]
+    return {"type": "array", "items": item, "minItems": len(card_ids), "maxItems": len(card_ids)}
+
+# ==================== NODE 1: EXTRACTION ====================
+EXTRACTION_RULES = """CRITICAL RULES:
 1. If info is missing, use null (not "Unknown")
 2. Do NOT use quotes inside string values
 3. Keep descriptions simple and short
@@ -172,336 +166,329 @@ CRITICAL RULES:
 5. Product must be wall-mounted display (not portable tablet)
 6. Extract vendor email ONLY if you see it in the text (must be in format: something@domain.com)
 7. Extract product name and product URL separately
-8. DO NOT MAKE UP EMAILS - if no email visible in text, use null
+8. DO NOT MAKE UP EMAILS - if no email visible in text, use null"""
+
+EXTRACTION_TEMPLATE = '{"vendor_name":"Company Name","url":"company-website","platform":"made-in-china","moq":10,"price_per_unit":null,"customizable":true,"os":"Android","screen_size":"15.6 inch","touchscreen":true,"camera_front":false,"wall_mount":true,"has_battery":false,"product_type":"smart screen","description":"Simple description no quotes","contact_email":null,"product_name":"15.6 Wall Mount Display","product_url":"product-page-url"}'
+
+def _build_batch_extraction_prompt(cards: List[tuple]) -> str:
+    """
+    Several product cards in one prompt - the rules and template are sent once
+    cards: [(card_id, raw_text), ...]
+    """
+    card_blocks = "\n\n".join(
+        f"=== CARD {card_id} ===\n{compact_text(raw_text, PROMPT_COMPACTION['batch_card_tokens'])}"
+        for card_id, raw_text in cards
+    )
+    card_ids = ", ".join(card_id for card_id, _ in cards)
+    return f"""Extract product information from each product card below. Return ONLY valid JSON.
 
-Text to analyze:
-{raw_text[:3000]}
+{EXTRACTION_RULES}
+9. Each card is a DIFFERENT vendor - never mix information between cards
 
-Return this exact JSON structure (replace values with extracted data):
-{{"vendor_name":"Company Name","url":"company-website","platform":"made-in-china","moq":10,"price_per_unit":null,"customizable":true,"os":"Android","screen_size":"15.6 inch","touchscreen":true,"camera_front":false,"wall_mount":true,"has_battery":false,"product_type":"smart screen","description":"Simple description no quotes","contact_email":null,"product_name":"15.6 Wall Mount Display","product_url":"product-page-url"}}
+{card_blocks}
 
-IMPORTANT: If price is NOT clearly stated in the text, use null for price_per_unit. If MOQ is not stated, use null. Do NOT copy the example values!
+Return a JSON array with exactly one object per card ({card_ids}), each with a "card_id" field plus this structure (replace values with extracted data):
+{EXTRACTION_TEMPLATE}
 
-Output ONLY the JSON. Start with {{ end with }}. No other text.
+IMPORTANT: If price is NOT clearly stated in a card, use null for price_per_unit. If MOQ is not stated, use null. Do NOT copy the example values!
+
+Output ONLY the JSON array. Start with [ end with ]. No other text.
 
 JSON:"""
 
+# Per-process counters: how often LLM answers needed cleanup, fallbacks or retries
+_extraction_stats = {'answers': 0, 'valid_json': 0, 'cleaned': 0, 'unparseable': 0,
+                     'batch_fallbacks': 0, 'retries': 0, 'type_fixes': 0}
+_extraction_stats_lock = threading.Lock()  # Agent runner / pipeline workers extract concurrently
+_structured_output = EXTRACTION['structured_output']  # Switched off if the Ollama server rejects schemas
+
+def _count_extraction(outcome: str):
+    with _extraction_stats_lock:
+        _extraction_stats[outcome] += 1
+
+def _is_schema_rejection(error: Exception) -> bool:
+    """Ollama answered 400 to format=<schema>, or the client doesn't know the format argument"""
+    if getattr(error, 'status_code', None) == 400:
+        return True
+    message = str(error).lower()
+    return isinstance(error, (TypeError, ValueError)) and ('format' in message or 'schema' in message)
+
+def _invoke_extraction_llm(prompt: str, schema: Dict[str, Any], openers: str = '{') -> str:
+    """
+    Extraction call, constrained to `schema` (Ollama format=) when structured output is on
+    Streamed and cut at the closing brace/bracket of the answer (json_stream.py)
+    """
+    global _structured_output
+    llm = get_extraction_llm()
+    if not _structured_output:
+        return invoke_json(llm, prompt, openers)
     try:
-        response = llm.invoke(extraction_prompt)
-        
-        # AGGRESSIVE JSON CLEANING
-        response = response.strip()
-        
-        # Remove markdown code blocks
-        if response.startswith("```json"):
-            response = response[7:]
-        if response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-        response = response.strip()
-        
-        # Remove any text before first { and after last }
-        start_idx = response.find('{')
-        end_idx = response.rfind('}')
-        if start_idx != -1 and end_idx != -1:
-            response = response[start_idx:end_idx+1]
-        
-        # Fix common JSON issues
-        # Replace "Unknown" with null
-        import re
-        response = re.sub(r':\s*"Unknown"', ': null', response)
-        response = re.sub(r':\s*"unknown"', ': null', response)
-        
-        # Remove trailing commas before } or ]
-        response = re.sub(r',(\s*[}\]])', r'\1', response)
-        
-        # Parse JSON
-        extracted = json.loads(response)
-        
-        # ============ CRITICAL: ANTI-HALLUCINATION CHECKS ============
-        # Replace LLM-generated placeholders with REAL extracted data
-        
-        # Extract REAL email from source text
-        real_email = extract_real_email_from_text(raw_text, extracted.get('vendor_name'))
-        if real_email:
-            extracted['contact_email'] = real_email
-            print(f"  ✓ Real email extracted: {real_email}")
-        else:
-            # NEW: Try alternative methods to find email
-            print(f"  ⚠️  No email in product page, trying alternative methods...")
-            try:
-                from alternative_contact import AlternativeContactFinder
-                contact_finder = AlternativeContactFinder()
-                
-                alt_email = contact_finder.find_contact_email(
-                    extracted.get('vendor_name', ''),
-                    extracted.get('product_url')
-                )
-                
-                if alt_email:
-                    extracted['contact_email'] = alt_email
-                    print(f"  ✅ Email found via alternative method: {alt_email}")
-                else:
-                    # Check if LLM provided an email (likely fake)
-                    if extracted.get('contact_email'):
-                        is_placeholder, reason = DataQualityChecker.is_placeholder_email(
-                            extracted['contact_email'], 
-                            extracted.get('vendor_name')
-                        )
-                        if is_placeholder:
-                            print(f"  ⚠️  Placeholder email detected: {reason}")
-                            extracted['contact_email'] = None
-                            performance_tracker.record_hallucination('major')
-            except Exception as e:
-                print(f"  ⚠️  Alternative contact search failed: {str(e)[:100]}")
-                # Fallback to checking LLM email
+        return invoke_json(llm, prompt, openers, format=schema)
+    except Exception as e:
+        if not _is_schema_rejection(e):
+            raise  # Timeouts, connection errors, ... are not a reason to give up on schemas
+        response = invoke_json(llm, prompt, openers)
+        _structured_output = False  # Plain call works, so the server / client can't do schemas
+        print(f"  ⚠️  Structured output unavailable ({str(e)[:80]}) - using free-form JSON")
+        return response
+
+def _parse_llm_json(response: str, open_char: str = '{', close_char: str = '}') -> Any:
+    """json.loads the answer as returned; fall back to _clean_llm_json (counted) when it isn't valid JSON"""
+    _count_extraction('answers')
+    try:
+        parsed = json.loads(response)
+        _count_extraction('valid_json')
+        return parsed
+    except json.JSONDecodeError:
+        pass
+    try:
+        parsed = json.loads(_clean_llm_json(response, open_char, close_char))
+        _count_extraction('cleaned')
+        return parsed
+    except json.JSONDecodeError:
+        _count_extraction('unparseable')
+        raise
+
+def get_extraction_stats_report() -> str:
+    with _extraction_stats_lock:
+        s = dict(_extraction_stats)
+    rework = s['cleaned'] + s['unparseable'] + s['batch_fallbacks'] + s['retries']
+    valid = s['valid_json'] / s['answers'] * 100 if s['answers'] else 0.0
+    return (f"Extraction JSON ({'structured' if _structured_output else 'free-form'}): "
+            f"{s['valid_json']}/{s['answers']} answers valid as returned ({valid:.0f}% without cleanup), "
+            f"{s['cleaned']} cleaned, {s['unparseable']} unparseable, "
+            f"{s['batch_fallbacks']} batch fallbacks, {s['retries']} retries, {s['type_fixes']} type fixes "
+            f"({rework} reworked)")
+
+def _clean_llm_json(response: str, open_char: str = '{', close_char: str = '}') -> str:
+    """AGGRESSIVE JSON CLEANING of an LLM response"""
+    import re
+    response = response.strip()
+
+    # Remove markdown code blocks
+    if response.startswith("```json"):
+        response = response[7:]
+    if response.startswith("```"):
+        response = response[3:]
+    if response.endswith("```"):
+        response = response[:-3]
+    response = response.strip()
+
+    # Remove any text before first { and after last }
+    start_idx = response.find(open_char)
+    end_idx = response.rfind(close_char)
+    if start_idx != -1 and end_idx != -1:
+        response = response[start_idx:end_idx+1]
+
+    # Fix common JSON issues
+    # Replace "Unknown" with null
+    response = re.sub(r':\s*"Unknown"', ': null', response)
+    response = re.sub(r':\s*"unknown"', ': null', response)
+
+    # Remove trailing commas before } or ]
+    response = re.sub(r',(\s*[}\]])', r'\1', response)
+    return response
+
+def _postprocess_extraction(extracted: Dict[str, Any], raw_text: str,
+                            historical_vendors: VendorHistory) -> Dict[str, Any]:
+    """Anti-hallucination checks + type coercion on parsed LLM output"""
+    tracker = get_performance_tracker()
+    # ============ CRITICAL: ANTI-HALLUCINATION CHECKS ============
+    # Replace LLM-generated placeholders with REAL extracted data
+
+    # Extract REAL email from source text
+    real_email = extract_real_email_from_text(raw_text, extracted.get('vendor_name'))
+    if real_email:
+        extracted['contact_email'] = real_email
+        print(f"  ✓ Real email extracted: {real_email}")
+    else:
+        # NEW: Try alternative methods to find email
+        print(f"  ⚠️  No email in product page, trying alternative methods...")
+        try:
+            from alternative_contact import AlternativeContactFinder
+            contact_finder = AlternativeContactFinder()
+
+            alt_email = contact_finder.find_contact_email(
+                extracted.get('vendor_name', ''),
+                extracted.get('product_url')
+            )
+
+            if alt_email:
+                extracted['contact_email'] = alt_email
+                print(f"  ✅ Email found via alternative method: {alt_email}")
+            else:
+                # Check if LLM provided an email (likely fake)
                 if extracted.get('contact_email'):
                     is_placeholder, reason = DataQualityChecker.is_placeholder_email(
-                        extracted['contact_email'], 
+                        extracted['contact_email'],
                         extracted.get('vendor_name')
                     )
                     if is_placeholder:
                         print(f"  ⚠️  Placeholder email detected: {reason}")
                         extracted['contact_email'] = None
-                        performance_tracker.record_hallucination('major')
-        
-        # Extract REAL URLs from source text
-        real_urls = extract_real_urls_from_text(raw_text)
-        if real_urls['product_url']:
-            extracted['product_url'] = real_urls['product_url']
-            print(f"  ✓ Real product URL: {real_urls['product_url'][:60]}...")
-        elif extracted.get('product_url'):
-            is_placeholder, reason = DataQualityChecker.is_placeholder_url(extracted['product_url'])
-            if is_placeholder:
-                print(f"  ⚠️  Placeholder product URL: {reason}")
-                extracted['product_url'] = None
-                performance_tracker.record_hallucination('major')
-        
-        if real_urls['vendor_url']:
-            extracted['url'] = real_urls['vendor_url']
-            print(f"  ✓ Real vendor URL: {real_urls['vendor_url'][:60]}...")
-        elif extracted.get('url'):
-            is_placeholder, reason = DataQualityChecker.is_placeholder_url(extracted['url'])
-            if is_placeholder:
-                print(f"  ⚠️  Placeholder vendor URL: {reason}")
-                extracted['url'] = None
-                performance_tracker.record_hallucination('minor')
-        
-        # Check price for placeholder pattern
-        if extracted.get('price_per_unit'):
-            is_placeholder, reason = DataQualityChecker.is_placeholder_price(extracted['price_per_unit'])
-            if is_placeholder:
-                print(f"  ⚠️  {reason}")
-                performance_tracker.record_hallucination('minor')
-        
-        # Check vendor name quality
-        if extracted.get('vendor_name'):
-            is_generic, reason = DataQualityChecker.is_generic_vendor_name(extracted['vendor_name'])
-            if is_generic:
-                print(f"  ⚠️  {reason}")
-                performance_tracker.record_hallucination('critical')
-        
-        # Overall quality check
-        passed_quality, issues, quality_score = DataQualityChecker.validate_extraction_quality(
-            extracted, 
-            state.get('historical_vendors', [])
-        )
-        
-        if not passed_quality:
-            print(f"  ❌ DATA QUALITY CHECK FAILED (confidence: {quality_score:.2f})")
-            for issue in issues:
-                print(f"      {issue}")
-            performance_tracker.record_extraction(False, quality_score)
-            
-            # Still return the data but mark it as low quality
-            extracted['_quality_score'] = quality_score
-            extracted['_quality_issues'] = issues
+                        tracker.record_hallucination('major')
+        except Exception as e:
+            print(f"  ⚠️  Alternative contact search failed: {str(e)[:100]}")
+            # Fallback to checking LLM email
+            if extracted.get('contact_email'):
+                is_placeholder, reason = DataQualityChecker.is_placeholder_email(
+                    extracted['contact_email'],
+                    extracted.get('vendor_name')
+                )
+                if is_placeholder:
+                    print(f"  ⚠️  Placeholder email detected: {reason}")
+                    extracted['contact_email'] = None
+                    tracker.record_hallucination('major')
+
+    # Extract REAL URLs from source text
+    real_urls = extract_real_urls_from_text(raw_text)
+    if real_urls['product_url']:
+        extracted['product_url'] = real_urls['product_url']
+        print(f"  ✓ Real product URL: {real_urls['product_url'][:60]}...")
+    elif extracted.get('product_url'):
+        is_placeholder, reason = DataQualityChecker.is_placeholder_url(extracted['product_url'])
+        if is_placeholder:
+            print(f"  ⚠️  Placeholder product URL: {reason}")
+            extracted['product_url'] = None
+            tracker.record_hallucination('major')
+
+    if real_urls['vendor_url']:
+        extracted['url'] = real_urls['vendor_url']
+        print(f"  ✓ Real vendor URL: {real_urls['vendor_url'][:60]}...")
+    elif extracted.get('url'):
+        is_placeholder, reason = DataQualityChecker.is_placeholder_url(extracted['url'])
+        if is_placeholder:
+            print(f"  ⚠️  Placeholder vendor URL: {reason}")
+            extracted['url'] = None
+            tracker.record_hallucination('minor')
+
+    # Check price for placeholder pattern
+    if extracted.get('price_per_unit'):
+        is_placeholder, reason = DataQualityChecker.is_placeholder_price(extracted['price_per_unit'])
+        if is_placeholder:
+            print(f"  ⚠️  {reason}")
+            tracker.record_hallucination('minor')
+
+    # Check vendor name quality
+    if extracted.get('vendor_name'):
+        is_generic, reason = DataQualityChecker.is_generic_vendor_name(extracted['vendor_name'])
+        if is_generic:
+            print(f"  ⚠️  {reason}")
+            tracker.record_hallucination('critical')
+
+    # Overall quality check
+    passed_quality, issues, quality_score = DataQualityChecker.validate_extraction_quality(
+        extracted,
+        historical_vendors
+    )
+
+    if not passed_quality:
+        print(f"  ❌ DATA QUALITY CHECK FAILED (confidence: {quality_score:.2f})")
+        for issue in issues:
+            print(f"      {issue}")
+        tracker.record_extraction(False, quality_score)
+
+        # Still return the data but mark it as low quality
+        extracted['_quality_score'] = quality_score
+        extracted['_quality_issues'] = issues
+    else:
+        print(f"  ✅ Data quality check PASSED (confidence: {quality_score:.2f})")
+        tracker.record_extraction(True, quality_score)
+        extracted['_quality_score'] = quality_score
+
+    # ============ END ANTI-HALLUCINATION CHECKS ============
+
+    # TYPE COERCION: Fix common LLM mistakes
+    # Fix 1: Convert int prices to float
+    if 'price_per_unit' in extracted and isinstance(extracted['price_per_unit'], int):
+        extracted['price_per_unit'] = float(extracted['price_per_unit'])
+        _count_extraction('type_fixes')
+
+    # Fix 2: Convert list OS to string (join with commas)
+    if 'os' in extracted and isinstance(extracted['os'], list):
+        extracted['os'] = ', '.join(str(x) for x in extracted['os'])
+        _count_extraction('type_fixes')
+
+    # Fix 3: Convert float MOQ to int
+    if 'moq' in extracted and isinstance(extracted['moq'], float):
+        extracted['moq'] = int(extracted['moq'])
+        _count_extraction('type_fixes')
+
+    # Fix 4: Ensure platform is lowercase
+    if 'platform' in extracted and extracted['platform']:
+        extracted['platform'] = str(extracted['platform']).lower()
+
+    # Replace None values (keep them as None, don't convert to "Unknown")
+    # This is already handled by the prompt now
+
+    return extracted
+
+def extract_vendor_info(state: AgentState) -> AgentState:
+    """
+    Extract vendor information from raw HTML/text
+    Using LLM with strict prompting to minimize hallucinations
+    Skips the LLM when extracted_data was pre-filled by extract_vendors_batch()
+    """
+    print("\n>>> NODE 1: Extracting vendor information...")
+
+    if state.get('extracted_data') and state['retry_count'] == 0:
+        print(f"✓ Using batch-extracted data for: {state['extracted_data'].get('vendor_name', 'Unknown')}")
+        return {
+            **state,
+            "status": "extracted"
+        }
+
+    raw_text = state['raw_html']  # Full card: prompts are compacted to a token budget (prompt_compaction)
+
+    if not raw_text or len(raw_text) < 50:
+        return {
+            **state,
+            "extracted_data": {},
+            "error_log": "No content to extract from",
+            "status": "extraction_failed"
+        }
+
+    # FAST PATH: regex extraction with per-field confidence;
+    # the LLM only sees the fields that are missing or ambiguous
+    rule_extractor = get_rule_extractor()
+    rule_data, confidence = rule_extractor.extract(raw_text)
+    ask_fields = rule_extractor.uncertain_fields(confidence)
+    rule_extractor.record(ask_fields)
+
+    try:
+        if not ask_fields:
+            print("  ⚡ Rule-based extraction sufficient - LLM skipped")
+            extracted = rule_data
         else:
-            print(f"  ✅ Data quality check PASSED (confidence: {quality_score:.2f})")
-            performance_tracker.record_extraction(True, quality_score)
-            extracted['_quality_score'] = quality_score
-        
-        # ============ END ANTI-HALLUCINATION CHECKS ============
-        
-        # TYPE COERCION: Fix common LLM mistakes
-        # Fix 1: Convert int prices to float
-        if 'price_per_unit' in extracted and isinstance(extracted['price_per_unit'], int):
-            extracted['price_per_unit'] = float(extracted['price_per_unit'])
-        
-        # Fix 2: Convert list OS to string (join with commas)
-        if 'os' in extracted and isinstance(extracted['os'], list):
-            extracted['os'] = ', '.join(str(x) for x in extracted['os'])
-        
-        # Fix 3: Convert float MOQ to int
-        if 'moq' in extracted and isinstance(extracted['moq'], float):
-            extracted['moq'] = int(extracted['moq'])
-        
-        # Fix 4: Ensure platform is lowercase
-        if 'platform' in extracted and extracted['platform']:
-            extracted['platform'] = str(extracted['platform']).lower()
-        
-        # Replace None values (keep them as None, don't convert to "Unknown")
-        # This is already handled by the prompt now
-        
+            print(f"  → Asking LLM for {len(ask_fields)} uncertain fields: {', '.join(ask_fields)}")
+            response = _invoke_extraction_llm(build_targeted_prompt(raw_text, ask_fields, rule_data),
+                                              vendor_json_schema(ask_fields))
+            llm_data = _parse_llm_json(response)
+            extracted = RuleBasedExtractor.merge(rule_data, llm_data, ask_fields)
+
+        extracted = _postprocess_extraction(extracted, raw_text, state.get('historical_vendors', []))
+
         print(f"✓ Extracted data for: {extracted.get('vendor_name', 'Unknown')}")
-        
+
         return {
             **state,
             "extracted_data": extracted,
             "status": "extracted"
         }
-    
+
     except json.JSONDecodeError as e:
         print(f"✗ JSON parsing error: {e}")
         print(f"  Raw response (first 300 chars): {response[:300] if 'response' in locals() else 'N/A'}")
-        
-        # FALLBACK: Use rule-based extraction from raw text
-        print("  → Using fallback rule-based extraction...")
-        try:
-            import re
-            
-            # Extract basic info from raw text using regex
-            simple_data = {
-                "vendor_name": "Unknown Vendor",
-                "url": None,
-                "platform": "made-in-china",
-                "moq": None,
-                "price_per_unit": None,
-                "customizable": None,
-                "os": None,
-                "screen_size": None,
-                "touchscreen": None,
-                "camera_front": None,
-                "wall_mount": None,
-                "has_battery": None,
-                "product_type": None,
-                "description": raw_text[:200].replace('\n', ' ').replace('"', '').replace("'", ''),
-                "contact_email": None,
-                "product_name": None,
-                "product_url": None
-            }
-            
-            # Extract vendor name from raw text (first line or company pattern)
-            lines = [l.strip() for l in raw_text.split('\n') if l.strip()]
-            if lines:
-                # Try first non-empty line
-                first_line = lines[0]
-                if len(first_line) > 5 and len(first_line) < 150:
-                    simple_data['vendor_name'] = first_line[:100]
-            
-            # Look for company name patterns
-            name_match = re.search(r'([\w\s]+(?:Co\.|Ltd\.|Inc\.|Technology|Electronics|Display|Screen)[\w\s,\.]*)', raw_text[:500])
-            if name_match:
-                potential_name = name_match.group(1).strip()
-                if len(potential_name) > 5 and len(potential_name) < 100:
-                    simple_data['vendor_name'] = potential_name
-            
-            # Extract price (various formats)
-            price_patterns = [
-                r'US?\$\s*(\d+(?:\.\d{1,2})?)',  # $125 or US$125.50
-                r'(\d+(?:\.\d{1,2})?)\s*USD',     # 125 USD
-                r'Price[:\s]+(\d+(?:\.\d{1,2})?)', # Price: 125
-            ]
-            for pattern in price_patterns:
-                price_match = re.search(pattern, raw_text, re.IGNORECASE)
-                if price_match:
-                    simple_data['price_per_unit'] = float(price_match.group(1))
-                    break
-            
-            # Extract MOQ
-            moq_patterns = [
-                r'MOQ[:\s]*(\d+)',
-                r'Minimum[:\s]+(\d+)',
-                r'(\d+)\s+[Pp]ieces?\s+\(MOQ\)',
-            ]
-            for pattern in moq_patterns:
-                moq_match = re.search(pattern, raw_text, re.IGNORECASE)
-                if moq_match:
-                    simple_data['moq'] = int(moq_match.group(1))
-                    break
-            
-            # Detect Android
-            if 'android' in raw_text.lower():
-                simple_data['os'] = 'Android'
-                # Try to extract version
-                android_ver = re.search(r'Android\s+(\d+(?:\.\d+)?)', raw_text, re.IGNORECASE)
-                if android_ver:
-                    simple_data['os'] = f"Android {android_ver.group(1)}"
-            
-            # Detect screen size
-            size_match = re.search(r'(\d+\.?\d*)\s*(?:inch|"|′)', raw_text, re.IGNORECASE)
-            if size_match:
-                simple_data['screen_size'] = f"{size_match.group(1)} inch"
-            
-            # Detect touchscreen
-            if any(word in raw_text.lower() for word in ['touch screen', 'touchscreen', 'touch panel', 'capacitive']):
-                simple_data['touchscreen'] = True
-            
-            # Detect wall mount (CRITICAL)
-            if any(word in raw_text.lower() for word in ['wall mount', 'wall-mount', 'vesa', 'bracket']):
-                simple_data['wall_mount'] = True
-            elif any(word in raw_text.lower() for word in ['portable', 'handheld', 'tablet pc']):
-                simple_data['wall_mount'] = False
-            
-            # Detect battery (CRITICAL - we DON'T want battery)
-            if any(word in raw_text.lower() for word in ['battery', 'rechargeable', 'built-in battery']):
-                simple_data['has_battery'] = True
-            elif any(word in raw_text.lower() for word in ['dc adapter', '12v', 'wall powered', 'ac adapter']):
-                simple_data['has_battery'] = False
-            
-            # Detect product type
-            if any(word in raw_text.lower() for word in ['digital signage', 'smart display', 'advertising display', 'menu board']):
-                simple_data['product_type'] = 'smart screen'
-            elif 'tablet pc' in raw_text.lower() or 'portable tablet' in raw_text.lower():
-                simple_data['product_type'] = 'tablet'
-            
-            # Detect customizable
-            if any(word in raw_text.lower() for word in ['customizable', 'oem', 'odm', 'custom']):
-                simple_data['customizable'] = True
-            
-            # Extract contact email (NEW)
-            email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', raw_text)
-            if email_match:
-                simple_data['contact_email'] = email_match.group(1)
-            
-            # Extract product name (NEW) - try to find a descriptive title
-            product_name_patterns = [
-                r'(?:Product|Model|Name)[:\s]+([^\n]{10,100})',
-                r'^([^\n]{20,80}(?:Display|Screen|Panel|Monitor)[^\n]{0,20})',
-            ]
-            for pattern in product_name_patterns:
-                product_match = re.search(pattern, raw_text, re.IGNORECASE | re.MULTILINE)
-                if product_match:
-                    simple_data['product_name'] = product_match.group(1).strip()[:100]
-                    break
-            
-            # Try first meaningful line as product name if not found
-            if not simple_data['product_name']:
-                for line in lines[:5]:  # Check first 5 lines
-                    if any(word in line.lower() for word in ['display', 'screen', 'monitor', 'panel', 'signage']):
-                        simple_data['product_name'] = line[:100]
-                        break
-            
-            print(f"  ✓ Fallback extraction successful: {simple_data['vendor_name']}")
 
-            
-            return {
-                **state,
-                "extracted_data": simple_data,
-                "status": "extracted"
-            }
-            
-        except Exception as fallback_error:
-            print(f"  ✗ Fallback extraction also failed: {fallback_error}")
-            return {
-                **state,
-                "extracted_data": {},
-                "error_log": f"Both JSON and fallback extraction failed: {str(e)}",
-                "status": "extraction_failed",
-                "retry_count": state['retry_count'] + 1
-            }
-    
+        # FALLBACK: keep what the rules found
+        print("  → Using rule-based extraction only...")
+        extracted = _postprocess_extraction(rule_data, raw_text, state.get('historical_vendors', []))
+        return {
+            **state,
+            "extracted_data": extracted,
+            "status": "extracted"
+        }
+
     except Exception as e:
         print(f"✗ Extraction error: {e}")
         return {
@@ -512,6 +499,73 @@ JSON:"""
             "retry_count": state['retry_count'] + 1
         }
 
+# ==================== BATCH EXTRACTION ====================
+def extract_vendors_batch(raw_texts: List[str], historical_vendors: VendorHistory = None) -> List[Dict[str, Any]]:
+    """
+    Extract several vendor cards per LLM call (EXTRACTION['batch_size'] cards/prompt)
+    Returns one extracted_data dict per input text, in order ({} = let the agent extract it)
+    Cards the rule-based extractor fully covers never reach the LLM; for the rest,
+    confident rule fields win over the batch answer. Cards whose entry is missing
+    or malformed are left empty, so the agent's extract node handles them alone
+    """
+    historical_vendors = historical_vendors if historical_vendors is not None else get_vendor_history()
+    results: List[Dict[str, Any]] = [{} for _ in raw_texts]
+    batch_size = max(1, EXTRACTION['batch_size'])
+
+    if batch_size == 1:
+        return results
+
+    # Too-short cards are left to the agent (it reports "No content to extract from")
+    rule_extractor = get_rule_extractor()
+    pending = []
+    rule_results = {}
+    for i, text in enumerate(raw_texts):
+        if not text or len(text.strip()) < 50:
+            continue
+        rule_data, confidence = rule_extractor.extract(text)
+        ask_fields = rule_extractor.uncertain_fields(confidence)
+        if ask_fields:
+            rule_results[i] = (rule_data, ask_fields)
+            pending.append(i)
+        else:
+            rule_extractor.record(ask_fields)
+            print(f"\n  ⚡ Card {i + 1}: rule-based extraction sufficient - LLM skipped")
+            results[i] = _postprocess_extraction(rule_data, text, historical_vendors)
+
+    for chunk_start in range(0, len(pending), batch_size):
+        chunk = pending[chunk_start:chunk_start + batch_size]
+        cards = [(f"C{n + 1}", raw_texts[i]) for n, i in enumerate(chunk)]
+        print(f"\n>>> BATCH EXTRACTION: {len(cards)} cards in one LLM call...")
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            response = _invoke_extraction_llm(_build_batch_extraction_prompt(cards),
+                                              batch_json_schema([card_id for card_id, _ in cards]), '[{')
+            parsed = _parse_llm_json(response, '[', ']')
+            if isinstance(parsed, dict):
+                parsed = [dict(v, card_id=k) for k, v in parsed.items() if isinstance(v, dict)]
+            for entry in parsed:
+                if isinstance(entry, dict) and entry.get('card_id'):
+                    entries[str(entry.pop('card_id')).strip()] = entry
+        except Exception as e:
+            print(f"  ✗ Batch response unusable ({str(e)[:80]}) - falling back to single-card extraction")
+
+        for (card_id, raw_text), index in zip(cards, chunk):
+            entry = entries.get(card_id)
+            # An entry must at least look like our schema to be trusted
+            if not entry or not any(entry.get(key) for key in ('vendor_name', 'product_name', 'description')):
+                print(f"  → Card {card_id}: no valid entry, will be extracted individually")
+                _count_extraction('batch_fallbacks')
+                continue
+
+            rule_data, ask_fields = rule_results[index]
+            rule_extractor.record(ask_fields)
+            merged = RuleBasedExtractor.merge(rule_data, entry, ask_fields)
+            print(f"  ✓ Card {card_id}: {merged.get('vendor_name', 'Unknown')}")
+            results[index] = _postprocess_extraction(merged, raw_text, historical_vendors)
+
+    return results
+
 # ==================== NODE 2: VALIDATION ====================
 def validate_extracted_data(state: AgentState) -> AgentState:
     """
@@ -554,7 +608,7 @@ def validate_extracted_data(state: AgentState) -> AgentState:
     clean_extracted = {k: v for k, v in extracted.items() if not k.startswith('_')}
     
     # Run all validation layers (use original schema with tuples)
-    passed, results = validator.validate_all(
+    passed, results = get_validator().validate_all(
         data=clean_extracted,
         source_text=state['raw_html'],
         expected_schema=VENDOR_SCHEMA,
@@ -575,7 +629,7 @@ def validate_extracted_data(state: AgentState) -> AgentState:
     
     if passed:
         print("\n✓ ALL VALIDATION LAYERS PASSED - Data is factual and reliable")
-        performance_tracker.award_points(10, "Passed all validation layers")
+        get_performance_tracker().award_points(10, "Passed all validation layers")
         return {
             **state,
             "validation_results": results,
@@ -584,7 +638,7 @@ def validate_extracted_data(state: AgentState) -> AgentState:
         }
     else:
         print("\n✗ VALIDATION FAILED - Data rejected (potential hallucination or constraint violation)")
-        performance_tracker.deduct_points(5, "Failed validation layers")
+        get_performance_tracker().deduct_points(5, "Failed validation layers")
         return {
             **state,
             "validation_results": results,
@@ -593,6 +647,8 @@ def validate_extracted_data(state: AgentState) -> AgentState:
         }
 
 # ==================== NODE 3: SCORING ====================
+SCORING_KEYWORDS = KeywordMatcher({'ips': ['ips'], 'mounted': ['wall', 'mount']})
+
 def score_vendor(state: AgentState) -> AgentState:
     """
     Calculate vendor score based on validated data
@@ -662,13 +718,13 @@ def score_vendor(state: AgentState) -> AgentState:
         score += SCORING_WEIGHTS['customizable']
     
     # IPS Panel (bonus if mentioned)
-    desc = str(validated.get('description', '')).lower()
-    if 'ips' in desc:
+    desc_hits = SCORING_KEYWORDS.scan(str(validated.get('description', '')))
+    if desc_hits.any('ips'):
         score += SCORING_WEIGHTS.get('ips_panel', 0)
     
     # REJECT if clearly a portable tablet
     product_type = str(validated.get('product_type', '')).lower()
-    if 'tablet' in product_type and 'wall' not in desc and 'mount' not in desc:
+    if 'tablet' in product_type and not desc_hits.any('mounted'):
         score -= 30  # Major penalty for tablets
     
     # Ensure score is not negative
@@ -726,22 +782,10 @@ def save_to_database(state: AgentState) -> AgentState:
         }
     
     try:
-        conn = sqlite3.connect(VENDORS_DB)
-        cursor = conn.cursor()
-        
         # Get current date for discovered_date
         today = datetime.now().strftime('%Y-%m-%d')
         
-        cursor.execute('''
-            INSERT OR IGNORE INTO vendors (
-                vendor_name, url, platform, moq, price_per_unit,
-                customizable, os, screen_size, touchscreen,
-                camera_front, wall_mount, has_battery, product_type,
-                contact_email, product_description, product_name, product_url,
-                score, status, raw_data,
-                discovered_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        row = (
             validated.get('vendor_name'),
             validated.get('url'),
             validated.get('platform'),
@@ -762,42 +806,34 @@ def save_to_database(state: AgentState) -> AgentState:
             validated.get('score'),
             'new',
             json.dumps(validated),
-            today
-        ))
-        
-        vendor_id = cursor.lastrowid
-        
-        # Save validation log
-        cursor.execute('''
-            INSERT INTO validation_logs (vendor_id, validation_passed, layer_results)
-            VALUES (?, ?, ?)
-        ''', (
-            vendor_id,
-            True,
-            json.dumps([(name, {"passed": r.passed, "reason": r.reason, "confidence": r.confidence}) 
-                       for name, r in state['validation_results']])
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-        print(f"✓ Vendor saved to database (ID: {vendor_id})")
-        
-        # NEW: Request human feedback via Telegram (TEXT-BASED)
-        try:
-            import os
-            telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
-            telegram_chat = os.getenv('TELEGRAM_CHAT_ID')
-            
-            if telegram_token and telegram_chat:
-                from telegram_text_feedback import TelegramTextFeedbackCollector
-                feedback_collector = TelegramTextFeedbackCollector(telegram_token, telegram_chat)
-                feedback_collector.send_vendor_for_review(vendor_id)
-        except Exception as e:
-            print(f"  ⚠️  Feedback request skipped: {str(e)[:100]}")
+            today,
+            content_fingerprint(state['raw_html'])
+        )
+        layer_results = json.dumps([(name, {"passed": r.passed, "reason": r.reason, "confidence": r.confidence})
+                                    for name, r in state['validation_results']])
+        
+        # Write-behind: committed with the rest of the batch (vendor_writer.py)
+        save_future = get_vendor_writer().submit(validated, row, layer_results)
+        
+        raw_html = state['raw_html']
+        def on_saved(future):
+            if future.exception():
+                return
+            vendor_id, inserted = future.result()
+            # Keep the near-duplicate index in step with the vendors table
+            near_duplicates = get_near_duplicate_index()
+            if inserted and near_duplicates:
+                try:
+                    near_duplicates.add(f"vendor:{vendor_id}", raw_html, validated.get('vendor_name'))
+                except Exception as e:
+                    print(f"⚠️  Near-duplicate index update failed: {e}")
+        save_future.add_done_callback(on_saved)
+        
+        print("✓ Vendor queued for database write")
         
         return {
             **state,
+            "save_future": save_future,
             "status": "saved"
         }
     
@@ -809,11 +845,38 @@ def save_to_database(state: AgentState) -> AgentState:
             "status": "save_failed"
         }
 
+# ==================== NODE 5: NOTIFY ====================
+def notify_reviewer(state: AgentState) -> AgentState:
+    """
+    Request human feedback via Telegram (TEXT-BASED) for a saved vendor
+    Separate from saving so slow Telegram calls never hold up DB writes
+    """
+    if state['status'] != 'saved' or not state.get('save_future'):
+        return state
+    
+    telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
+    telegram_chat = os.getenv('TELEGRAM_CHAT_ID')
+    if not (telegram_token and telegram_chat):
+        return state  # Nobody needs the row id: don't wait for the batch commit
+    
+    try:
+        vendor_id, _ = state['save_future'].result()  # Waits for the write-behind flush
+        if vendor_id:
+            from telegram_text_feedback import TelegramTextFeedbackCollector
+            feedback_collector = TelegramTextFeedbackCollector(telegram_token, telegram_chat)
+            feedback_collector.send_vendor_for_review(vendor_id)
+        return {**state, "vendor_id": vendor_id}
+    except Exception as e:
+        print(f"  ⚠️  Feedback request skipped: {str(e)[:100]}")
+    
+    return state
+
 # ==================== ROUTING LOGIC ====================
 def should_retry(state: AgentState) -> str:
     """Decide if we should retry extraction"""
     if state['status'] == 'extraction_failed' and state['retry_count'] < 2:
         print("→ Retrying extraction...")
+        _count_extraction('retries')
         return "extract"
     elif state['status'] in ['validated', 'scored', 'saved']:
         return "end"
@@ -825,16 +888,43 @@ def should_retry(state: AgentState) -> str:
         return "end"
 
 # ==================== BUILD THE GRAPH ====================
-def build_agent():
-    """Build the LangGraph agent with validation layers"""
+def timed_node(name: str, node, node_timings: Dict[str, List[float]]):
+    """Wrap a node so each call's latency is appended to node_timings[name]"""
+    def wrapper(state: AgentState) -> AgentState:
+        start = time.perf_counter()
+        try:
+            return node(state)
+        finally:
+            node_timings.setdefault(name, []).append(time.perf_counter() - start)
+    return wrapper
+
+AGENT_NODES = [
+    ("extract", extract_vendor_info),
+    ("validate", validate_extracted_data),
+    ("score", score_vendor),
+    ("save", save_to_database),
+    ("notify", notify_reviewer),
+]
+
+def build_agent(node_timings: Dict[str, List[float]] = None, last_node: str = "notify"):
+    """
+    Build the LangGraph agent with validation layers
+    Pass a dict as node_timings to collect per-node latencies (seconds)
+    last_node: stop the graph early (the streaming pipeline runs "extract" only,
+    with the same retry routing, and does the later nodes in its own stages)
+    """
+    from langgraph.graph import StateGraph, END  # Heavy: only entry points that run the agent pay for it
     
     workflow = StateGraph(AgentState)
     
+    names = [name for name, _ in AGENT_NODES]
+    nodes = AGENT_NODES[:names.index(last_node) + 1]
+    
     # Add nodes
-    workflow.add_node("extract", extract_vendor_info)
-    workflow.add_node("validate", validate_extracted_data)
-    workflow.add_node("score", score_vendor)
-    workflow.add_node("save", save_to_database)
+    for name, node in nodes:
+        if node_timings is not None:
+            node = timed_node(name, node, node_timings)
+        workflow.add_node(name, node)
     
     # Set entry point
     workflow.set_entry_point("extract")
@@ -845,12 +935,13 @@ def build_agent():
         should_retry,
         {
             "extract": "extract",
-            "end": "validate"
+            "end": nodes[1][0] if len(nodes) > 1 else END
         }
     )
-    workflow.add_edge("validate", "score")
-    workflow.add_edge("score", "save")
-    workflow.add_edge("save", END)
+    for (name, _), (next_name, _) in zip(nodes[1:], nodes[2:]):
+        workflow.add_edge(name, next_name)
+    if len(nodes) > 1:
+        workflow.add_edge(nodes[-1][0], END)
     
     return workflow.compile()
 
@@ -893,18 +984,7 @@ if __name__ == "__main__":
     print("TESTING WITH SAMPLE VENDOR")
     print("=" * 60)
     
-    initial_state = {
-        "task": "extract_and_validate_vendor",
-        "search_query": "15.6 inch Android tablet",
-        "raw_html": sample_vendor_text,
-        "extracted_data": {},
-        "validation_results": [],
-        "validated_data": {},
-        "historical_vendors": [],
-        "retry_count": 0,
-        "error_log": "",
-        "status": "initialized"
-    }
+    initial_state = make_initial_state(sample_vendor_text, "15.6 inch Android tablet")
     
     # Run agent
     final_state = agent.invoke(initial_state)
@@ -922,7 +1002,7 @@ if __name__ == "__main__":
             print(f"Error: {final_state['error_log']}")
     
     # Print validation report
-    print("\n" + validator.get_validation_report())
+    print("\n" + get_validator().get_validation_report())
     
     # Print performance report
-    print(performance_tracker.get_performance_report())
+    print(get_performance_tracker().get_performance_report())
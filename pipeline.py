@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Streaming Vendor Pipeline - Producer/consumer stages with bounded queues
+    scrape → dedupe → extract → validate+score → save → notify
+- Each stage has its own worker count (PIPELINE['workers'])
+- Bounded queues give backpressure: scraping pauses when extraction falls behind
+- Network-bound scraping overlaps with CPU-bound LLM extraction,
+  so the runtime budget is spent on useful work instead of waiting
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import PIPELINE, DISCOVERY, EXTRACTION, DEDUP
+from dedup_index import DedupIndex, content_fingerprint
+from near_duplicates import get_near_duplicate_index
+from vendor_history import get_vendor_history
+from vendor_writer import get_vendor_writer
+from oem_search import AGENT_NODES, build_agent, make_initial_state, extract_vendors_batch, timed_node
+
+STOP = object()  # End-of-stream marker, one per worker
+
+
+class Batch(list):
+    """Items that reach the handler together, as one micro-batch (replay: recorded extraction groups)"""
+
+
+class PipelineStage:
+    """N workers pulling (micro-batches of) items from one bounded queue"""
+
+    def __init__(self, name: str, handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                 workers: int = 1, queue_size: int = None, batch_size: int = 1):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or PIPELINE['queue_size'])
+        self.next_stage: Optional['PipelineStage'] = None
+        self._carry = None  # Item read past the end of a micro-batch; the next take starts with it
+        self.stats = {'in': 0, 'out': 0, 'busy_seconds': 0.0, 'max_depth': 0, 'errors': 0}
+
+    async def put(self, item):
+        """Blocks while the queue is full (backpressure on the upstream stage)"""
+        await self.queue.put(item)
+        if item is not STOP:
+            self.stats['in'] += len(item) if isinstance(item, Batch) else 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], self.queue.qsize())
+
+    async def close(self):
+        """Upstream is done: one STOP per worker"""
+        for _ in range(self.workers):
+            await self.queue.put(STOP)
+
+    async def _take(self) -> Optional[List[Any]]:
+        """Next item plus whatever else is already waiting (up to batch_size)"""
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+        else:
+            item = await self.queue.get()
+        if item is STOP:
+            return None
+        if isinstance(item, Batch):
+            return list(item)
+        items = [item]
+        while len(items) < self.batch_size:
+            try:
+                extra = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if extra is STOP or isinstance(extra, Batch):
+                self._carry = extra  # Ends this batch; the same worker takes it next, in order
+                break
+            items.append(extra)
+        return items
+
+    async def _worker(self):
+        while True:
+            items = await self._take()
+            if items is None:
+                return
+
+            start = time.perf_counter()
+            try:
+                results = await self.handler(items)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"  ❌ [{self.name}] {type(e).__name__}: {str(e)[:100]}")
+                results = []
+            finally:
+                self.stats['busy_seconds'] += time.perf_counter() - start
+
+            self.stats['out'] += len(results)
+            if self.next_stage:
+                for result in results:
+                    await self.next_stage.put(result)
+
+    async def run(self):
+        await asyncio.gather(*[self._worker() for _ in range(self.workers)])
+        if self.next_stage:
+            await self.next_stage.close()
+
+
+class VendorPipeline:
+    """Streams scraped vendors through extraction, scoring, saving and notification"""
+
+    def __init__(self, scraper, learning_engine=None, recorder=None, deadline: float = None,
+                 max_vendors: int = None, settings: Dict = None, dedup_index: DedupIndex = None,
+                 node_timings: Dict[str, List[float]] = None):
+        self.scraper = scraper
+        self.learning_engine = learning_engine
+        self.recorder = recorder
+        self.deadline = deadline
+        self.max_vendors = max_vendors
+        self.settings = {**PIPELINE, **(settings or {})}
+        workers = self.settings['workers']
+
+        self.stages = [
+            PipelineStage('dedupe', self._dedupe, workers['dedupe']),
+            PipelineStage('extract', self._extract, workers['extract'], batch_size=EXTRACTION['batch_size']),
+            PipelineStage('score', self._score, workers['score']),
+            PipelineStage('save', self._save, workers['save']),
+            PipelineStage('notify', self._notify, workers['notify']),
+        ]
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next_stage = next_stage
+
+        # Loaded once per run: known vendors + cards seen in earlier runs
+        if dedup_index is None and DEDUP['enabled']:
+            dedup_index = DedupIndex.load()
+        self.dedup_index = dedup_index
+        self.near_duplicates = get_near_duplicate_index()
+        # The agent graph up to "extract": same node and retry routing (should_retry) as build_agent()
+        self.extract_agent = build_agent(node_timings, last_node="extract")
+        # The later nodes run in their own stages; node_timings (replay) times them like the graph would
+        self.node_timings = node_timings
+        self.nodes = {name: node if node_timings is None else timed_node(name, node, node_timings)
+                      for name, node in AGENT_NODES}
+        get_vendor_history()  # Load the history snapshot once, before the worker threads need it
+        self.near_duplicate_groups: Dict[str, List[str]] = {}  # representative → grouped vendor names
+        self._run_cards: Dict[str, str] = {}  # run:<fingerprint> → current representative's vendor name
+        self._group_of: Dict[str, str] = {}  # run:<fingerprint> of a card in flight → its group's key
+        self._held: Dict[str, List[Dict]] = {}  # group → members waiting on the representative's outcome
+        self._saved_groups = set()  # Groups whose representative was saved: members stay skipped
+        self._promoted: List[Dict] = []  # Members to try because their representative was not saved
+        self._extract_batches = 0
+        self.results = {'scraped': 0, 'duplicates': 0, 'near_duplicates': 0, 'promoted': 0, 'skipped_learned': 0,
+                        'extraction_failed': 0, 'not_saved': 0, 'saved': 0, 'timed_out': 0}
+        self._lock = threading.Lock()  # results and near-duplicate groups are updated from worker threads
+
+    def _count(self, result: str, n: int = 1):
+        with self._lock:
+            self.results[result] += n
+
+    # ---------- budget ----------
+    def _time_left(self) -> bool:
+        return self.deadline is None or time.time() < self.deadline
+
+    def _should_stop(self) -> bool:
+        if not self._time_left():
+            return True
+        return self.max_vendors is not None and self.results['saved'] >= self.max_vendors
+
+    # ---------- stage 0: scrape (producer) ----------
+    async def _produce(self, keywords: List[str]):
+        batch_size = DISCOVERY['keywords_per_batch']
+        try:
+            for batch_start in range(0, len(keywords), batch_size):
+                if self._should_stop():
+                    print(f"\n⏹️  Budget reached - no more scraping")
+                    break
+
+                keyword_batch = keywords[batch_start:batch_start + batch_size]
+                print(f"\n[{batch_start + 1}-{batch_start + len(keyword_batch)}/{len(keywords)}] "
+                      f"Scraping {len(keyword_batch)} keywords: {', '.join(keyword_batch)}")
+                try:
+                    vendors = await self.scraper.discover_concurrently(
+                        keyword_batch, max_results=self.settings['results_per_keyword']
+                    )
+                except Exception as e:
+                    print(f"  ❌ Scraping error for batch {keyword_batch}: {str(e)[:200]}")
+                    continue
+
+                print(f"  📥 Scraped {len(vendors)} vendors")
+                for vendor_data in vendors:
+                    self._count('scraped')
+                    await self.stages[0].put(vendor_data)
+        finally:
+            await self.stages[0].close()
+
+    # ---------- stage 1: dedupe ----------
+    async def _dedupe(self, vendors: List[Dict]) -> List[Dict]:
+        kept = []
+        for vendor_data in vendors:
+            vendor_name = vendor_data.get('vendor_name', 'Unknown')
+            if self.dedup_index:
+                is_duplicate, reason = self.dedup_index.check(vendor_data)
+                if is_duplicate:
+                    print(f"  ⏭️  Skipping '{vendor_name}' ({reason})")
+                    self._count('duplicates')
+                    continue
+
+            # Learning: Should we retry this vendor? (before grouping: held near-duplicates may be tried later)
+            if self.learning_engine and not await asyncio.to_thread(
+                    self.learning_engine.should_retry_vendor, vendor_name):
+                print(f"  ⏭️  Skipping '{vendor_name}' (learned to avoid)")
+                self._count('skipped_learned')
+                continue
+
+            if self.near_duplicates:
+                representative = await asyncio.to_thread(self._near_duplicate_of, vendor_data)
+                if representative:
+                    print(f"  ⏭️  Skipping '{vendor_name}' (near-duplicate of {representative})")
+                    self._count('near_duplicates')
+                    continue
+            kept.append(vendor_data)
+        return kept
+
+    def _near_duplicate_of(self, vendor_data: Dict) -> Optional[str]:
+        """
+        Groups near-identical cards before extraction: the first card of a group
+        goes on, later ones are attached to it (or to the saved vendor they match)
+        and held until the representative's outcome is known (_settle_near_duplicates)
+        """
+        raw_text = vendor_data.get('raw_text', '')
+        vendor_name = vendor_data.get('vendor_name', '')
+        signature = self.near_duplicates.signature_for(raw_text, vendor_name)
+        with self._lock:  # Query + add as one step, or two dedupe workers both let a group through
+            match = self.near_duplicates.query(signature=signature)
+            if match:
+                key, _ = match
+                self.near_duplicate_groups.setdefault(key, []).append(vendor_name)
+                if key.startswith('vendor:'):
+                    return f"saved vendor #{key.split(':', 1)[1]}"
+                if key not in self._saved_groups:
+                    self._held.setdefault(key, []).append(vendor_data)
+                return f"'{self._run_cards.get(key, key)}'"
+
+            # Only for this run; saved vendors are persisted by save_to_database
+            key = f"run:{content_fingerprint(raw_text)}"
+            self._run_cards[key] = vendor_name
+            self._group_of[key] = key
+            self.near_duplicates.add(key, signature=signature, persist=False)
+        return None
+
+    def _settle_near_duplicates(self, vendor_data: Dict, saved: bool):
+        """
+        A group representative's outcome is final: once saved, its group stays skipped;
+        otherwise the next held member becomes the representative and is tried next round
+        """
+        if not self.near_duplicates:
+            return
+        with self._lock:
+            group = self._group_of.pop(f"run:{content_fingerprint(vendor_data.get('raw_text', ''))}", None)
+            if group is None:
+                return
+            if saved:
+                self._saved_groups.add(group)
+                self._held.pop(group, None)
+                return
+            held = self._held.get(group)
+            if held:
+                member = held.pop(0)
+                self._group_of[f"run:{content_fingerprint(member.get('raw_text', ''))}"] = group
+                self._run_cards[group] = member.get('vendor_name', 'Unknown')
+                self._promoted.append(member)
+                self.results['promoted'] += 1
+
+    def _mark_processed(self, vendor_data: Dict, outcome: str):
+        if self.dedup_index:
+            self.dedup_index.mark_processed(vendor_data, outcome)
+
+    # ---------- stage 2: extract (LLM, micro-batched) ----------
+    def _extract_sync(self, vendors: List[Dict]) -> List[Dict]:
+        with self._lock:
+            self._extract_batches += 1
+            batch = self._extract_batches
+        if self.recorder:
+            for vendor_data in vendors:
+                self.recorder.record_vendor(vendor_data, batch)
+
+        start = time.perf_counter()
+        batch_extracted = extract_vendors_batch([v.get('raw_text', str(v)) for v in vendors])
+        if self.node_timings is not None:
+            self.node_timings.setdefault('batch', []).append(time.perf_counter() - start)
+        states = []
+        for vendor_data, extracted_data in zip(vendors, batch_extracted):
+            state = make_initial_state(
+                vendor_data.get('raw_text', str(vendor_data)),
+                vendor_data.get('search_keyword', ''),
+                extracted_data
+            )
+            state = self.extract_agent.invoke(state)
+
+            if state['status'] == 'extracted':
+                states.append({'vendor_name': vendor_data.get('vendor_name', 'Unknown'),
+                               'vendor_data': vendor_data, 'state': state})
+            else:
+                self._count('extraction_failed')
+                self._mark_processed(vendor_data, state['status'])
+                self._settle_near_duplicates(vendor_data, saved=False)
+        return states
+
+    async def _extract(self, vendors: List[Dict]) -> List[Dict]:
+        if not self._time_left():
+            self._count('timed_out', len(vendors))
+            return []
+        return await asyncio.to_thread(self._extract_sync, vendors)
+
+    # ---------- stage 3: validate + score ----------
+    def _score_sync(self, items: List[Dict]) -> List[Dict]:
+        for item in items:
+            item['state'] = self.nodes['score'](self.nodes['validate'](item['state']))
+        return items
+
+    async def _score(self, items: List[Dict]) -> List[Dict]:
+        return await asyncio.to_thread(self._score_sync, items)
+
+    # ---------- stage 4: save ----------
+    def _save_sync(self, items: List[Dict]) -> List[Dict]:
+        saved = []
+        for item in items:
+            item['state'] = self.nodes['save'](item['state'])
+            if item['state']['status'] == 'saved':
+                self._count('saved')
+                score = item['state'].get('validated_data', {}).get('score', 0)
+                print(f"  ✅ Saved: {item['vendor_name']} (Score: {score}/100)")
+                saved.append(item)
+            else:
+                self._count('not_saved')
+                print(f"  ⚠️  Status: {item['state']['status']} ({item['vendor_name']})")
+            self._mark_processed(item['vendor_data'], item['state']['status'])
+            self._settle_near_duplicates(item['vendor_data'], item['state']['status'] == 'saved')
+        return saved
+
+    async def _save(self, items: List[Dict]) -> List[Dict]:
+        return await asyncio.to_thread(self._save_sync, items)
+
+    # ---------- stage 5: notify ----------
+    async def _notify(self, items: List[Dict]) -> List[Dict]:
+        for item in items:
+            await asyncio.to_thread(self.nodes['notify'], item['state'])
+        return items
+
+    # ---------- run ----------
+    async def _requeue(self, vendors: List[Any]):
+        """Feed already-deduplicated cards (or Batches of them) straight to extraction"""
+        try:
+            for vendor_data in vendors:
+                await self.stages[1].put(vendor_data)
+        finally:
+            await self.stages[1].close()
+
+    async def run(self, keywords: List[str]) -> int:
+        """Run all stages concurrently until the scraper is exhausted; returns vendors saved"""
+        return await self._run(self._produce(keywords), self.stages)
+
+    async def run_batches(self, batches: List[List[Dict]]) -> int:
+        """
+        Already-scraped, deduplicated cards from extraction on, one micro-batch per group
+        (replay: the recorded groups, so every batch prompt matches the recording)
+        """
+        return await self._run(self._requeue([Batch(batch) for batch in batches]), self.stages[1:])
+
+    async def _run(self, producer: Awaitable, stages: List[PipelineStage]) -> int:
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(producer, *[stage.run() for stage in stages])
+
+            # Near-duplicates of cards that were not saved get their turn, one member per group per round
+            while self._promoted and not self._should_stop():
+                promoted, self._promoted = self._promoted, []
+                print(f"\n🔁 Trying {len(promoted)} near-duplicate(s) of cards that were not saved")
+                await asyncio.gather(self._requeue(promoted), *[stage.run() for stage in self.stages[1:]])
+        finally:
+            # Commit the last partial batch before outreach/reporting read the vendors table
+            await asyncio.to_thread(get_vendor_writer().flush)
+        self.elapsed = time.perf_counter() - start
+        return self.results['saved']
+
+    def get_report(self) -> str:
+        r = self.results
+        lines = [
+            "\n=== STREAMING PIPELINE ===",
+            f"  Scraped {r['scraped']} → duplicates {r['duplicates']}, near-duplicates {r['near_duplicates']} "
+            f"({len(self.near_duplicate_groups)} groups, {r['promoted']} tried after their representative "
+            f"was not saved), learned-skip {r['skipped_learned']}, "
+            f"timed out {r['timed_out']}, extraction failed {r['extraction_failed']}, "
+            f"not saved {r['not_saved']}, saved {r['saved']}",
+            f"  {'stage':<8} {'workers':>7} {'in':>5} {'out':>5} {'busy':>8} {'max queue':>10}",
+        ]
+        for stage in self.stages:
+            s = stage.stats
+            lines.append(f"  {stage.name:<8} {stage.workers:>7} {s['in']:>5} {s['out']:>5} "
+                         f"{s['busy_seconds']:>7.1f}s {s['max_depth']:>10}")
+        if self.dedup_index:
+            lines.append(f"  {self.dedup_index.get_stats_report()}")
+        if self.near_duplicates:
+            lines.append(f"  {self.near_duplicates.get_stats_report()}")
+        lines.append(f"  {get_vendor_writer().get_stats_report()}")
+        return '\n'.join(lines)
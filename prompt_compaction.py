@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Prompt Compaction - Fit product card text into a token budget
+Replaces blind [:N] truncation of the card text in extraction prompts:
+- Repeated lines are dropped (case / whitespace-insensitive, "Title: X" repeats "X")
+- Navigation, UI labels, scraper framing and the "INSTRUCTIONS FOR EXTRACTION"
+  footer are stripped
+- Lines are kept by priority (company / price / MOQ / title first, then spec
+  key: value lines, then the rest) until the budget is full, in original order
+- The budget uses a chars-per-token estimate on every install, so the same card
+  always gives the same prompt (recorded prompts replay everywhere)
+- The reported token totals use the model's tokenizer when its tokenizer.json is
+  on disk (PROMPT_COMPACTION['tokenizer_file'], never downloaded)
+
+Usage:
+    text = compact_text(raw_text, PROMPT_COMPACTION['card_tokens'])
+"""
+
+import math
+import os
+import re
+import threading
+from typing import List
+
+from config import PROMPT_COMPACTION
+from text_matching import compile_any
+
+WHITESPACE = re.compile(r'\s+')
+
+# Lines that open a block of boilerplate; the "- ..." lines under them go too
+BOILERPLATE_BLOCKS = compile_any([r'instructions for extraction:?'], re.IGNORECASE)
+
+# Whole lines with no product information
+BOILERPLATE_LINES = compile_any([
+    r'product listing from .* search results:?',
+    r'full product card text:?',
+    r'(?:home|sign in|join free|log ?in|register|menu|share|report|compare|video|favorites?|more|view more|learn more)',
+    r'(?:contact now|chat now|send inquiry|inquiry basket|add to inquiry basket|add to favorites|get latest price)',
+    r'(?:contact supplier|start order|buy now|add to cart|request a quote|send message|leave a message)',
+    r'(?:diamond|gold|audited) (?:member|supplier)(?: since \d+)?',
+    r'.*(?:copyright|all rights reserved|cookie).*',
+    r'[\W_]{1,3}',  # Separators, bullets
+], re.IGNORECASE)
+
+# "Key: placeholder" lines the scraper writes when it found nothing
+PLACEHOLDER_VALUE = re.compile(
+    r'^[^:]{1,30}:\s*(?:not found in listing|not specified in listing|not available|contact supplier|unknown|n/?a)$',
+    re.IGNORECASE
+)
+
+# Priority 2: what the extraction asks for first
+KEY_LINE = compile_any([
+    r'co\.|ltd|limited|\binc\b|corp|company|factory|manufacturer|supplier|vendor',
+    r'\$|usd|price|fob',
+    r'moq|minimum order|min\.? order',
+    r'^title:',
+], re.IGNORECASE)
+
+# Priority 1: spec-like "key: value" lines and spec keywords
+SPEC_LINE = compile_any([
+    r'^[^:：]{2,40}[:：]\s*\S',
+    r'inch|android|linux|touch|camera|battery|wall|vesa|mount|bracket|resolution|\bram\b|\brom\b|cpu',
+    r'\bpoe\b|nfc|wi-?fi|\b4g\b|lte|adapter|\bdc\b|signage|oem|odm|custom',
+], re.IGNORECASE)
+
+_tokenizer = None  # False once loading failed (use the estimate)
+_tokenizer_lock = threading.Lock()
+_stats = {'cards': 0, 'tokens_in': 0, 'tokens_out': 0, 'duplicate_lines': 0,
+          'boilerplate_lines': 0, 'over_budget_lines': 0}
+_stats_lock = threading.Lock()  # Extraction runs on several worker threads
+
+
+def _count(**amounts):
+    with _stats_lock:
+        for name, amount in amounts.items():
+            _stats[name] += amount
+
+
+def _get_tokenizer():
+    """The model's tokenizer from a local tokenizer.json, loaded on first use (None → estimate)"""
+    global _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer is None:
+            _tokenizer = False
+            path = PROMPT_COMPACTION['tokenizer_file']
+            if path and os.path.exists(path):
+                try:
+                    from tokenizers import Tokenizer
+                    _tokenizer = Tokenizer.from_file(path)
+                except Exception as e:
+                    print(f"  ⚠️  Tokenizer {path} unavailable ({str(e)[:80]}) - "
+                          f"estimating {PROMPT_COMPACTION['chars_per_token']} chars/token")
+    return _tokenizer or None
+
+
+def count_tokens(text: str) -> int:
+    """Budget estimate: the same on every install, so compaction never depends on the tokenizer"""
+    return math.ceil(len(text) / PROMPT_COMPACTION['chars_per_token'])
+
+
+def measure_tokens(text: str) -> int:
+    """Token count for the reports: the model's tokenizer when available, else the estimate"""
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+    return count_tokens(text)
+
+
+def _priority(line: str) -> int:
+    if KEY_LINE.search(line):
+        return 2
+    if SPEC_LINE.search(line):
+        return 1
+    return 0
+
+
+def clean_lines(text: str) -> List[str]:
+    """Whitespace-normalized lines without duplicates or boilerplate (counted in the stats)"""
+    lines = []
+    seen = set()
+    in_block = False
+    boilerplate = duplicates = 0
+    for line in str(text or '').splitlines():
+        line = WHITESPACE.sub(' ', line).strip()[:PROMPT_COMPACTION['max_line_chars']]
+        if in_block:
+            if line.startswith('-'):
+                boilerplate += 1
+                continue
+            in_block = False
+        if BOILERPLATE_BLOCKS.fullmatch(line):
+            in_block = True
+            boilerplate += 1
+            continue
+        if not line:
+            continue
+        if BOILERPLATE_LINES.fullmatch(line) or PLACEHOLDER_VALUE.match(line):
+            boilerplate += 1
+            continue
+        key = line.lower()
+        if key in seen:  # Also catches a bare value already given as "Label: value"
+            duplicates += 1
+            continue
+        seen.add(key)
+        label, colon, value = key.partition(':')
+        if colon and len(label) <= 30 and value.strip():
+            seen.add(value.strip())
+        lines.append(line)
+    _count(boilerplate_lines=boilerplate, duplicate_lines=duplicates)
+    return lines
+
+
+def compact_text(text: str, budget_tokens: int = None) -> str:
+    """Card text cut down to budget_tokens (default PROMPT_COMPACTION['card_tokens']), key lines first"""
+    budget_tokens = budget_tokens or PROMPT_COMPACTION['card_tokens']
+    lines = clean_lines(text)
+    costs = [count_tokens(line) + 1 for line in lines]  # +1: the newline
+
+    # Highest priority first, original order within a priority
+    ranked = sorted(range(len(lines)), key=lambda i: (-_priority(lines[i]), i))
+    kept = set()
+    used = 0
+    for i in ranked:
+        if used + costs[i] <= budget_tokens:
+            kept.add(i)
+            used += costs[i]
+
+    compacted = "\n".join(line for i, line in enumerate(lines) if i in kept)
+    _count(cards=1, over_budget_lines=len(lines) - len(kept),
+           tokens_in=measure_tokens(str(text or '')), tokens_out=measure_tokens(compacted))
+    return compacted
+
+
+def get_stats_report() -> str:
+    s = _stats
+    saved = (1 - s['tokens_out'] / s['tokens_in']) * 100 if s['tokens_in'] else 0.0
+    counter = 'tokenizer' if _tokenizer else 'estimate'
+    return (f"Prompt compaction: {s['cards']} cards, {s['tokens_in']} → {s['tokens_out']} tokens "
+            f"(-{saved:.0f}%, {counter}); dropped {s['duplicate_lines']} repeated, "
+            f"{s['boilerplate_lines']} boilerplate, {s['over_budget_lines']} over-budget lines")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Per-host token buckets for polite concurrent scraping
+Each site keeps its own politeness delay, so independent hosts
+can be scraped in parallel instead of sharing one global sleep
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict
+from urllib.parse import urlparse
+
+from config import DISCOVERY, HOST_RATE_LIMITS, RATE_LIMITS
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens/second, holds at most `burst` tokens
+    A waiter reserves its token up front (the balance may go negative) and then
+    sleeps until that token is due, so waiters are served in arrival order
+    without anyone sleeping while holding a lock
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns seconds spent waiting"""
+        # No await between refill and reservation, so this is atomic on the event loop
+        self._refill()
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        delay = -self.tokens / self.rate
+        await asyncio.sleep(delay)
+        return delay
+
+
+class HostRateLimiter:
+    """
+    One token bucket per host, created on demand from HOST_RATE_LIMITS,
+    plus a global cap on in-flight fetches shared by every host
+    """
+
+    def __init__(self, limits: Dict[str, Dict] = None, default_delay: float = None,
+                 max_concurrent: int = None):
+        self.limits = HOST_RATE_LIMITS if limits is None else limits
+        self.default_delay = default_delay or RATE_LIMITS['search_delay_seconds']
+        self.max_concurrent = max_concurrent or DISCOVERY['max_concurrent_requests']
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.wait_seconds: Dict[str, float] = {}
+        self._slots = None  # Created on first use, inside the running event loop
+
+    @staticmethod
+    def host_of(url_or_host: str) -> str:
+        """Accept either a full URL or a bare host name"""
+        if '://' in url_or_host:
+            return urlparse(url_or_host).netloc.lower()
+        return url_or_host.lower()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self.buckets:
+            limit = self.limits.get(host, {"rate": 1 / self.default_delay, "burst": 1})
+            self.buckets[host] = TokenBucket(limit['rate'], limit.get('burst', 1))
+        return self.buckets[host]
+
+    async def wait(self, url_or_host: str):
+        """Block until `host` may be hit again"""
+        host = self.host_of(url_or_host)
+        waited = await self._bucket(host).acquire()
+        self.wait_seconds[host] = self.wait_seconds.get(host, 0.0) + waited
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        One of the global in-flight fetch slots
+        Take it after wait(), so a throttled host never holds a slot another host could use
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        async with self._slots:
+            yield
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Record / Replay Harness - Benchmark the pipeline offline
+- Record: raw scraper payloads + LLM responses of a production run
+  into a versioned archive under DATA_DIR/recordings/<run_id>/
+- Replay: feed them back through the production streaming pipeline
+  (pipeline.VendorPipeline, from the extract stage on) deterministically:
+  no scraping, no Ollama, HTTP cache in offline mode, scratch databases
+- Prints throughput (vendors/sec), per-node latency and the pipeline report
+
+Usage:
+    python main_v2.py production --record   # record a live run
+    python main_v2.py replay [run_dir]      # replay latest (or given) recording
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import json_stream
+from config import REPLAY, OLLAMA_MODEL
+
+MANIFEST_FILE = 'manifest.json'
+VENDORS_FILE = 'vendors.jsonl'
+LLM_FILE = 'llm.jsonl'
+
+
+class ReplayMissError(Exception):
+    """Prompt was not seen during recording"""
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class RunRecorder:
+    """Appends scraper payloads and LLM responses to a recording folder"""
+
+    def __init__(self, run_id: str = None, recordings_dir: str = None):
+        self.run_id = run_id or datetime.now().strftime('run_%Y%m%d_%H%M%S')
+        self.path = os.path.join(recordings_dir or REPLAY['recordings_dir'], self.run_id)
+        os.makedirs(self.path, exist_ok=True)
+        self.vendor_count = 0
+        self.llm_count = 0
+        self.started = datetime.now().isoformat()
+
+    def _append(self, filename: str, record: Dict):
+        # Append line by line so a crashed run still leaves a usable archive
+        with open(os.path.join(self.path, filename), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def record_vendor(self, vendor_data: Dict, batch: int = 0):
+        """
+        Raw scraper dict (raw_text, price_info, moq_info, ...)
+        batch: scrape batch it came from - replay re-extracts the same groups
+        """
+        self._append(VENDORS_FILE, {**vendor_data, '_batch': batch})
+        self.vendor_count += 1
+
+    def record_llm(self, prompt: str, response: str, seconds: float):
+        self._append(LLM_FILE, {
+            'prompt_hash': prompt_hash(prompt),
+            'prompt_chars': len(prompt),
+            'response': response,
+            'seconds': round(seconds, 4),
+        })
+        self.llm_count += 1
+
+    def finalize(self) -> str:
+        """Write the manifest; returns the archive folder"""
+        manifest = {
+            'format_version': REPLAY['format_version'],
+            'run_id': self.run_id,
+            'started': self.started,
+            'finished': datetime.now().isoformat(),
+            'model': OLLAMA_MODEL,
+            'vendors': self.vendor_count,
+            'llm_calls': self.llm_count,
+        }
+        with open(os.path.join(self.path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"  📼 Recorded {self.vendor_count} vendors / {self.llm_count} LLM calls → {self.path}")
+        return self.path
+
+
+class RecordingLLM:
+    """Wraps the real LLM and records every prompt/response pair"""
+
+    def __init__(self, llm, recorder: RunRecorder):
+        self.llm = llm
+        self.recorder = recorder
+
+    def invoke(self, prompt: str, *args, **kwargs) -> str:
+        start = time.perf_counter()
+        response = self.llm.invoke(prompt, *args, **kwargs)
+        self.recorder.record_llm(prompt, response, time.perf_counter() - start)
+        return response
+
+    def invoke_json(self, prompt: str, openers: str = '{', **kwargs) -> str:
+        start = time.perf_counter()
+        response = json_stream.invoke_json(self.llm, prompt, openers, **kwargs)
+        self.recorder.record_llm(prompt, response, time.perf_counter() - start)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+
+class RunArchive:
+    """A recorded run loaded back from disk"""
+
+    def __init__(self, path: str):
+        self.path = path
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No {MANIFEST_FILE} in {path} (run not finalized?)")
+
+        with open(manifest_path, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version', 0) > REPLAY['format_version']:
+            raise ValueError(f"Recording format v{self.manifest['format_version']} is newer than "
+                             f"supported v{REPLAY['format_version']}")
+
+        self.vendors: List[Dict] = self._read_jsonl(VENDORS_FILE)
+        self.llm_records: List[Dict] = self._read_jsonl(LLM_FILE)
+
+    def _read_jsonl(self, filename: str) -> List[Dict]:
+        path = os.path.join(self.path, filename)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def latest(recordings_dir: str = None) -> Optional[str]:
+        """Most recent finalized recording folder"""
+        root = recordings_dir or REPLAY['recordings_dir']
+        if not os.path.isdir(root):
+            return None
+        runs = sorted(
+            name for name in os.listdir(root)
+            if os.path.exists(os.path.join(root, name, MANIFEST_FILE))
+        )
+        return os.path.join(root, runs[-1]) if runs else None
+
+
+class ReplayLLM:
+    """Answers prompts from a recording; identical prompts replay in recorded order"""
+
+    def __init__(self, archive: RunArchive):
+        self.responses: Dict[str, List[str]] = {}
+        for record in archive.llm_records:
+            self.responses.setdefault(record['prompt_hash'], []).append(record['response'])
+        self.recorded_seconds = sum(r.get('seconds', 0.0) for r in archive.llm_records)
+        self.calls = 0
+        self.misses = 0
+
+    def invoke(self, prompt: str, *args, **kwargs) -> str:
+        self.calls += 1
+        queue = self.responses.get(prompt_hash(prompt))
+        if not queue:
+            self.misses += 1
+            raise ReplayMissError(f"Prompt not in recording ({len(prompt)} chars)")
+        # Keep the last answer around in case the pipeline asks again (retries)
+        return queue.pop(0) if len(queue) > 1 else queue[0]
+
+    def invoke_json(self, prompt: str, openers: str = '{', **kwargs) -> str:
+        """Recorded answer cut at its JSON value (older recordings: measures what early stop saves)"""
+        return json_stream.trim_json(self.invoke(prompt), openers)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def format_node_latency(node_timings: Dict[str, List[float]]) -> str:
+    lines = [f"  {'node':<10} {'calls':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}"]
+    for name, values in node_timings.items():
+        mean = sum(values) / len(values)
+        lines.append(
+            f"  {name:<10} {len(values):>6} {mean * 1000:>7.1f}ms {_percentile(values, 50) * 1000:>7.1f}ms "
+            f"{_percentile(values, 95) * 1000:>7.1f}ms {max(values) * 1000:>7.1f}ms"
+        )
+    return '\n'.join(lines)
+
+
+def run_replay(archive_path: str = None, limit: int = None, keep_db: bool = False) -> Dict:
+    """
+    Replay a recording through the production VendorPipeline against a scratch database
+    Recorded cards enter at the extract stage in their recorded micro-batches (they were
+    already deduplicated), so every batch prompt matches the recording
+    Returns throughput and per-node latency stats
+    """
+    import oem_search
+    import prompt_compaction
+    from dedup_index import DedupIndex
+    from pipeline import VendorPipeline
+    from near_duplicates import NearDuplicateIndex, set_near_duplicate_index
+    from response_cache import get_response_cache
+    from vendor_history import VendorHistory, set_vendor_history
+    from vendor_writer import VendorWriter, set_vendor_writer
+
+    archive_path = archive_path or RunArchive.latest()
+    if not archive_path:
+        raise FileNotFoundError(f"No recordings found in {REPLAY['recordings_dir']}")
+    archive = RunArchive(archive_path)
+    vendors = archive.vendors[:limit] if limit else archive.vendors
+
+    print("\n" + "=" * 70)
+    print(f"📼 REPLAY: {archive.manifest['run_id']} (recorded with {archive.manifest.get('model')})")
+    print(f"   {len(vendors)} vendors, {len(archive.llm_records)} recorded LLM calls")
+    print("=" * 70)
+
+    # Isolate side effects: scratch DB, offline HTTP, no Telegram review requests
+    scratch_dir = tempfile.mkdtemp(prefix='replay_')
+    previous_db = oem_search.VENDORS_DB
+    oem_search.VENDORS_DB = os.path.join(scratch_dir, 'vendors.db')
+    previous_writer = set_vendor_writer(VendorWriter(oem_search.VENDORS_DB))
+    previous_history = set_vendor_history(VendorHistory())
+    previous_near_duplicates = set_near_duplicate_index(
+        NearDuplicateIndex(os.path.join(scratch_dir, 'minhash.db'))
+    )
+    replay_llm = ReplayLLM(archive)
+    previous_llm = oem_search.set_llm(replay_llm)
+    cache = get_response_cache()
+    previous_offline = cache.offline if cache else None
+    if cache:
+        cache.offline = True
+    saved_env = {key: os.environ.pop(key) for key in ('TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID')
+                 if key in os.environ}
+
+    node_timings: Dict[str, List[float]] = {}
+    try:
+        oem_search.setup_database()
+        pipeline = VendorPipeline(scraper=None, node_timings=node_timings,
+                                  dedup_index=DedupIndex(oem_search.VENDORS_DB))
+
+        # Same extraction micro-batches as the recorded run, in recorded order
+        groups: Dict[int, List[Dict]] = {}
+        for vendor_data in vendors:
+            groups.setdefault(vendor_data.get('_batch', 0), []).append(vendor_data)
+
+        start = time.perf_counter()
+        asyncio.run(pipeline.run_batches(list(groups.values())))
+        elapsed = time.perf_counter() - start
+        statuses = {name: pipeline.results[name] for name in ('extraction_failed', 'not_saved', 'saved')}
+        pipeline_report = pipeline.get_report()  # Before the scratch writer is swapped out
+    finally:
+        set_vendor_writer(previous_writer).close()  # Flush the scratch writes before cleanup
+        oem_search.VENDORS_DB = previous_db
+        set_near_duplicate_index(previous_near_duplicates)
+        set_vendor_history(previous_history)
+        oem_search.set_llm(previous_llm)
+        if cache:
+            cache.offline = previous_offline
+        os.environ.update(saved_env)
+        if keep_db:
+            print(f"  🗄️  Scratch database kept: {scratch_dir}")
+        else:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    throughput = len(vendors) / elapsed if elapsed > 0 else 0.0
+    print("\n" + "=" * 70)
+    print("📊 REPLAY RESULTS")
+    print("=" * 70)
+    print(f"  Vendors: {len(vendors)} in {elapsed:.2f}s → {throughput:.2f} vendors/sec")
+    print(f"  LLM calls replayed: {replay_llm.calls} ({replay_llm.misses} misses, "
+          f"{replay_llm.recorded_seconds:.1f}s of recorded LLM time excluded)")
+    print(f"  Outcomes: {', '.join(f'{k}={v}' for k, v in sorted(statuses.items()))}")
+    print(pipeline_report)
+    print(f"  {oem_search.get_extraction_stats_report()}")
+    print(f"  {prompt_compaction.get_stats_report()}")
+    print(f"  {json_stream.get_stats_report(len(vendors))}")
+    print("\n  Per-node latency:")
+    print(format_node_latency(node_timings))
+    print("=" * 70 + "\n")
+
+    return {
+        'vendors': len(vendors),
+        'seconds': elapsed,
+        'vendors_per_second': throughput,
+        'node_timings': node_timings,
+        'statuses': statuses,
+        'llm_misses': replay_llm.misses,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    run_replay(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -4,11 +4,11 @@ Daily Report Generator
 Creates summary reports of vendor discovery and outreach
 """
 
-import sqlite3
 from datetime import datetime, timedelta
 from typing import List, Dict
 import json
 
+import db
 from config import VENDORS_DB, REPORTS_DIR
 
 class ReportGenerator:
@@ -19,7 +19,7 @@ class ReportGenerator:
     
     def get_daily_stats(self) -> Dict:
         """Get statistics for the last 24 hours"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         yesterday = (datetime.now() - timedelta(days=1)).isoformat()
@@ -68,7 +68,7 @@ class ReportGenerator:
     
     def get_top_vendors(self, limit: int = 10) -> List[Dict]:
         """Get top scoring vendors"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -96,7 +96,7 @@ class ReportGenerator:
     
     def get_recent_replies(self, limit: int = 5) -> List[Dict]:
         """Get recent vendor replies"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache - On-disk cache for search, product and profile pages
+- Keyed by URL + request headers
+- Per-URL-class TTL, ETag / Last-Modified revalidation when stale
+- Honours response Cache-Control: no-store (never cached), no-cache (always revalidated), max-age
+- Bodies stored zlib-compressed and content-addressed (identical pages stored once)
+- Size-bounded LRU eviction
+- Offline mode for replaying past runs without network
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from config import HTTP_CACHE
+
+
+def url_class(url: str) -> str:
+    """Bucket a URL into a TTL class"""
+    url_lower = url.lower()
+    if 'company-profile' in url_lower:
+        return 'profile'
+    if any(marker in url_lower for marker in ['products-search', 'trade/search', 'searchlist', '/search?']):
+        return 'search'
+    if '/product' in url_lower or '/item' in url_lower:
+        return 'product'
+    return 'default'
+
+
+def cache_control(headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Parse the Cache-Control header into {directive: value or None}"""
+    directives = {}
+    for key, value in (headers or {}).items():
+        if key.lower() != 'cache-control':
+            continue
+        for part in value.split(','):
+            name, _, arg = part.strip().partition('=')
+            if name:
+                directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+class CacheEntry:
+    """Index row for a cached response"""
+    def __init__(self, key: str, url: str, status_code: int, headers: Dict[str, str], body_hash: str,
+                 stored_at: float, etag: str = None, last_modified: str = None, fresh: bool = False):
+        self.key = key
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.body_hash = body_hash
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh = fresh
+
+
+class ResponseCache:
+    """Content-addressed, size-bounded HTTP response cache under DATA_DIR"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None, ttls: Dict[str, int] = None,
+                 offline: bool = None):
+        self.cache_dir = cache_dir or HTTP_CACHE['dir']
+        self.max_bytes = max_bytes or HTTP_CACHE['max_bytes']
+        self.ttls = ttls or HTTP_CACHE['ttl_seconds']
+        self.offline = HTTP_CACHE['offline'] if offline is None else offline
+        self.bodies_dir = os.path.join(self.cache_dir, 'bodies')
+        os.makedirs(self.bodies_dir, exist_ok=True)
+
+        # Shared by scraper tasks and worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.cache_dir, 'index.db'), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status_code INTEGER,
+                headers TEXT,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+        self._conn.commit()
+
+        self.stats = {'hits': 0, 'stale': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'no_store': 0,
+                      'evicted': 0}
+
+    # ---------- keys & paths ----------
+    @staticmethod
+    def make_key(url: str, headers: Dict[str, str] = None) -> str:
+        """Hash of URL + (case-insensitive, sorted) request headers"""
+        normalized = sorted((k.lower(), str(v)) for k, v in (headers or {}).items())
+        return hashlib.sha256(json.dumps([url, normalized]).encode('utf-8')).hexdigest()
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self.bodies_dir, body_hash[:2], f"{body_hash}.zz")
+
+    def ttl_for(self, url: str, response_headers: Dict[str, str] = None) -> int:
+        """Freshness lifetime: the server's max-age / no-cache when sent, else the URL-class TTL"""
+        directives = cache_control(response_headers)
+        if 'no-cache' in directives:
+            return 0  # Stored, but revalidated on every use
+        try:
+            return max(0, int(directives['max-age']))
+        except (KeyError, TypeError, ValueError):
+            return self.ttls.get(url_class(url), self.ttls['default'])
+
+    # ---------- lookup ----------
+    def lookup(self, url: str, headers: Dict[str, str] = None) -> Optional[CacheEntry]:
+        """Return the cached entry (fresh or stale) or None"""
+        key = self.make_key(url, headers)
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT status_code, headers, body_hash, stored_at, etag, last_modified
+                FROM entries WHERE key = ?
+            """, (key,)).fetchone()
+            if not row:
+                self.stats['misses'] += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        status_code, headers_json, body_hash, stored_at, etag, last_modified = row
+        response_headers = json.loads(headers_json or '{}')
+        fresh = (time.time() - stored_at) < self.ttl_for(url, response_headers)
+        self.stats['hits' if fresh else 'stale'] += 1
+        return CacheEntry(key, url, status_code, response_headers, body_hash,
+                          stored_at, etag, last_modified, fresh)
+
+    def is_fresh(self, url: str, headers: Dict[str, str] = None) -> bool:
+        """True if a GET would be answered without the network (no stats/LRU update)"""
+        with self._lock:
+            row = self._conn.execute("SELECT stored_at, headers FROM entries WHERE key = ?",
+                                     (self.make_key(url, headers),)).fetchone()
+        if not row:
+            return False
+        return self.offline or (time.time() - row[0]) < self.ttl_for(url, json.loads(row[1] or '{}'))
+
+    def read_body(self, entry: CacheEntry) -> Optional[bytes]:
+        try:
+            with open(self._body_path(entry.body_hash), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Headers to revalidate a stale entry (server may answer 304)"""
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    # ---------- store ----------
+    def store(self, url: str, request_headers: Dict[str, str], status_code: int,
+              response_headers: Dict[str, str], body: bytes):
+        """Save a 200 response; identical bodies share one compressed file"""
+        key = self.make_key(url, request_headers)
+        if 'no-store' in cache_control(response_headers):
+            with self._lock:  # Nor keep an older copy the server now says not to reuse
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+            self.stats['no_store'] += 1
+            return
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(body, 6))
+            os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        lowered = {k.lower(): v for k, v in response_headers.items()}
+        now = time.time()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO entries
+                    (key, url, status_code, headers, body_hash, size, stored_at, last_access, etag, last_modified)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, url, status_code, json.dumps(response_headers), body_hash, size, now, now,
+                  lowered.get('etag'), lowered.get('last-modified')))
+            self._conn.commit()
+            self.stats['stored'] += 1
+            self._evict_locked()
+
+    def mark_revalidated(self, entry: CacheEntry, response_headers: Dict[str, str] = None):
+        """Server answered 304 Not Modified - entry is fresh again (under the 304's Cache-Control, if sent)"""
+        for key, value in (response_headers or {}).items():
+            if key.lower() == 'cache-control':
+                entry.headers = {k: v for k, v in entry.headers.items() if k.lower() != 'cache-control'}
+                entry.headers[key] = value
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE entries SET stored_at = ?, last_access = ?, headers = ? WHERE key = ?",
+                               (now, now, json.dumps(entry.headers), entry.key))
+            self._conn.commit()
+        self.stats['revalidated'] += 1
+
+    def forget(self, entry: CacheEntry):
+        """Drop an entry whose body can no longer be read"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (entry.key,))
+            self._conn.commit()
+
+    # ---------- eviction ----------
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes_locked()
+
+    def _total_bytes_locked(self) -> int:
+        # Bodies are shared, so count each body file once
+        row = self._conn.execute("""
+            SELECT COALESCE(SUM(size), 0) FROM (SELECT body_hash, MAX(size) AS size FROM entries GROUP BY body_hash)
+        """).fetchone()
+        return row[0]
+
+    def _evict_locked(self):
+        """Drop least-recently-used entries until under max_bytes"""
+        total = self._total_bytes_locked()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, body_hash FROM entries ORDER BY last_access ASC").fetchall()
+        for key, body_hash in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.stats['evicted'] += 1
+            still_used = self._conn.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1",
+                                            (body_hash,)).fetchone()
+            if not still_used:
+                path = self._body_path(body_hash)
+                try:
+                    total -= os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    pass
+        self._conn.commit()
+
+    def get_stats_report(self) -> str:
+        s = self.stats
+        lookups = s['hits'] + s['stale'] + s['misses']
+        hit_rate = (s['hits'] + s['revalidated']) / lookups * 100 if lookups else 0.0
+        return (f"HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated (304), "
+                f"{s['misses']} misses, {s['stored']} stored ({s['no_store']} no-store skipped), "
+                f"{s['evicted']} evicted "
+                f"({hit_rate:.0f}% served from cache, {self.total_bytes() / 1e6:.1f} MB on disk)")
+
+
+_shared_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache (None when disabled in config)"""
+    global _shared_cache
+    if not HTTP_CACHE['enabled']:
+        return None
+    if _shared_cache is None:
+        _shared_cache = ResponseCache()
+    return _shared_cache
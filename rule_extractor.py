@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Rule-Based Extractor - Fast path before the LLM
+Regex extraction of price, MOQ, Android version, screen size, wall mount,
+battery, email and product name with a confidence per field.
+Only fields that are missing or ambiguous are sent to Ollama
+(with a small targeted prompt); most product cards need no LLM call.
+"""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from config import RULE_EXTRACTION
+from prompt_compaction import compact_text
+from text_matching import KeywordMatcher
+
+# Fields the LLM may be asked to fill (emails/URLs are never taken from the LLM)
+LLM_FIELDS = [
+    "vendor_name", "product_name", "price_per_unit", "moq", "os", "screen_size",
+    "touchscreen", "camera_front", "wall_mount", "has_battery", "product_type", "customizable",
+]
+
+# Short per-field instructions for targeted prompts
+FIELD_DESCRIPTIONS = {
+    "vendor_name": "supplier company name (e.g. Shenzhen X Technology Co., Ltd.)",
+    "product_name": "product title",
+    "price_per_unit": "lowest unit price in USD as a number",
+    "moq": "minimum order quantity as an integer",
+    "os": "operating system with version (e.g. Android 11)",
+    "screen_size": "screen size (e.g. 15.6 inch)",
+    "touchscreen": "true if it has a touch screen",
+    "camera_front": "true if it has a front camera",
+    "wall_mount": "true if wall-mounted, false if portable/handheld",
+    "has_battery": "true if it has a built-in battery, false if powered by DC/AC adapter",
+    "product_type": "one of: smart screen, tablet, monitor, other",
+    "customizable": "true if OEM/ODM customization is offered",
+}
+
+# If a field was not found and none of its hints occur in the text,
+# the LLM would not find it either - treat it as confidently absent
+FIELD_HINTS = {
+    "vendor_name": r'co\.|ltd|limited|inc\b|corp|company|factory|manufacturer|supplier',
+    "product_name": r'display|screen|monitor|panel|signage|tablet',
+    "price_per_unit": r'\$|usd|price|fob',
+    "moq": r'moq|minimum|min\.? order',
+    "os": r'android|linux|windows|\bos\b',
+    "screen_size": r'inch|\d"|′',
+    "touchscreen": r'touch',
+    "camera_front": r'camera|\bmp\b',
+    "wall_mount": r'wall|vesa|mount|bracket|portable|handheld',
+    "has_battery": r'battery|adapter|\bdc\b|\bac\b|powered',
+    "product_type": r'signage|smart display|tablet|monitor|kiosk',
+    "customizable": r'oem|odm|custom',
+}
+
+FIELD_HINT_PATTERNS = {field: re.compile(hint) for field, hint in FIELD_HINTS.items()}
+
+ABSENT_CONFIDENCE = 0.9
+
+COMPANY_SUFFIX = re.compile(
+    r'([A-Z][\w&\-\.]*(?:\s+[\w&\-\.()]+){0,8}?\s+(?:Co\.,?\s*Ltd\.?|Co\.|Ltd\.?|Limited|Inc\.?|Corporation|Corp\.))'
+)
+COMPANY_KEYWORD = re.compile(r'([\w\s]+(?:Co\.|Ltd\.|Inc\.|Technology|Electronics|Display|Screen)[\w\s,\.]*)')
+EMAIL = re.compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+PRICE_RANGE = re.compile(r'US?\$\s*(\d+(?:\.\d{1,2})?)\s*[-~]\s*(?:US?\$)?\s*(\d+(?:\.\d{1,2})?)', re.IGNORECASE)
+PRICE_PATTERNS = [
+    re.compile(r'US?\$\s*(\d+(?:\.\d{1,2})?)', re.IGNORECASE),  # $125 or US$125.50
+    re.compile(r'(\d+(?:\.\d{1,2})?)\s*USD', re.IGNORECASE),     # 125 USD
+    re.compile(r'Price[:\s]+(\d+(?:\.\d{1,2})?)', re.IGNORECASE),  # Price: 125
+]
+MOQ_PATTERNS = [
+    (re.compile(r'MOQ[:\s]*(\d+)', re.IGNORECASE), 0.9),
+    (re.compile(r'(\d+)\s+[Pp]ieces?\s+\(MOQ\)'), 0.9),
+    (re.compile(r'Minimum[:\s]+(\d+)', re.IGNORECASE), 0.7),
+]
+SCREEN_SIZE = re.compile(r'(\d{1,2}(?:\.\d)?)\s*(?:inch|"|′)', re.IGNORECASE)
+ANDROID_VERSION = re.compile(r'Android\s+(\d+(?:\.\d+)?)', re.IGNORECASE)
+MODEL_NAME = re.compile(r'(?:Model|Name)[:\s]+([^\n]{10,100})', re.IGNORECASE)
+MEGAPIXELS = re.compile(r'\d+(?:\.\d+)?\s*mp\b')
+CUSTOMIZABLE = re.compile(r'\b(?:oem|odm|customi[sz]\w*|custom)\b')
+JUNK_EMAIL_WORDS = ['example', 'test', 'noreply']
+
+# Every keyword test of extract() - found in one scan of the card
+CARD_KEYWORDS = KeywordMatcher({
+    'android': ['android'],
+    'touch_negative': ['non-touch', 'without touch', 'no touch'],
+    'touch_positive': ['touch screen', 'touchscreen', 'touch panel', 'capacitive'],
+    'front_camera': ['front camera', 'front-facing camera', 'webcam'],
+    'wall_mount': ['wall mount', 'wall-mount', 'vesa', 'bracket'],
+    'portable': ['portable', 'handheld', 'tablet pc'],
+    'no_battery': ['no battery', 'without battery', 'battery-free', 'battery free'],
+    'battery': ['battery', 'rechargeable', 'built-in battery'],
+    'wall_powered': ['dc adapter', '12v', 'wall powered', 'ac adapter'],
+    'signage': ['digital signage', 'smart display', 'advertising display', 'menu board'],
+    'tablet': ['tablet pc', 'portable tablet'],
+    'platform': ['made-in-china', 'alibaba', 'globalsources'],
+})
+PRODUCT_LINE_KEYWORDS = KeywordMatcher({'product': ['display', 'screen', 'monitor', 'panel', 'signage']})
+
+
+@lru_cache(maxsize=None)
+def _label_pattern(label: str) -> re.Pattern:
+    return re.compile(rf'^\s*{label}:\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+
+
+def _labeled(raw_text: str, label: str) -> str:
+    """Value of a 'Label: value' line written by the scraper, or ''"""
+    match = _label_pattern(label).search(raw_text)
+    if not match:
+        return ''
+    value = match.group(1).strip()
+    if value.lower().startswith(('not specified', 'not found', 'not available', 'contact supplier', 'unknown')):
+        return ''
+    return value
+
+
+def _any(text_lower: str, words: List[str]) -> bool:
+    return any(word in text_lower for word in words)
+
+
+class RuleBasedExtractor:
+    """Regex extraction with per-field confidence (0.0 = unknown, 1.0 = certain)"""
+
+    def __init__(self, min_confidence: float = None):
+        self.min_confidence = min_confidence or RULE_EXTRACTION['min_confidence']
+        self.stats = {'llm_skipped': 0, 'targeted_llm': 0, 'fields_asked': 0}
+        self._lock = threading.Lock()  # One extractor is shared by the concurrent extract workers
+
+    def extract(self, raw_text: str) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Returns (data in VENDOR_SCHEMA shape, confidence per field)"""
+        text_lower = raw_text.lower()
+        hits = CARD_KEYWORDS.scan(text_lower, lowered=True)
+        data: Dict[str, Any] = {
+            "vendor_name": None,
+            "url": None,
+            "platform": "made-in-china",
+            "moq": None,
+            "price_per_unit": None,
+            "customizable": None,
+            "os": None,
+            "screen_size": None,
+            "touchscreen": None,
+            "camera_front": None,
+            "wall_mount": None,
+            "has_battery": None,
+            "product_type": None,
+            "description": None,
+            "contact_email": None,
+            "product_name": None,
+            "product_url": None,
+        }
+        confidence: Dict[str, float] = {field: 0.0 for field in data}
+
+        def found(field: str, value: Any, conf: float):
+            data[field] = value
+            confidence[field] = conf
+
+        lines = [l.strip() for l in raw_text.split('\n') if l.strip()]
+
+        # ---- Vendor name ----
+        labeled_vendor = _labeled(raw_text, r'Vendor/Supplier') or _labeled(raw_text, 'Company')
+        suffix_match = COMPANY_SUFFIX.search(raw_text)
+        if labeled_vendor and 5 < len(labeled_vendor) < 150:
+            found('vendor_name', labeled_vendor[:100], 0.95)
+        elif suffix_match and 5 < len(suffix_match.group(1).strip()) < 100:
+            found('vendor_name', suffix_match.group(1).strip(), 0.85)
+        else:
+            keyword_match = COMPANY_KEYWORD.search(raw_text[:500])
+            if keyword_match and 5 < len(keyword_match.group(1).strip()) < 100:
+                found('vendor_name', keyword_match.group(1).strip(), 0.5)
+            elif lines and 5 < len(lines[0]) < 150:
+                found('vendor_name', lines[0][:100], 0.3)
+
+        # ---- Product name ----
+        title = _labeled(raw_text, 'Title') or _labeled(raw_text, 'Product')
+        if title and len(title) >= 10:
+            found('product_name', title[:100], 0.9)
+        else:
+            model_match = MODEL_NAME.search(raw_text)
+            if model_match:
+                found('product_name', model_match.group(1).strip()[:100], 0.7)
+            else:
+                for line in lines[:5]:
+                    if PRODUCT_LINE_KEYWORDS.scan(line).any('product'):
+                        found('product_name', line[:100], 0.5)
+                        break
+
+        # ---- Price (ranges: keep the low end, like the LLM is told to) ----
+        price_source = _labeled(raw_text, 'Price') or raw_text
+        range_match = PRICE_RANGE.search(price_source)
+        if range_match:
+            found('price_per_unit', float(range_match.group(1)), 0.8)
+        else:
+            for pattern in PRICE_PATTERNS:
+                price_match = pattern.search(price_source)
+                if price_match:
+                    found('price_per_unit', float(price_match.group(1)), 0.9 if price_source is not raw_text else 0.75)
+                    break
+
+        # ---- MOQ ----
+        for pattern, conf in MOQ_PATTERNS:
+            moq_match = pattern.search(raw_text)
+            if moq_match:
+                found('moq', int(moq_match.group(1)), conf)
+                break
+
+        # ---- OS ----
+        if hits.any('android'):
+            android_ver = ANDROID_VERSION.search(raw_text)
+            if android_ver:
+                found('os', f"Android {android_ver.group(1)}", 0.9)
+            else:
+                found('os', 'Android', 0.8)
+
+        # ---- Screen size (several different sizes = ambiguous) ----
+        sizes = []
+        for match in SCREEN_SIZE.finditer(raw_text):
+            if match.group(1) not in sizes:
+                sizes.append(match.group(1))
+        if sizes:
+            found('screen_size', f"{sizes[0]} inch", 0.85 if len(sizes) == 1 else 0.5)
+
+        # ---- Touchscreen ----
+        if hits.any('touch_negative'):
+            found('touchscreen', False, 0.85)
+        elif hits.any('touch_positive'):
+            found('touchscreen', True, 0.85)
+
+        # ---- Front camera ----
+        if hits.any('front_camera') or MEGAPIXELS.search(text_lower):
+            found('camera_front', True, 0.8)
+
+        # ---- Wall mount (CRITICAL) ----
+        wall = hits.any('wall_mount')
+        portable = hits.any('portable')
+        if wall and portable:
+            found('wall_mount', True, 0.4)
+        elif wall:
+            found('wall_mount', True, 0.85)
+        elif portable:
+            found('wall_mount', False, 0.75)
+
+        # ---- Battery (CRITICAL - we DON'T want battery) ----
+        if hits.any('no_battery'):
+            found('has_battery', False, 0.9)
+        elif hits.any('battery'):
+            found('has_battery', True, 0.8)
+        elif hits.any('wall_powered'):
+            found('has_battery', False, 0.75)
+
+        # ---- Product type ----
+        if hits.any('signage'):
+            found('product_type', 'smart screen', 0.8)
+        elif hits.any('tablet'):
+            found('product_type', 'tablet', 0.7)
+
+        # ---- Customizable ----
+        if CUSTOMIZABLE.search(text_lower):
+            found('customizable', True, 0.8)
+
+        # ---- Email (never from the LLM) ----
+        for email in EMAIL.findall(raw_text):
+            if not _any(email.lower(), JUNK_EMAIL_WORDS):
+                found('contact_email', email, 0.95)
+                break
+
+        # ---- URLs / platform ----
+        product_url = _labeled(raw_text, 'Product URL')
+        if product_url.startswith('http') and '...' not in product_url:
+            found('product_url', product_url, 0.9)
+        platform = hits.first('platform')
+        if platform:
+            found('platform', platform, 0.9)
+
+        # ---- Description: card text without the scraper's header/instructions ----
+        card_text = raw_text.split('FULL PRODUCT CARD TEXT:')[-1].split('INSTRUCTIONS FOR EXTRACTION:')[0]
+        description = ' '.join(card_text.split())[:200].replace('"', '').replace("'", '')
+        found('description', description, 0.7)
+
+        # Not found and no hint in the text → the LLM can't do better
+        for field, pattern in FIELD_HINT_PATTERNS.items():
+            if data[field] is None and not pattern.search(text_lower):
+                confidence[field] = ABSENT_CONFIDENCE
+
+        return data, confidence
+
+    def uncertain_fields(self, confidence: Dict[str, float]) -> List[str]:
+        """LLM-fillable fields below min_confidence (missing or ambiguous)"""
+        return [field for field in LLM_FIELDS if confidence.get(field, 0.0) < self.min_confidence]
+
+    @staticmethod
+    def merge(rule_data: Dict[str, Any], llm_data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """Take the LLM's answer only for the fields it was asked about"""
+        merged = dict(rule_data)
+        for field in fields:
+            if field in llm_data and llm_data[field] is not None:
+                merged[field] = llm_data[field]
+        return merged
+
+    def record(self, fields_asked: List[str]):
+        """Count one card's outcome (LLM skipped vs targeted prompt)"""
+        with self._lock:
+            if fields_asked:
+                self.stats['targeted_llm'] += 1
+                self.stats['fields_asked'] += len(fields_asked)
+            else:
+                self.stats['llm_skipped'] += 1
+
+    def get_stats_report(self) -> str:
+        with self._lock:
+            s = dict(self.stats)
+        cards = s['llm_skipped'] + s['targeted_llm']
+        skipped_pct = s['llm_skipped'] / cards * 100 if cards else 0.0
+        return (f"Rule extractor: {s['llm_skipped']}/{cards} cards without LLM ({skipped_pct:.0f}%), "
+                f"{s['targeted_llm']} targeted prompts ({s['fields_asked']} fields)")
+
+
+def build_targeted_prompt(raw_text: str, fields: List[str], known: Dict[str, Any]) -> str:
+    """Small prompt asking only for the uncertain fields"""
+    field_lines = "\n".join(f"- {field}: {FIELD_DESCRIPTIONS[field]}" for field in fields)
+    known_lines = "\n".join(
+        f"- {field}: {known[field]}" for field in LLM_FIELDS
+        if field not in fields and known.get(field) is not None
+    )
+    template = "{" + ",".join(f'"{field}":null' for field in fields) + "}"
+    return f"""Extract ONLY these fields from the product text. Use null if not stated. Do NOT guess.
+
+Fields:
+{field_lines}
+
+Already known (for context):
+{known_lines or '- nothing'}
+
+Text:
+{compact_text(raw_text)}
+
+Output ONLY this JSON object with values filled in: {template}
+
+JSON:"""
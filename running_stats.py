@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Running Statistics - Constant-time price / MOQ anomaly detection
+- Welford mean/variance
+- P² quantile sketches (Q1, median, Q3) - 5 markers each, no stored samples
+- Robust z-score ((x - median) / (IQR / 1.349)) and Tukey IQR fence tests
+Values are tracked on a log scale (prices and MOQs are multiplicative)
+Persisted in vendors.db (running_stats table), updated on each save
+"""
+
+import json
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import db
+from config import ANOMALY_DETECTION
+
+IQR_TO_SIGMA = 1.349  # IQR of a standard normal
+NUMBER = re.compile(r'\d+\.?\d*')
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """First number in a price/MOQ value ('US$ 1,200' → 1200.0)"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER.search(re.sub(r'[$,£€¥]', '', str(value)))
+    return float(match.group()) if match else None
+
+
+class P2Quantile:
+    """Jain & Chlamtac P² estimator for one quantile"""
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights = []  # Marker heights (first 5 samples until initialised)
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float):
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(1, 5) if x < q[i]) - 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:  # Exact while we still have every sample
+            return self.heights[min(len(self.heights) - 1, int(self.p * len(self.heights)))]
+        return self.heights[2]
+
+    def to_dict(self) -> Dict:
+        return {'p': self.p, 'heights': self.heights, 'positions': self.positions, 'desired': self.desired}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'P2Quantile':
+        sketch = cls(data['p'])
+        sketch.heights = data['heights']
+        sketch.positions = data['positions']
+        sketch.desired = data['desired']
+        return sketch
+
+
+class RunningStats:
+    """Welford mean/variance + P² quartiles of log(value)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.quartiles = [P2Quantile(0.25), P2Quantile(0.5), P2Quantile(0.75)]
+
+    @staticmethod
+    def _scale(value: float) -> float:
+        return math.log(value)
+
+    def add(self, value: Optional[float]):
+        if value is None or value <= 0:
+            return
+        x = self._scale(value)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        for sketch in self.quartiles:
+            sketch.add(x)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, index: int) -> Optional[float]:
+        """0 = Q1, 1 = median, 2 = Q3, in original units"""
+        value = self.quartiles[index].value()
+        return math.exp(value) if value is not None else None
+
+    def robust_z(self, value: float) -> Optional[float]:
+        """(x - median) / (IQR / 1.349); falls back to the Welford std when the IQR is 0"""
+        if self.count < 2 or value is None or value <= 0:
+            return None
+        q1, median, q3 = (sketch.value() for sketch in self.quartiles)
+        sigma = (q3 - q1) / IQR_TO_SIGMA or self.std
+        if not sigma:
+            return None
+        return (self._scale(value) - median) / sigma
+
+    def iqr_outlier(self, value: float, k: float = None) -> bool:
+        """Outside Tukey's fences [Q1 - k*IQR, Q3 + k*IQR]"""
+        if self.count < 2 or value is None or value <= 0:
+            return False
+        k = k or ANOMALY_DETECTION['iqr_k']
+        q1, _, q3 = (sketch.value() for sketch in self.quartiles)
+        x = self._scale(value)
+        return x < q1 - k * (q3 - q1) or x > q3 + k * (q3 - q1)
+
+    def is_anomaly(self, value: float) -> Tuple[bool, Optional[float]]:
+        """(anomalous, robust z) by ANOMALY_DETECTION['method']; never anomalous before min_samples"""
+        if self.count < ANOMALY_DETECTION['min_samples']:
+            return False, None
+        z = self.robust_z(value)
+        if ANOMALY_DETECTION['method'] == 'iqr':
+            return self.iqr_outlier(value), z
+        return z is not None and abs(z) > ANOMALY_DETECTION['z_threshold'], z
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'quartiles': [sketch.to_dict() for sketch in self.quartiles]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RunningStats':
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = data['count'], data['mean'], data['m2']
+        stats.quartiles = [P2Quantile.from_dict(q) for q in data['quartiles']]
+        return stats
+
+
+class VendorStats:
+    """Running price / MOQ statistics of saved vendors"""
+
+    METRICS = ('price_per_unit', 'moq')
+
+    def __init__(self, metrics: Dict[str, RunningStats] = None):
+        self.metrics = metrics or {name: RunningStats() for name in self.METRICS}
+
+    def add(self, record: Dict[str, Any]):
+        for name, stats in self.metrics.items():
+            stats.add(parse_number(record.get(name)))
+
+    def __getitem__(self, name: str) -> RunningStats:
+        return self.metrics[name]
+
+    @classmethod
+    def load(cls, db_path: str) -> Optional['VendorStats']:
+        """Persisted statistics, or None if nothing was saved yet"""
+        db.ensure_schema(db_path)  # running_stats table: db.py migrations, once per process
+        conn = db.connect(db_path)
+        try:
+            rows = dict(conn.execute("SELECT metric, state FROM running_stats").fetchall())
+        finally:
+            conn.close()
+        if not all(name in rows for name in cls.METRICS):
+            return None
+        return cls({name: RunningStats.from_dict(json.loads(rows[name])) for name in cls.METRICS})
+
+    def save(self, db_path: str):
+        db.ensure_schema(db_path)
+        conn = db.connect(db_path)
+        try:
+            now = datetime.now().isoformat()
+            conn.executemany(
+                "INSERT OR REPLACE INTO running_stats (metric, state, updated_at) VALUES (?, ?, ?)",
+                [(name, json.dumps(stats.to_dict()), now) for name, stats in self.metrics.items()]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_report(self) -> str:
+        lines = []
+        for name, stats in self.metrics.items():
+            if stats.count:
+                lines.append(f"{name}: n={stats.count}, Q1={stats.quantile(0) or 0:.1f}, "
+                             f"median={stats.quantile(1) or 0:.1f}, Q3={stats.quantile(2) or 0:.1f}")
+        return '; '.join(lines) or 'no data'
@@ -1,24 +1,27 @@
 #!/usr/bin/env python3
 """
 Web Scraper Module for Alibaba, Made-in-China, GlobalSources
-Lightweight scraping with Playwright (headless) + Fallback to requests
+Lightweight scraping with Playwright (headless) + Fallback to pooled async HTTP
 """
 
 import asyncio
+import re
 import time
-import requests
 from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 
 # Optional import - only needed if actually scraping
 try:
-    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     PlaywrightTimeout = TimeoutError
 
-from config import SEARCH_KEYWORDS, SEARCH_PLATFORMS, RATE_LIMITS
+from config import SEARCH_KEYWORDS, SEARCH_PLATFORMS, RATE_LIMITS, DISCOVERY
+from browser_pool import BrowserPool
+from rate_limiter import HostRateLimiter
+from http_client import AsyncHTTPClient, HTTPClientError
 
 class VendorScraper:
     """Web scraper for ODM/OEM platforms"""
@@ -26,9 +29,29 @@ class VendorScraper:
     def __init__(self):
         self.delay = RATE_LIMITS['search_delay_seconds']
         self.max_vendors_per_day = RATE_LIMITS['max_vendors_per_day']
+        # One Chromium for the whole run (launched lazily on first Playwright scrape)
+        self.browser_pool = BrowserPool() if PLAYWRIGHT_AVAILABLE else None
+        # Per-host politeness + global cap on in-flight fetches
+        self.rate_limiter = HostRateLimiter()
+        # Pooled keep-alive client for the simple (non-browser) fallbacks; every attempt,
+        # retries included, goes through the same limiter
+        self.http = AsyncHTTPClient(rate_limiter=self.rate_limiter)
+        self.platform_scrapers = {
+            'www.alibaba.com': self.scrape_alibaba,
+            'www.made-in-china.com': self.scrape_made_in_china,
+            'www.globalsources.com': self.scrape_globalsources,
+        }
+    
+    async def close(self):
+        """Shut down the shared browser and HTTP pool (call once at the end of the run)"""
+        if self.browser_pool:
+            await self.browser_pool.close()
+        await self.http.close()
+        if self.http.cache:
+            print(f"  💾 {self.http.cache.get_stats_report()}")
     
     async def scrape_alibaba(self, keyword: str, max_results: int = 10) -> List[Dict[str, str]]:
-        """Scrape Alibaba for vendors - with fallback to simple requests"""
+        """Scrape Alibaba for vendors - with fallback to simple HTTP"""
         
         # Try Playwright first if available
         if PLAYWRIGHT_AVAILABLE:
@@ -37,98 +60,65 @@ class VendorScraper:
                 return results
             print("  ⚠️  Playwright got 0 results, trying fallback...")
         
-        # Fallback to requests + BeautifulSoup (simpler, less detectable)
+        # Fallback to plain HTTP + BeautifulSoup (simpler, less detectable)
         return await self._scrape_alibaba_simple(keyword, max_results)
     
     async def _scrape_alibaba_simple(self, keyword: str, max_results: int = 10) -> List[Dict[str, str]]:
-        """Simple scraper using requests (fallback method)"""
-        print(f"\n>>> Scraping Alibaba (simple mode) for: '{keyword}'...")
-        results = []
+        """Simple scraper using the pooled HTTP client (fallback method)"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Connection': 'keep-alive',
+        }
+        search_url = f"https://www.alibaba.com/trade/search?SearchText={keyword.replace(' ', '+')}"
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-            }
-            
-            search_url = f"https://www.alibaba.com/trade/search?SearchText={keyword.replace(' ', '+')}"
-            
-            response = requests.get(search_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Check for anti-bot
-            if 'robot' in response.text.lower() or 'captcha' in response.text.lower():
-                print("  ⚠️  Anti-bot detection triggered (simple scraper)")
-                return results
-            
-            # Try multiple product card selectors
-            products = []
-            for selector in ['div[class*="organic"]', 'div[class*="card"]', 'div[class*="product"]', 'div[class*="search-card"]']:
-                products = soup.select(selector)
-                if len(products) > 0:
-                    print(f"  ✓ Found {len(products)} products using: {selector}")
+        return await self._scrape_listing(
+            'Alibaba', keyword, search_url, headers,
+            selectors=['div[class*="organic"]', 'div[class*="card"]', 'div[class*="product"]', 'div[class*="search-card"]'],
+            parse_card=self._parse_alibaba_card, max_results=max_results,
+            empty_hint="Alibaba may have changed HTML structure", blocked_words=('robot', 'captcha'))
+    
+    @staticmethod
+    def _parse_alibaba_card(product) -> Optional[Dict[str, str]]:
+        # Extract title
+        title = "Unknown"
+        for tag in ['h2', 'h3', 'a']:
+            title_elem = product.find(tag)
+            if title_elem and title_elem.get_text(strip=True):
+                title = title_elem.get_text(strip=True)
+                if len(title) > 10:  # Valid title
                     break
-            
-            if len(products) == 0:
-                print("  ⚠️  No products found - Alibaba may have changed HTML structure")
-                return results
-            
-            for i, product in enumerate(products[:max_results]):
-                try:
-                    # Extract title
-                    title = "Unknown"
-                    for tag in ['h2', 'h3', 'a']:
-                        title_elem = product.find(tag)
-                        if title_elem and title_elem.get_text(strip=True):
-                            title = title_elem.get_text(strip=True)
-                            if len(title) > 10:  # Valid title
-                                break
-                    
-                    # Extract link
-                    link = ""
-                    link_elem = product.find('a', href=True)
-                    if link_elem:
-                        link = link_elem['href']
-                        if link.startswith('//'):
-                            link = 'https:' + link
-                        elif not link.startswith('http'):
-                            link = 'https://www.alibaba.com' + link
-                    
-                    # Extract price
-                    price = "Contact Supplier"
-                    price_elem = product.find(class_=lambda x: x and 'price' in x.lower())
-                    if price_elem:
-                        price = price_elem.get_text(strip=True)
-                    
-                    # Get full text for context
-                    full_text = product.get_text(strip=True)
-                    
-                    if title != "Unknown" and len(title) > 10:
-                        results.append({
-                            'vendor_name': title[:200],
-                            'url': link,
-                            'platform': 'alibaba',
-                            'price_info': price,
-                            'moq_info': "Contact Supplier",
-                            'raw_text': full_text[:1000]
-                        })
-                        print(f"  ✓ Found: {title[:60]}...")
-                
-                except Exception as e:
-                    print(f"  ✗ Error extracting product {i}: {str(e)[:80]}")
-                    continue
         
-        except requests.exceptions.RequestException as e:
-            print(f"  ✗ Network error: {str(e)[:100]}")
-        except Exception as e:
-            print(f"  ✗ Scraping error: {str(e)[:100]}")
+        # Extract link
+        link = ""
+        link_elem = product.find('a', href=True)
+        if link_elem:
+            link = link_elem['href']
+            if link.startswith('//'):
+                link = 'https:' + link
+            elif not link.startswith('http'):
+                link = 'https://www.alibaba.com' + link
         
-        print(f"  → Scraped {len(results)} vendors from Alibaba (simple mode)")
-        return results
+        # Extract price
+        price = "Contact Supplier"
+        price_elem = product.find(class_=lambda x: x and 'price' in x.lower())
+        if price_elem:
+            price = price_elem.get_text(strip=True)
+        
+        # Get full text for context
+        full_text = product.get_text(strip=True)
+        
+        if title == "Unknown" or len(title) <= 10:
+            return None
+        return {
+            'vendor_name': title[:200],
+            'url': link,
+            'platform': 'alibaba',
+            'price_info': price,
+            'moq_info': "Contact Supplier",
+            'raw_text': full_text[:1000]
+        }
     
     async def _scrape_alibaba_playwright(self, keyword: str, max_results: int = 10) -> List[Dict[str, str]]:
         """Scrape Alibaba using Playwright (original method)"""
@@ -141,19 +131,17 @@ class VendorScraper:
         results = []
         
         try:
-            async with async_playwright() as p:
-                # Launch browser (headless to save RAM)
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-                )
-                page = await context.new_page()
-                
-                # Search URL
-                search_url = f"https://www.alibaba.com/trade/search?SearchText={keyword.replace(' ', '+')}"
-                
+            # Search URL
+            search_url = f"https://www.alibaba.com/trade/search?SearchText={keyword.replace(' ', '+')}"
+            # Host politeness before borrowing a page, so a throttled host never ties one up
+            await self.rate_limiter.wait(search_url)
+            
+            # Borrow a page from the shared browser (no per-keyword Chromium launch)
+            async with self.browser_pool.page() as page:
                 try:
-                    await page.goto(search_url, timeout=30000)
+                    # Only the navigation holds a global fetch slot, not the render wait
+                    async with self.rate_limiter.slot():
+                        await page.goto(search_url, timeout=30000)
                     await page.wait_for_timeout(5000)  # Wait longer for dynamic content
                     
                     # DEBUG: Check if page loaded
@@ -247,9 +235,6 @@ class VendorScraper:
                     print("  ✗ Page load timeout - Alibaba may be blocking")
                 except Exception as e:
                     print(f"  ✗ Scraping error: {str(e)[:200]}")
-                
-                finally:
-                    await browser.close()
         
         except Exception as e:
             print(f"✗ Browser error: {e}")
@@ -267,114 +252,99 @@ class VendorScraper:
                 return results
             print("  ⚠️  Playwright got 0 results, trying simple mode...")
         
-        # Fallback to simple requests
+        # Fallback to simple HTTP
         return await self._scrape_made_in_china_simple(keyword, max_results)
     
     async def _scrape_made_in_china_simple(self, keyword: str, max_results: int = 10) -> List[Dict[str, str]]:
         """
-        Simple Made-in-China scraper using requests
+        Simple Made-in-China scraper using the pooled HTTP client
         STRATEGY: Skip product page fetching due to truncated URLs
         Instead: Extract as much as possible from search results + use BeautifulSoup to parse listing
         """
-        print(f"\n>>> Scraping Made-in-China (simple mode) for: '{keyword}'...")
-        results = []
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': 'https://www.made-in-china.com/',
+            'Connection': 'keep-alive',
+        }
+        # Made-in-China search URL - use keyword format that works better
+        search_url = f"https://www.made-in-china.com/products-search/hot-china-products/{keyword.replace(' ', '+')}.html"
+        print(f"    Searching: {search_url[:80]}...")
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Referer': 'https://www.made-in-china.com/',
-                'Connection': 'keep-alive',
-            }
-            
-            # Made-in-China search URL - use keyword format that works better
-            search_url = f"https://www.made-in-china.com/products-search/hot-china-products/{keyword.replace(' ', '+')}.html"
-            
-            print(f"    Searching: {search_url[:80]}...")
-            response = requests.get(search_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Made-in-China product cards - try multiple selectors
-            products = soup.select('.item, .search-item, [class*="product"], [class*="item-main"]')
-            
-            if len(products) == 0:
-                print(f"  ⚠️  No products found with standard selectors")
-                # Try alternative scraping of visible text
-                page_text = soup.get_text(strip=True)
-                if len(page_text) < 500:
-                    print(f"  ⚠️  Page seems blocked or empty")
-                return results
-            
-            print(f"  ✓ Found {len(products)} product listings")
-            
-            for i, product in enumerate(products[:max_results]):
-                try:
-                    # Extract title
-                    title = "Unknown"
-                    for selector in ['h2', 'h3', '.title', 'a[title]', '[class*="title"]']:
-                        title_elem = product.select_one(selector)
-                        if title_elem:
-                            title_text = title_elem.get_text(strip=True) or title_elem.get('title', '')
-                            if len(title_text) > 10:
-                                title = title_text
-                                break
-                    
-                    # Extract ALL text from product card (includes hidden details)
-                    product_full_text = product.get_text(separator='\n', strip=True)
-                    
-                    # Try to find company/supplier name in the product card
-                    vendor_company = None
-                    for sel in ['[class*="company"]', '[class*="supplier"]', '[class*="manu"]', '[class*="seller"]']:
-                        company_elem = product.select_one(sel)
-                        if company_elem:
-                            vendor_text = company_elem.get_text(strip=True)
-                            if len(vendor_text) > 5 and len(vendor_text) < 100:
-                                vendor_company = vendor_text
-                                break
-                    
-                    # Extract price from listing
-                    price = "Contact Supplier"
-                    for price_sel in ['.price', '[class*="price"]', '[class*="Price"]']:
-                        price_elem = product.select_one(price_sel)
-                        if price_elem:
-                            price_text = price_elem.get_text(strip=True)
-                            if price_text and ('$' in price_text or 'USD' in price_text.upper()):
-                                price = price_text
-                                break
-                    
-                    # Try to extract MOQ from product card
-                    moq_info = "Contact Supplier"
-                    import re
-                    moq_match = re.search(r'MOQ[:\s]*(\d+)', product_full_text, re.IGNORECASE)
-                    if moq_match:
-                        moq_info = moq_match.group(0)
-                    
-                    # Extract any links (even if truncated, we'll note them)
-                    link = ""
-                    link_elem = product.select_one('a[href]')
-                    if link_elem:
-                        href = link_elem.get('href', '')
-                        if href and not '...' in href:
-                            if not href.startswith('http'):
-                                link = f"https://www.made-in-china.com{href}"
-                            else:
-                                link = href
-                    
-                    # Look for email in product card text (unlikely but possible)
-                    vendor_email = None
-                    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-                    emails = re.findall(email_pattern, product_full_text)
-                    if emails:
-                        # Filter out junk
-                        real_emails = [e for e in emails if not any(x in e.lower() for x in ['example', 'test', 'noreply'])]
-                        if real_emails:
-                            vendor_email = real_emails[0]
-                    
-                    # Build rich context from product card alone (no product page needed)
-                    combined_text = f"""
+        return await self._scrape_listing(
+            'Made-in-China', keyword, search_url, headers,
+            selectors=['.item, .search-item, [class*="product"], [class*="item-main"]'],
+            parse_card=self._parse_made_in_china_card, max_results=max_results,
+            empty_hint="no match for the standard selectors")
+    
+    @staticmethod
+    def _parse_made_in_china_card(product) -> Optional[Dict[str, str]]:
+        # Extract title
+        title = "Unknown"
+        for selector in ['h2', 'h3', '.title', 'a[title]', '[class*="title"]']:
+            title_elem = product.select_one(selector)
+            if title_elem:
+                title_text = title_elem.get_text(strip=True) or title_elem.get('title', '')
+                if len(title_text) > 10:
+                    title = title_text
+                    break
+        
+        # Extract ALL text from product card (includes hidden details)
+        product_full_text = product.get_text(separator='\n', strip=True)
+        
+        # Try to find company/supplier name in the product card
+        vendor_company = None
+        for sel in ['[class*="company"]', '[class*="supplier"]', '[class*="manu"]', '[class*="seller"]']:
+            company_elem = product.select_one(sel)
+            if company_elem:
+                vendor_text = company_elem.get_text(strip=True)
+                if len(vendor_text) > 5 and len(vendor_text) < 100:
+                    vendor_company = vendor_text
+                    break
+        
+        # Extract price from listing
+        price = "Contact Supplier"
+        for price_sel in ['.price', '[class*="price"]', '[class*="Price"]']:
+            price_elem = product.select_one(price_sel)
+            if price_elem:
+                price_text = price_elem.get_text(strip=True)
+                if price_text and ('$' in price_text or 'USD' in price_text.upper()):
+                    price = price_text
+                    break
+        
+        # Try to extract MOQ from product card
+        moq_info = "Contact Supplier"
+        moq_match = re.search(r'MOQ[:\s]*(\d+)', product_full_text, re.IGNORECASE)
+        if moq_match:
+            moq_info = moq_match.group(0)
+        
+        # Extract any links (even if truncated, we'll note them)
+        link = ""
+        link_elem = product.select_one('a[href]')
+        if link_elem:
+            href = link_elem.get('href', '')
+            if href and not '...' in href:
+                if not href.startswith('http'):
+                    link = f"https://www.made-in-china.com{href}"
+                else:
+                    link = href
+        
+        # Look for email in product card text (unlikely but possible)
+        vendor_email = None
+        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+        emails = re.findall(email_pattern, product_full_text)
+        if emails:
+            # Filter out junk
+            real_emails = [e for e in emails if not any(x in e.lower() for x in ['example', 'test', 'noreply'])]
+            if real_emails:
+                vendor_email = real_emails[0]
+        
+        if title == "Unknown" or len(title) <= 10:
+            return None
+        
+        # Build rich context from product card alone (no product page needed)
+        combined_text = f"""
 PRODUCT LISTING from Made-in-China Search Results:
 Title: {title}
 Vendor/Supplier: {vendor_company or 'Not specified in listing'}
@@ -393,31 +363,16 @@ INSTRUCTIONS FOR EXTRACTION:
 - If information is missing, mark as null (don't guess!)
 - Product URL may be placeholder if truncated with "..."
 """
-                    
-                    if title != "Unknown" and len(title) > 10:
-                        results.append({
-                            'vendor_name': vendor_company or title[:200],
-                            'url': link if link else "https://www.made-in-china.com",
-                            'platform': 'made-in-china',
-                            'price_info': price,
-                            'moq_info': moq_info,
-                            'raw_text': combined_text[:6000],  # Rich context from product card
-                            'contact_email': vendor_email,
-                            'product_url': link if link else None
-                        })
-                        print(f"  ✓ Found: {vendor_company or title[:60]}...")
-                
-                except Exception as e:
-                    print(f"  ✗ Error extracting product {i}: {str(e)[:80]}")
-                    continue
-        
-        except requests.exceptions.RequestException as e:
-            print(f"  ✗ Network error: {str(e)[:100]}")
-        except Exception as e:
-            print(f"  ✗ Scraping error: {str(e)[:100]}")
-        
-        print(f"  → Scraped {len(results)} vendors from Made-in-China (simple mode)")
-        return results
+        return {
+            'vendor_name': vendor_company or title[:200],
+            'url': link if link else "https://www.made-in-china.com",
+            'platform': 'made-in-china',
+            'price_info': price,
+            'moq_info': moq_info,
+            'raw_text': combined_text[:6000],  # Rich context from product card
+            'contact_email': vendor_email,
+            'product_url': link if link else None
+        }
     
     async def _scrape_made_in_china_playwright(self, keyword: str, max_results: int = 10) -> List[Dict[str, str]]:
         """Scrape Made-in-China using Playwright (original)"""
@@ -429,17 +384,13 @@ INSTRUCTIONS FOR EXTRACTION:
         results = []
         
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-                )
-                page = await context.new_page()
-                
-                search_url = f"https://www.made-in-china.com/products-search/hot-china-products/{keyword.replace(' ', '_')}.html"
-                
+            search_url = f"https://www.made-in-china.com/products-search/hot-china-products/{keyword.replace(' ', '_')}.html"
+            await self.rate_limiter.wait(search_url)
+            
+            async with self.browser_pool.page() as page:
                 try:
-                    await page.goto(search_url, timeout=30000)
+                    async with self.rate_limiter.slot():
+                        await page.goto(search_url, timeout=30000)
                     await page.wait_for_timeout(3000)
                     
                     # Extract product listings
@@ -479,9 +430,6 @@ INSTRUCTIONS FOR EXTRACTION:
                     print("  ✗ Page load timeout")
                 except Exception as e:
                     print(f"  ✗ Scraping error: {e}")
-                
-                finally:
-                    await browser.close()
         
         except Exception as e:
             print(f"✗ Browser error: {e}")
@@ -489,44 +437,184 @@ INSTRUCTIONS FOR EXTRACTION:
         print(f"  → Scraped {len(results)} vendors from Made-in-China")
         return results
     
-    async def scrape_all_platforms(self, keyword: str) -> List[Dict[str, str]]:
-        """Scrape all platforms for a given keyword"""
-        all_results = []
+    async def scrape_globalsources(self, keyword: str, max_results: int = 10) -> List[Dict[str, str]]:
+        """Scrape GlobalSources for vendors (simple mode only)"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Connection': 'keep-alive',
+        }
+        search_url = f"https://www.globalsources.com/searchList/products?keyWord={keyword.replace(' ', '+')}"
+        
+        return await self._scrape_listing(
+            'GlobalSources', keyword, search_url, headers,
+            selectors=['[class*="product-item"]', '[class*="product-card"]', '[class*="item-card"]', '[class*="product"]'],
+            parse_card=self._parse_globalsources_card, max_results=max_results,
+            empty_hint="GlobalSources may render listings with JavaScript")
+    
+    @staticmethod
+    def _parse_globalsources_card(product) -> Optional[Dict[str, str]]:
+        title = "Unknown"
+        for selector in ['h2', 'h3', '[class*="title"]', 'a[title]']:
+            title_elem = product.select_one(selector)
+            if title_elem:
+                title_text = title_elem.get_text(strip=True) or title_elem.get('title', '')
+                if len(title_text) > 10:
+                    title = title_text
+                    break
         
-        # Scrape Alibaba
-        alibaba_results = await self.scrape_alibaba(keyword, max_results=5)
-        all_results.extend(alibaba_results)
+        link = ""
+        link_elem = product.select_one('a[href]')
+        if link_elem:
+            link = link_elem.get('href', '')
+            if link.startswith('//'):
+                link = 'https:' + link
+            elif link and not link.startswith('http'):
+                link = 'https://www.globalsources.com' + link
         
-        # Delay between platforms
-        await asyncio.sleep(self.delay)
+        vendor_company = None
+        for sel in ['[class*="supplier"]', '[class*="company"]']:
+            company_elem = product.select_one(sel)
+            if company_elem:
+                vendor_text = company_elem.get_text(strip=True)
+                if 5 < len(vendor_text) < 100:
+                    vendor_company = vendor_text
+                    break
+        
+        price = "Contact Supplier"
+        price_elem = product.select_one('[class*="price"]')
+        if price_elem and price_elem.get_text(strip=True):
+            price = price_elem.get_text(strip=True)
         
-        # Scrape Made-in-China
-        mic_results = await self.scrape_made_in_china(keyword, max_results=5)
-        all_results.extend(mic_results)
+        full_text = product.get_text(separator='\n', strip=True)
         
+        if title == "Unknown" or len(title) <= 10:
+            return None
+        return {
+            'vendor_name': vendor_company or title[:200],
+            'url': link or "https://www.globalsources.com",
+            'platform': 'globalsources',
+            'price_info': price,
+            'moq_info': "Contact Supplier",
+            'raw_text': full_text[:3000],
+            'product_url': link or None
+        }
+    
+    async def _scrape_listing(self, site: str, keyword: str, search_url: str, headers: Dict[str, str],
+                              selectors: List[str], parse_card: Callable, max_results: int,
+                              empty_hint: str, blocked_words: tuple = ()) -> List[Dict[str, str]]:
+        """
+        Shared simple-mode flow: fetch one search page, pick the first card selector that matches,
+        parse each card with `parse_card` (returns a vendor dict, or None to skip the card)
+        """
+        print(f"\n>>> Scraping {site} (simple mode) for: '{keyword}'...")
+        results = []
+        
+        try:
+            # The client takes the host token and fetch slot itself (skipped on cache hits)
+            response = await self.http.get(search_url, headers=headers, timeout=15)
+            response.raise_for_status()
+            
+            soup = BeautifulSoup(response.content, 'html.parser')
+            
+            # Check for anti-bot
+            page_text = response.text.lower()
+            if any(word in page_text for word in blocked_words):
+                print("  ⚠️  Anti-bot detection triggered (simple scraper)")
+                return results
+            
+            products = []
+            for selector in selectors:
+                products = soup.select(selector)
+                if len(products) > 0:
+                    print(f"  ✓ Found {len(products)} products using: {selector}")
+                    break
+            
+            if len(products) == 0:
+                print(f"  ⚠️  No products found - {empty_hint}")
+                if len(soup.get_text(strip=True)) < 500:
+                    print(f"  ⚠️  Page seems blocked or empty")
+                return results
+            
+            for i, product in enumerate(products[:max_results]):
+                try:
+                    vendor = parse_card(product)
+                    if vendor:
+                        results.append(vendor)
+                        print(f"  ✓ Found: {vendor['vendor_name'][:60]}...")
+                except Exception as e:
+                    print(f"  ✗ Error extracting product {i}: {str(e)[:80]}")
+                    continue
+        
+        except HTTPClientError as e:
+            print(f"  ✗ Network error: {str(e)[:100]}")
+        except Exception as e:
+            print(f"  ✗ Scraping error: {str(e)[:100]}")
+        
+        print(f"  → Scraped {len(results)} vendors from {site} (simple mode)")
+        return results
+    
+    async def discover_concurrently(self, keywords: List[str], platforms: List[str] = None,
+                                    max_results: int = 5) -> List[Dict[str, str]]:
+        """
+        Scrape every (keyword, platform) pair concurrently
+        - Each host keeps its own politeness delay (token bucket)
+        - At most `max_concurrent_requests` page fetches are in flight at once (see HostRateLimiter.slot)
+        Results keep keyword order; each vendor dict gets a 'search_keyword'
+        """
+        platforms = platforms or DISCOVERY['platforms']
+        
+        async def run_one(keyword: str, platform: str) -> List[Dict[str, str]]:
+            host = self.rate_limiter.host_of(platform)
+            scrape = self.platform_scrapers.get(host)
+            if not scrape:
+                print(f"  ⚠️  No scraper for platform: {platform}")
+                return []
+            try:
+                vendors = await scrape(keyword, max_results=max_results)
+            except Exception as e:
+                print(f"  ✗ {host} failed for '{keyword}': {str(e)[:100]}")
+                return []
+            for vendor in vendors:
+                vendor['search_keyword'] = keyword
+            return vendors
+        
+        tasks = [run_one(keyword, platform) for keyword in keywords for platform in platforms]
+        batches = await asyncio.gather(*tasks)
+        
+        all_results = []
+        for vendors in batches:
+            all_results.extend(vendors)
         return all_results
     
+    async def scrape_all_platforms(self, keyword: str) -> List[Dict[str, str]]:
+        """Scrape all platforms for a given keyword (in parallel)"""
+        return await self.discover_concurrently([keyword], max_results=5)
+    
     async def daily_vendor_discovery(self) -> List[Dict[str, str]]:
         """
         Run daily vendor discovery across all keywords and platforms
-        Respects max_vendors_per_day limit
+        Keywords are scraped in concurrent batches; respects max_vendors_per_day limit
         """
         print("\n" + "=" * 60)
         print("DAILY VENDOR DISCOVERY")
         print("=" * 60)
         
         all_vendors = []
+        batch_size = DISCOVERY['keywords_per_batch']
         
-        for keyword in SEARCH_KEYWORDS:
-            if len(all_vendors) >= self.max_vendors_per_day:
-                print(f"\n✓ Reached daily limit of {self.max_vendors_per_day} vendors")
-                break
-            
-            vendors = await self.scrape_all_platforms(keyword)
-            all_vendors.extend(vendors)
-            
-            # Delay between keywords
-            await asyncio.sleep(self.delay)
+        try:
+            for start in range(0, len(SEARCH_KEYWORDS), batch_size):
+                if len(all_vendors) >= self.max_vendors_per_day:
+                    print(f"\n✓ Reached daily limit of {self.max_vendors_per_day} vendors")
+                    break
+                
+                batch = SEARCH_KEYWORDS[start:start + batch_size]
+                vendors = await self.discover_concurrently(batch)
+                all_vendors.extend(vendors)
+        finally:
+            await self.close()
         
         # Trim to max limit
         all_vendors = all_vendors[:self.max_vendors_per_day]
@@ -538,7 +626,10 @@ INSTRUCTIONS FOR EXTRACTION:
 async def test_scraper():
     """Test the scraper with one keyword"""
     scraper = VendorScraper()
-    results = await scraper.scrape_alibaba("15.6 inch Android tablet", max_results=3)
+    try:
+        results = await scraper.scrape_alibaba("15.6 inch Android tablet", max_results=3)
+    finally:
+        await scraper.close()
     
     print("\n" + "=" * 60)
     print("SCRAPER TEST RESULTS")
@@ -4,11 +4,11 @@ Sends each discovered vendor for human approval/rejection
 Learns from feedback to improve future searches
 """
 
-import sqlite3
 import requests
 import json
 from datetime import datetime
 from typing import Dict, Optional
+import db
 from config import VENDORS_DB
 
 class TelegramFeedbackCollector:
@@ -19,46 +19,14 @@ class TelegramFeedbackCollector:
         self.chat_id = chat_id
         self.api_url = f"https://api.telegram.org/bot{bot_token}"
         self.db_path = VENDORS_DB
-        self._setup_feedback_table()
-    
-    def _setup_feedback_table(self):
-        """Create feedback table if not exists"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Add feedback columns to vendors table
-        cursor.execute("PRAGMA table_info(vendors)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'human_feedback' not in columns:
-            cursor.execute("ALTER TABLE vendors ADD COLUMN human_feedback TEXT")
-        if 'feedback_reason' not in columns:
-            cursor.execute("ALTER TABLE vendors ADD COLUMN feedback_reason TEXT")
-        if 'feedback_date' not in columns:
-            cursor.execute("ALTER TABLE vendors ADD COLUMN feedback_date TEXT")
-        
-        # Create feedback patterns table (for learning)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS feedback_patterns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_type TEXT NOT NULL,
-                feature_value TEXT NOT NULL,
-                sentiment TEXT NOT NULL,
-                count INTEGER DEFAULT 1,
-                last_seen TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(feature_type, feature_value, sentiment)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        db.ensure_schema(self.db_path)  # Feedback columns / tables: db.py migrations, once per process
     
     def request_feedback(self, vendor_id: int) -> bool:
         """
         Send vendor to Telegram with inline buttons for feedback
         Returns True if message sent successfully
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -157,12 +125,12 @@ class TelegramFeedbackCollector:
         if feedback_type not in ['relevant', 'irrelevant']:
             return False
         
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         # Save feedback to vendors table
         cursor.execute("""
-            UPDATE vendors 
+            UPDATE products 
             SET human_feedback = ?, 
                 feedback_reason = ?,
                 feedback_date = ?
@@ -206,7 +174,7 @@ class TelegramFeedbackCollector:
     
     def get_learned_preferences(self) -> Dict:
         """Get patterns learned from feedback"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         # Get positive patterns (what user likes)
@@ -3,10 +3,10 @@ Telegram Reporter - Sends daily reports and notifications via Telegram
 Much better than email: instant, saved in chat, no spam folder
 """
 
-import sqlite3
 from datetime import datetime, timedelta
 import requests
 from typing import Dict, List
+import db
 from config import VENDORS_DB
 
 class TelegramReporter:
@@ -45,14 +45,14 @@ class TelegramReporter:
     
     def collect_daily_stats(self) -> Dict:
         """Collect statistics from today's activities"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         today = datetime.now().strftime('%Y-%m-%d')
         
         # Total vendors discovered today (UNIQUE vendors, not products)
         cursor.execute("""
-            SELECT COUNT(DISTINCT vendor_name) FROM vendors 
+            SELECT COUNT(DISTINCT company_id) FROM products 
             WHERE discovered_date = ?
         """, (today,))
         total_discovered = cursor.fetchone()[0]
@@ -60,37 +60,45 @@ class TelegramReporter:
         # High-scoring vendors (>= 70) - WITH ALL THEIR PRODUCTS
         cursor.execute("""
             SELECT 
-                vendor_name,
+                company_id,
                 MAX(score) as best_score,
                 COUNT(*) as product_count
-            FROM vendors 
+            FROM products 
             WHERE discovered_date = ? AND score >= 70
-            GROUP BY vendor_name
+            GROUP BY company_id
             ORDER BY best_score DESC
             LIMIT 10
         """, (today,))
         high_score_vendors_summary = cursor.fetchall()
         
-        # Now get ALL products for each high-score vendor
-        high_score_vendors = []
-        for vendor_name, best_score, product_count in high_score_vendors_summary:
-            cursor.execute("""
+        # ALL of today's products of those vendors in one query (not one per vendor)
+        products_by_company = {}
+        if high_score_vendors_summary:
+            company_ids = [row[0] for row in high_score_vendors_summary]
+            cursor.execute(f"""
                 SELECT 
-                    product_name,
-                    product_url,
-                    contact_email,
-                    price_per_unit,
-                    moq,
-                    score,
-                    product_description,
-                    url as vendor_url
-                FROM vendors
-                WHERE vendor_name = ? AND discovered_date = ?
-                ORDER BY score DESC
-            """, (vendor_name, today))
-            
-            products = cursor.fetchall()
-            
+                    p.company_id,
+                    c.name,
+                    p.product_name,
+                    p.product_url,
+                    ct.email as contact_email,
+                    p.price_per_unit,
+                    p.moq,
+                    p.score,
+                    p.product_description,
+                    c.url as vendor_url
+                FROM products p
+                JOIN companies c ON c.id = p.company_id
+                LEFT JOIN contacts ct ON ct.id = p.contact_id
+                WHERE p.discovered_date = ? AND p.company_id IN ({', '.join('?' * len(company_ids))})
+                ORDER BY p.score DESC
+            """, (today, *company_ids))
+            for company_id, name, *product in cursor.fetchall():
+                products_by_company.setdefault(company_id, (name, []))[1].append(tuple(product))
+        
+        high_score_vendors = []
+        for company_id, best_score, product_count in high_score_vendors_summary:
+            vendor_name, products = products_by_company.get(company_id, ('', []))
             high_score_vendors.append({
                 'vendor_name': vendor_name,
                 'best_score': best_score,
@@ -101,13 +109,15 @@ class TelegramReporter:
         # Medium-scoring vendors (50-69) - DEDUPLICATED
         cursor.execute("""
             SELECT 
-                vendor_name,
-                MAX(score) as best_score,
+                c.name,
+                MAX(p.score) as best_score,
                 COUNT(*) as product_count,
-                contact_email
-            FROM vendors 
-            WHERE discovered_date = ? AND score >= 50 AND score < 70
-            GROUP BY vendor_name
+                MAX(ct.email) as contact_email
+            FROM products p
+            JOIN companies c ON c.id = p.company_id
+            LEFT JOIN contacts ct ON ct.id = p.contact_id
+            WHERE p.discovered_date = ? AND p.score >= 50 AND p.score < 70
+            GROUP BY p.company_id
             ORDER BY best_score DESC
             LIMIT 5
         """, (today,))
@@ -115,31 +125,32 @@ class TelegramReporter:
         
         # Emails sent today
         cursor.execute("""
-            SELECT COUNT(*) FROM vendors 
+            SELECT COUNT(*) FROM contacts 
             WHERE last_email_date = ? AND email_sent_count > 0
         """, (today,))
         emails_sent = cursor.fetchone()[0]
         
         # Replies received today
         cursor.execute("""
-            SELECT COUNT(*) FROM vendors 
+            SELECT COUNT(*) FROM conversations 
             WHERE last_response_date = ?
         """, (today,))
         replies_received = cursor.fetchone()[0]
         
         # Vendors with responses
         cursor.execute("""
-            SELECT vendor_name, email_response, price_quoted, moq_quoted, response_time_hours
-            FROM vendors 
-            WHERE last_response_date = ?
-            ORDER BY response_time_hours ASC
+            SELECT c.name, cv.email_response, cv.price_quoted, cv.moq_quoted, cv.response_time_hours
+            FROM conversations cv
+            JOIN companies c ON c.id = cv.company_id
+            WHERE cv.last_response_date = ?
+            ORDER BY cv.response_time_hours ASC
             LIMIT 5
         """, (today,))
         vendors_with_responses = cursor.fetchall()
         
         # Keywords used today
         cursor.execute("""
-            SELECT DISTINCT keywords_used FROM vendors 
+            SELECT DISTINCT keywords_used FROM products 
             WHERE discovered_date = ?
         """, (today,))
         keywords_results = cursor.fetchall()
@@ -9,12 +9,24 @@ Examples:
   - "maybe - need to check specifications first"
 """
 
-import sqlite3
 import requests
 import re
 from datetime import datetime
 from typing import Dict, Optional, Tuple
+import db
 from config import VENDORS_DB
+from text_matching import KeywordMatcher
+
+# Important keywords to track in feedback reasons
+REASON_KEYWORDS = KeywordMatcher({
+    'price': ['price', 'pricing', 'cost', 'expensive', 'cheap', 'affordable'],
+    'battery': ['battery', 'batteries', 'power'],
+    'wall_mount': ['wall mount', 'wall-mount', 'mounting', 'vesa'],
+    'email': ['email', 'contact', 'reach'],
+    'specifications': ['specs', 'specifications', 'features'],
+    'quality': ['quality', 'build', 'premium', 'cheap looking'],
+    'customization': ['custom', 'customizable', 'modify', 'oem', 'odm'],
+})
 
 class TelegramTextFeedbackCollector:
     """Collect text-based feedback from Telegram replies"""
@@ -24,48 +36,14 @@ class TelegramTextFeedbackCollector:
         self.chat_id = chat_id
         self.api_url = f"https://api.telegram.org/bot{bot_token}"
         self.db_path = VENDORS_DB
-        self._setup_feedback_tables()
-    
-    def _setup_feedback_tables(self):
-        """Create feedback tables if not exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Add feedback columns to vendors table
-        cursor.execute("PRAGMA table_info(vendors)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'human_feedback' not in columns:
-            cursor.execute("ALTER TABLE vendors ADD COLUMN human_feedback TEXT")
-        if 'feedback_reason' not in columns:
-            cursor.execute("ALTER TABLE vendors ADD COLUMN feedback_reason TEXT")
-        if 'feedback_date' not in columns:
-            cursor.execute("ALTER TABLE vendors ADD COLUMN feedback_date TEXT")
-        if 'telegram_message_id' not in columns:
-            cursor.execute("ALTER TABLE vendors ADD COLUMN telegram_message_id INTEGER")
-        
-        # Create feedback patterns table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS feedback_patterns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_type TEXT NOT NULL,
-                feature_value TEXT NOT NULL,
-                sentiment TEXT NOT NULL,
-                count INTEGER DEFAULT 1,
-                last_seen TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(feature_type, feature_value, sentiment)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        db.ensure_schema(self.db_path)  # Feedback columns / tables: db.py migrations, once per process
     
     def send_vendor_for_review(self, vendor_id: int) -> Optional[int]:
         """
         Send vendor to Telegram for text-based feedback
         Returns message_id if sent successfully
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -135,10 +113,10 @@ Example: <code>relevant - good price, wall mount, no battery</code>
                 message_id = data.get('result', {}).get('message_id')
                 
                 # Save message_id to database
-                conn = sqlite3.connect(self.db_path)
+                conn = db.connect(self.db_path)
                 cursor = conn.cursor()
                 cursor.execute("""
-                    UPDATE vendors 
+                    UPDATE products 
                     SET telegram_message_id = ?
                     WHERE id = ?
                 """, (message_id, vendor_id))
@@ -167,7 +145,7 @@ Example: <code>relevant - good price, wall mount, no battery</code>
         Returns True if processed successfully
         """
         # Find vendor by telegram message ID
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -207,7 +185,7 @@ Example: <code>relevant - good price, wall mount, no battery</code>
         
         # Save feedback
         cursor.execute("""
-            UPDATE vendors 
+            UPDATE products 
             SET human_feedback = ?,
                 feedback_reason = ?,
                 feedback_date = ?
@@ -298,29 +276,17 @@ Example: <code>relevant - good price, wall mount, no battery</code>
           "has battery which we don't want" → learn "battery" is negative
           "wall mount is perfect" → learn "wall mount" is positive
         """
-        # Important keywords to track
-        keyword_patterns = {
-            'price': ['price', 'pricing', 'cost', 'expensive', 'cheap', 'affordable'],
-            'battery': ['battery', 'batteries', 'power'],
-            'wall_mount': ['wall mount', 'wall-mount', 'mounting', 'vesa'],
-            'email': ['email', 'contact', 'reach'],
-            'specifications': ['specs', 'specifications', 'features'],
-            'quality': ['quality', 'build', 'premium', 'cheap looking'],
-            'customization': ['custom', 'customizable', 'modify', 'oem', 'odm'],
-        }
+        hits = REASON_KEYWORDS.scan(reason)
         
-        reason_lower = reason.lower()
-        
-        for feature_type, keywords in keyword_patterns.items():
-            for keyword in keywords:
-                if keyword in reason_lower:
-                    cursor.execute("""
-                        INSERT INTO feedback_patterns (feature_type, feature_value, sentiment, count)
-                        VALUES (?, ?, ?, 1)
-                        ON CONFLICT(feature_type, feature_value, sentiment) 
-                        DO UPDATE SET count = count + 1, last_seen = CURRENT_TIMESTAMP
-                    """, (f'reason_keyword', keyword, sentiment))
-                    break  # Only count once per feature type
+        for feature_type in REASON_KEYWORDS.groups:
+            keyword = hits.first(feature_type)  # Only count once per feature type
+            if keyword:
+                cursor.execute("""
+                    INSERT INTO feedback_patterns (feature_type, feature_value, sentiment, count)
+                    VALUES (?, ?, ?, 1)
+                    ON CONFLICT(feature_type, feature_value, sentiment) 
+                    DO UPDATE SET count = count + 1, last_seen = CURRENT_TIMESTAMP
+                """, (f'reason_keyword', keyword, sentiment))
     
     def check_for_new_feedback(self, offset: int = 0) -> int:
         """
@@ -427,7 +393,7 @@ Example: <code>relevant - good price, wall mount, no battery</code>
 
     def get_learned_preferences(self) -> Dict:
         """Get patterns learned from text feedback"""
-        conn = sqlite3.connect(self.db_path)
+        conn = db.connect(self.db_path)
         cursor = conn.cursor()
         
         # Get positive patterns
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""db.py connection layer: pragmas, per-thread pooling, close() semantics, WAL readers, hot-column indexes"""
+
+import os
+import sqlite3
+import sys
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import db
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'vendors.db')
+    db.ensure_schema(path)
+    return path
+
+
+def in_thread(fn):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('value', fn()))
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+def test_pragmas(db_path):
+    conn = db.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    finally:
+        conn.close()
+
+
+def test_one_connection_per_thread(db_path):
+    first, second = db.connect(db_path), db.connect(db_path)
+    other = in_thread(lambda: db.connect(db_path)._conn)
+    assert first._conn is second._conn
+    assert other is not first._conn
+    first.close()
+    second.close()
+
+
+def test_close_rolls_back_only_when_the_last_handle_closes(db_path):
+    outer = db.connect(db_path)
+    inner = db.connect(db_path)
+    inner.execute("INSERT INTO companies (name) VALUES ('Pending Co.')")
+    inner.close()  # outer still has the connection: its transaction must survive
+    assert outer.in_transaction
+    outer.close()  # Last handle: uncommitted work is discarded, like closing a private connection
+
+    check = db.connect(db_path)
+    try:
+        assert check.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 0
+    finally:
+        check.close()
+
+
+def test_row_factory_is_per_handle(db_path):
+    rows = db.connect(db_path)
+    rows.row_factory = sqlite3.Row
+    plain = db.connect(db_path)
+    try:
+        assert isinstance(rows.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+        assert plain.execute("SELECT 1 AS one").fetchone() == (1,)
+    finally:
+        rows.close()
+        plain.close()
+
+
+def test_readers_are_not_blocked_by_an_open_write(db_path):
+    writer = db.connect(db_path)
+    try:
+        writer.execute("INSERT INTO companies (name) VALUES ('Committed Co.')")
+        writer.commit()
+        writer.execute("INSERT INTO companies (name) VALUES ('Uncommitted Co.')")
+
+        def read():
+            conn = db.connect(db_path)
+            try:
+                return [row[0] for row in conn.execute("SELECT name FROM companies")]
+            finally:
+                conn.close()
+
+        assert in_thread(read) == ['Committed Co.']  # WAL: snapshot of the last commit, no lock wait
+    finally:
+        writer.rollback()
+        writer.close()
+
+
+@pytest.mark.parametrize('query, index', [
+    ("SELECT * FROM products WHERE score >= 70", 'idx_products_score'),
+    ("SELECT * FROM products WHERE discovered_date >= '2026-01-01'", 'idx_products_date_score'),
+    ("SELECT * FROM contacts WHERE email = 'a@b.com'", 'idx_contacts_email'),
+    ("SELECT * FROM validation_logs WHERE vendor_id = 1", 'idx_validation_logs_vendor'),
+])
+def test_hot_queries_use_indexes(db_path, query, index):
+    conn = db.connect(db_path)
+    try:
+        plan = ' '.join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+        assert index in plan, plan
+    finally:
+        conn.close()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""DedupIndex: normalization, in-run registration, known vendors and seen cards across runs"""
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db
+from config import DEDUP
+from dedup_index import DedupIndex, content_fingerprint, normalize_name, normalize_url
+
+
+def card(n: int, **overrides):
+    vendor = {
+        'vendor_name': f'Shenzhen Vendor{n} Technology Co., Ltd.',
+        'product_url': f'https://www.made-in-china.com/product/{n}.html',
+        'raw_text': f'15.6 inch Android display {n}\nPrice: US$ {80 + n}\nMOQ: 10',
+    }
+    vendor.update(overrides)
+    return vendor
+
+
+def test_normalization():
+    assert normalize_url('HTTPS://www.Example.com/Product/1/?ref=x#top') == 'example.com/product/1'
+    assert normalize_url('example.com/product/1/') == 'example.com/product/1'
+    assert normalize_url(None) == ''
+    assert normalize_name('Shenzhen ABC Technology Co., Ltd.') == 'shenzhen abc'
+    assert content_fingerprint('Same  Card\nTEXT') == content_fingerprint('same card text')
+
+
+def test_registers_cards_within_a_run(tmp_path):
+    index = DedupIndex.load(str(tmp_path / 'vendors.db'))
+    assert index.check(card(1)) == (False, '')
+    assert index.check(card(1)) == (True, 'same card content')
+    assert index.check(card(1, raw_text='edited card')) == (True, 'known product URL')
+
+    no_url = card(2, product_url=None)
+    assert index.check(no_url) == (False, '')
+    assert index.check({**no_url, 'raw_text': 'other text',
+                        'vendor_name': 'Shenzhen Vendor2 Co. Ltd'}) == (True, 'known vendor name')
+    assert index.stats['checked'] == 5
+
+
+def test_loads_saved_vendors_and_seen_cards(tmp_path):
+    db_path = str(tmp_path / 'vendors.db')
+    db.ensure_schema(db_path)
+    saved = card(1)
+    conn = db.connect(db_path)
+    try:
+        company_id = db.upsert_company(conn, saved['vendor_name'])
+        conn.execute("INSERT INTO products (company_id, product_url, content_fingerprint) VALUES (?, ?, ?)",
+                     (company_id, saved['product_url'], content_fingerprint(saved['raw_text'])))
+        conn.commit()
+    finally:
+        conn.close()
+
+    first_run = DedupIndex.load(db_path)
+    first_run.mark_processed(card(2), 'rejected')
+    first_run.mark_processed(card(3), 'saved')
+
+    index = DedupIndex.load(db_path)
+    assert index.stats['loaded'] == 1
+    assert index.check(saved)[0]
+    assert index.check(card(2)) == (True, 'same card content')
+    assert index.check(card(3)) == (True, 'same card content')
+
+
+def test_old_rejected_cards_are_retried(tmp_path):
+    db_path = str(tmp_path / 'vendors.db')
+    DedupIndex.load(db_path).mark_processed(card(1), 'rejected')
+    conn = db.connect(db_path)
+    try:
+        conn.execute("UPDATE seen_cards SET last_seen = ?",
+                     (time.time() - (DEDUP['recheck_rejected_days'] + 1) * 86400,))
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert DedupIndex.load(db_path).check(card(1)) == (False, '')
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""http_client: shared cache lookup and retry policy, identical for the sync and async clients"""
+
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+pytest.importorskip('requests')
+
+from http_client import AsyncHTTPClient, HTTPClient, HTTPClientError, HTTPResponse
+from rate_limiter import HostRateLimiter
+from response_cache import ResponseCache
+
+URL = 'https://www.alibaba.com/trade/search?SearchText=tablet'
+
+
+def scripted(client, statuses):
+    """
+    Replace the transport with canned statuses (None = connection error,
+    (status, headers) = extra response headers); returns the call log
+    """
+    sent = []
+
+    def send(url, headers, timeout):
+        sent.append(dict(headers))
+        status = statuses[len(sent) - 1]
+        if status is None:
+            raise HTTPClientError('ConnectError: refused')
+        status, extra = status if isinstance(status, tuple) else (status, {})
+        return HTTPResponse(url, status, b'<html>%d</html>' % status, {'Content-Type': 'text/html', **extra})
+
+    async def async_send(url, headers, timeout):
+        return send(url, headers, timeout)
+
+    client._send = async_send if isinstance(client, AsyncHTTPClient) else send
+    return sent
+
+
+def fetch(client, url=URL, **kwargs):
+    if isinstance(client, AsyncHTTPClient):
+        return asyncio.run(client.get(url, **kwargs))
+    return client.get(url, **kwargs)
+
+
+@pytest.fixture(params=[HTTPClient, AsyncHTTPClient])
+def make_client(request, tmp_path):
+    def make(**overrides):
+        cache = ResponseCache(cache_dir=str(tmp_path / 'http'), offline=False)
+        return request.param(cache=cache, **{'backoff_seconds': 0, **overrides})
+    return make
+
+
+def test_retries_then_succeeds(make_client):
+    client = make_client(retries=2)
+    sent = scripted(client, [None, 503, 200])
+    assert fetch(client).status_code == 200
+    assert len(sent) == 3
+    assert (client.stats['requests'], client.stats['retries'], client.stats['errors']) == (1, 2, 0)
+
+
+def test_last_attempt_returns_the_error_status(make_client):
+    client = make_client(retries=1)
+    scripted(client, [503, 503])
+    assert fetch(client).status_code == 503  # Caller decides via raise_for_status
+
+
+def test_connection_errors_raise_after_the_last_attempt(make_client):
+    client = make_client(retries=1)
+    scripted(client, [None, None])
+    with pytest.raises(HTTPClientError):
+        fetch(client)
+    assert client.stats['errors'] == 1
+
+
+def test_second_get_is_served_from_cache(make_client):
+    client = make_client(retries=0)
+    sent = scripted(client, [200, 200])
+    assert not client.is_cached(URL)
+    first = fetch(client)
+    assert client.is_cached(URL)
+    assert fetch(client).content == first.content
+    assert len(sent) == 1
+    fetch(client, use_cache=False)
+    assert len(sent) == 2
+
+
+def test_retry_after_is_honoured_before_retrying(make_client, monkeypatch):
+    client = make_client(retries=1, backoff_seconds=30)
+    sleeps = []
+
+    async def async_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    monkeypatch.setattr(asyncio, 'sleep', async_sleep)
+    scripted(client, [(429, {'Retry-After': '2'}), 200])
+    assert fetch(client).status_code == 200
+    assert sleeps[-1] == 2.0  # Server's delay, not the 30 s backoff
+
+
+def test_retry_after_beyond_the_cap_returns_the_status(make_client):
+    client = make_client(retries=2, max_retry_after_seconds=5)
+    sent = scripted(client, [(503, {'Retry-After': '3600'}), 200])
+    assert fetch(client).status_code == 503
+    assert len(sent) == 1
+
+
+def test_every_async_attempt_takes_a_fresh_host_token(tmp_path):
+    limiter = HostRateLimiter({'www.alibaba.com': {'rate': 10, 'burst': 1}}, default_delay=1)
+    client = AsyncHTTPClient(cache=ResponseCache(cache_dir=str(tmp_path / 'http'), offline=False),
+                             rate_limiter=limiter, retries=2, backoff_seconds=30)
+    sent = scripted(client, [503, 503, 200])
+    start = time.monotonic()
+    assert fetch(client).status_code == 200
+    assert len(sent) == 3
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.1)  # Two refills at 10/s, no 30 s backoff
+    assert limiter.wait_seconds['www.alibaba.com'] == pytest.approx(0.2, abs=0.05)
+
+    fetch(client)  # Fresh cache hit: no token taken
+    assert len(sent) == 3
+    assert limiter.wait_seconds['www.alibaba.com'] == pytest.approx(0.2, abs=0.05)
+
+
+def test_304_for_a_lost_body_refetches_unconditionally(make_client):
+    client = make_client(retries=0)
+    sent = scripted(client, [(200, {'ETag': '"v1"', 'Cache-Control': 'no-cache'}), 304, 200])
+    fetch(client)
+    entry = client.cache.lookup(URL)
+    scripted_send = client._send
+
+    def lose_body_then_send(url, headers, timeout):
+        if len(sent) == 1:  # Body evicted while the conditional request was in flight
+            os.remove(client.cache._body_path(entry.body_hash))
+        return scripted_send(url, headers, timeout)
+
+    async def async_lose_body_then_send(url, headers, timeout):
+        return await lose_body_then_send(url, headers, timeout)
+
+    client._send = async_lose_body_then_send if isinstance(client, AsyncHTTPClient) else lose_body_then_send
+    response = fetch(client)
+    assert response.status_code == 200 and response.text == '<html>200</html>'
+    assert sent[1]['If-None-Match'] == '"v1"'
+    assert 'If-None-Match' not in sent[2]
+    assert client.cache.read_body(client.cache.lookup(URL)) == b'<html>200</html>'
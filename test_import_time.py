@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Import-time budget test for the entry points
+Each entry point is imported in a fresh interpreter (python -X importtime) and must:
+- stay under its cold-import budget (best of N runs, milliseconds)
+- not load heavy dependencies it does not need (langchain, langgraph, playwright, bs4, ...)
+- not print or do work at import time
+Entry points whose own dependencies are not installed are reported as skipped.
+
+Usage:
+    python -m pytest test_import_time.py
+    python test_import_time.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+LLM_STACK = ['langchain', 'langchain_core', 'langchain_ollama', 'langgraph', 'ollama']
+SCRAPER_STACK = ['playwright', 'bs4', 'httpx', 'scraper', 'pipeline', 'browser_pool']
+EMAIL_STACK = ['imaplib', 'smtplib', 'email_conversation', 'email_outreach']
+
+# entry point → (budget in ms, modules that must not be loaded by the import)
+ENTRY_POINTS = {
+    'process_text_feedback': (150, LLM_STACK + SCRAPER_STACK + EMAIL_STACK + ['oem_search']),
+    'telegram_callback_processor': (150, LLM_STACK + SCRAPER_STACK + EMAIL_STACK + ['oem_search']),
+    'oem_search': (250, LLM_STACK + SCRAPER_STACK + EMAIL_STACK),
+    'main_v2': (300, LLM_STACK + SCRAPER_STACK + EMAIL_STACK + ['replay', 'telegram_reporter', 'reporting']),
+}
+
+MARKER = '--- modules ---'
+
+
+def measure(module: str):
+    """(cumulative import µs, loaded module names, stdout printed during import) from a fresh interpreter"""
+    code = f"import sys, {module}; print({MARKER!r}); print(' '.join(sys.modules))"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        missing = [line for line in proc.stderr.splitlines() if line.startswith('ModuleNotFoundError')]
+        raise ImportError(missing[-1] if missing else proc.stderr.strip().splitlines()[-1])
+
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; top-level imports are not indented
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].rstrip() == f' {module}':
+            cumulative = int(parts[1])
+    printed, _, modules = proc.stdout.partition(MARKER)
+    return cumulative, set(modules.split()), printed.strip()
+
+
+def check(module: str, runs: int = 3):
+    """(best cold import ms, problems) for one entry point; ImportError if its dependencies are missing"""
+    budget_ms, forbidden = ENTRY_POINTS[module]
+    samples = [measure(module) for _ in range(runs)]
+
+    best_ms = min(cumulative for cumulative, _, _ in samples) / 1000
+    heavy = sorted(name for name in forbidden if name in samples[0][1])
+    printed = samples[0][2]
+
+    problems = []
+    if best_ms > budget_ms:
+        problems.append(f"over budget ({budget_ms} ms)")
+    if heavy:
+        problems.append(f"loads {', '.join(heavy)}")
+    if printed:
+        problems.append(f"prints at import: {printed.splitlines()[0][:60]!r}")
+    return best_ms, problems
+
+
+@pytest.mark.parametrize('module', list(ENTRY_POINTS))
+def test_import_budget(module):
+    try:
+        best_ms, problems = check(module)
+    except ImportError as e:
+        pytest.skip(str(e))
+    assert not problems, f"{module}: {best_ms:.1f} ms - {'; '.join(problems)}"
+
+
+def run(runs: int = 3) -> bool:
+    print("=" * 70)
+    print(f"IMPORT-TIME BUDGET (cold import, best of {runs})")
+    print("=" * 70)
+
+    ok = True
+    for module, (budget_ms, _) in ENTRY_POINTS.items():
+        try:
+            best_ms, problems = check(module, runs)
+        except ImportError as e:
+            print(f"⏭️  {module:30s} skipped ({e})")
+            continue
+
+        status = "✗" if problems else "✓"
+        print(f"{status} {module:30s} {best_ms:7.1f} ms / {budget_ms} ms"
+              + (f"  - {'; '.join(problems)}" if problems else ""))
+        ok = ok and not problems
+
+    print("=" * 70)
+    print("RESULT: ✓ ALL ENTRY POINTS WITHIN BUDGET" if ok else "RESULT: ✗ IMPORT BUDGET EXCEEDED")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 3) else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""json_stream: JSONScanner (strings, escapes, chunk boundaries), trimming, streaming early stop and its stats"""
+
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import json_stream
+from json_stream import JSONScanner, invoke_json, stream_json, trim_json
+
+ANSWER = '{"vendor_name": "Shenzhen {Brace} Co.", "note": "uses \\"}\\" and ] inside", "specs": {"os": ["Android 11"]}}'
+CHATTER = '\n\nNote: I extracted {these} fields from the card. Let me know if you need more!'
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(json_stream, '_stats', {name: 0 for name in json_stream._stats})
+    monkeypatch.setattr(json_stream, '_count_tokens', lambda text: len(text.split()) if text.strip() else 0)
+
+
+def scan(chunks, openers='{'):
+    scanner = JSONScanner(openers)
+    done = [scanner.feed(chunk) for chunk in chunks]
+    return scanner, done
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1000])
+def test_braces_and_escapes_inside_strings(chunk_size):
+    text = 'Here is the JSON:\n' + ANSWER + CHATTER
+    scanner, done = scan([text[i:i + chunk_size] for i in range(0, len(text), chunk_size)])
+    assert scanner.complete and done[-1]
+    value, trailing = scanner.result()
+    assert value == ANSWER
+    assert json.loads(value)['note'] == 'uses "}" and ] inside'
+    assert trailing.startswith('\n\nNote:')
+
+
+def test_escaped_backslash_before_closing_quote():
+    answer = '{"path": "C:\\\\", "x": "}"}'  # The string ends after an escaped backslash
+    scanner, _ = scan([answer + ' trailing }'])
+    assert scanner.result() == (answer, ' trailing }')
+    assert json.loads(scanner.result()[0]) == {'path': 'C:\\', 'x': '}'}
+
+
+def test_array_answers_and_openers():
+    batch = '[{"card_id": "1"}, {"card_id": "2 ]"}]'
+    scanner, _ = scan(['```json\n', batch, '\n```'], openers='[{')
+    assert scanner.result()[0] == batch
+
+    # With '{' only, a leading array is skipped and the first object is taken
+    scanner, _ = scan([batch], openers='{')
+    assert scanner.result()[0] == '{"card_id": "1"}'
+
+
+def test_incomplete_value_is_returned_as_is():
+    scanner, done = scan(['{"vendor_name": "Shenzhen', ' {A} Co."'])
+    assert not scanner.complete and not any(done)
+    assert scanner.result() == ('{"vendor_name": "Shenzhen {A} Co."', '')
+
+
+def test_trim_json_counts_trailing_tokens():
+    assert trim_json(ANSWER + CHATTER) == ANSWER
+    assert trim_json('no json here') == 'no json here'
+    assert json_stream._stats['calls'] == 2
+    assert json_stream._stats['trailing_tokens'] == len(CHATTER.split())
+
+
+class StreamingLLM:
+    """One token per chunk, like Ollama; records whether the stream was closed"""
+
+    def __init__(self, text: str, num_predict: int = None):
+        self.tokens = [text[i:i + 4] for i in range(0, len(text), 4)]
+        self.num_predict = num_predict
+        self.sent = 0
+        self.closed = False
+        self.kwargs = None
+
+    def stream(self, prompt, **kwargs):
+        self.kwargs = kwargs
+        try:
+            for token in self.tokens:
+                self.sent += 1
+                yield token
+        finally:
+            self.closed = True
+
+    def invoke(self, prompt, **kwargs):
+        return ''.join(self.tokens)
+
+
+def test_stream_stops_at_the_closing_brace():
+    llm = StreamingLLM(ANSWER + CHATTER, num_predict=200)
+    assert stream_json(llm, 'prompt') == ANSWER
+    assert llm.closed and llm.sent < len(llm.tokens)
+
+    s = json_stream._stats
+    assert (s['calls'], s['streamed'], s['early_stops'], s['capped_stops']) == (1, 1, 1, 1)
+    assert s['decoded_tokens'] == llm.sent
+    assert s['saved_at_most'] == 200 - llm.sent
+    assert 'saved at most' in json_stream.get_stats_report(vendors=1)
+
+
+def test_stream_without_a_cap_or_closing_brace():
+    llm = StreamingLLM('{"vendor_name": "cut off by num_predict')
+    assert stream_json(llm, 'prompt') == '{"vendor_name": "cut off by num_predict'
+    s = json_stream._stats
+    assert s['early_stops'] == 0 and s['saved_at_most'] == 0
+    assert s['decoded_tokens'] == len(llm.tokens)
+
+
+def test_invoke_json_dispatch(monkeypatch):
+    class Wrapper:
+        def invoke_json(self, prompt, openers='{', **kwargs):
+            return ('wrapper', openers, kwargs['stop'])
+
+    assert invoke_json(Wrapper(), 'p', '[{') == ('wrapper', '[{', json_stream.LLM_STREAMING['stop'])
+
+    llm = StreamingLLM(ANSWER + CHATTER)
+    assert invoke_json(llm, 'p') == ANSWER
+    assert llm.kwargs == {'stop': json_stream.LLM_STREAMING['stop']}
+
+    monkeypatch.setitem(json_stream.LLM_STREAMING, 'enabled', False)
+    assert invoke_json(StreamingLLM(ANSWER + CHATTER), 'p') == ANSWER
+    assert json_stream._stats['streamed'] == 1 and json_stream._stats['calls'] == 2
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""llm_registry: shared clients per (model, params) and releasing every pinned model at exit"""
+
+import os
+import sys
+import types
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import llm_cache
+import llm_registry
+
+
+class FakeOllama:
+    def __init__(self):
+        self.released = []
+
+    def generate(self, model, keep_alive, **kwargs):
+        self.released.append((model, keep_alive))
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Empty registry, a stand-in OllamaLLM class and a recording Ollama client"""
+    monkeypatch.setattr(llm_registry, '_clients', {})
+    monkeypatch.setattr(llm_registry, '_warm', {})
+    monkeypatch.setattr(llm_registry, '_pinned', set())
+    monkeypatch.setitem(llm_registry.LLM_REGISTRY, 'prewarm', False)
+    monkeypatch.setattr(llm_cache, 'get_llm_cache', lambda: None)  # Keep the on-disk LLM cache out of it
+    monkeypatch.setitem(sys.modules, 'langchain_ollama',
+                        types.SimpleNamespace(OllamaLLM=lambda **kwargs: types.SimpleNamespace(**kwargs)))
+    ollama = FakeOllama()
+    monkeypatch.setattr(llm_registry, '_ollama_client', lambda timeout: ollama)
+    return ollama
+
+
+def test_clients_are_shared_per_model_and_params(registry):
+    first = llm_registry.get_llm('qwen2.5:7b', temperature=0.1)
+    assert llm_registry.get_llm('qwen2.5:7b', temperature=0.1) is first
+    assert llm_registry.get_llm('qwen2.5:7b', temperature=0.3) is not first
+    assert first.llm.keep_alive == llm_registry.LLM_REGISTRY['keep_alive']
+
+
+def test_release_unpins_models_without_prewarm(registry):
+    llm_registry.get_llm('qwen2.5:7b')
+    llm_registry.get_llm('llama3.2:3b', temperature=0.0)
+    assert llm_registry.prewarm('qwen2.5:7b') is None  # Prewarm disabled in config
+
+    llm_registry.release()
+    idle = llm_registry.LLM_REGISTRY['idle_keep_alive']
+    assert registry.released == [('llama3.2:3b', idle), ('qwen2.5:7b', idle)]
+
+
+def test_release_is_a_no_op_when_nothing_was_pinned(registry, monkeypatch):
+    llm_registry.release()
+    assert registry.released == []
+
+    monkeypatch.setitem(llm_registry.LLM_REGISTRY, 'keep_alive', llm_registry.LLM_REGISTRY['idle_keep_alive'])
+    llm_registry.get_llm('qwen2.5:7b')
+    llm_registry.release()
+    assert registry.released == []
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""db.py migrations: new database, populated V1 wide vendors table, databases stamped mid-way"""
+
+import os
+import sqlite3
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db
+from dedup_index import DedupIndex
+from running_stats import VendorStats
+
+LATEST = db.MIGRATIONS[-1][0]
+
+# The original vendors table, before migrate_database.py added the V2 columns
+V1_VENDORS = """
+    CREATE TABLE vendors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vendor_name TEXT NOT NULL,
+        url TEXT,
+        platform TEXT,
+        moq INTEGER,
+        price_per_unit REAL,
+        customizable BOOLEAN,
+        os TEXT,
+        screen_size TEXT,
+        touchscreen BOOLEAN,
+        camera_front BOOLEAN,
+        score INTEGER,
+        status TEXT,
+        raw_data TEXT,
+        contacted BOOLEAN DEFAULT 0,
+        contact_date TEXT,
+        reply_received BOOLEAN DEFAULT 0,
+        reply_date TEXT,
+        reply_content TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE validation_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        vendor_id INTEGER,
+        validation_passed BOOLEAN,
+        layer_results TEXT,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (vendor_id) REFERENCES vendors (id)
+    );
+"""
+
+
+def populated_v1_db(path: str) -> str:
+    conn = sqlite3.connect(path)
+    conn.executescript(V1_VENDORS)
+    conn.executemany(
+        "INSERT INTO vendors (id, vendor_name, url, platform, moq, price_per_unit, score, status, "
+        "contacted, reply_received, reply_content) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (1, 'Shenzhen A Co., Ltd.', 'https://a.example.com', 'alibaba', 100, 95.0, 80, 'validated', 1, 1, 'Yes, OEM ok'),
+            (2, 'Shenzhen A Co., Ltd.', 'https://a.example.com', 'alibaba', 50, 120.0, 70, 'validated', 1, 0, None),
+            (3, 'Guangzhou B Ltd.', 'https://b.example.com', 'made-in-china', 10, 150.0, 60, 'rejected', 0, 0, None),
+        ]
+    )
+    conn.executemany("INSERT INTO validation_logs (vendor_id, validation_passed, layer_results) VALUES (?, ?, ?)",
+                     [(1, 1, '[]'), (3, 0, '[]'), (99, 0, '[]')])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def versions(path: str):
+    conn = db.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+    finally:
+        conn.close()
+
+
+def test_new_database(tmp_path):
+    path = str(tmp_path / 'vendors.db')
+    assert db.migrate(path) == LATEST
+    assert versions(path) == [version for version, _, _ in db.MIGRATIONS]
+
+    conn = db.connect(path)
+    try:
+        for table in ('companies', 'products', 'contacts', 'conversations', 'validation_logs',
+                      'feedback_patterns', 'relevance_patterns', 'seen_cards', 'running_stats'):
+            assert db.table_exists(conn, table), table
+        view_columns = [col[0] for col in conn.execute("SELECT * FROM vendors LIMIT 0").description]
+        assert view_columns == [column for column, _ in db.VENDOR_VIEW_COLUMNS]
+    finally:
+        conn.close()
+
+
+def test_populated_v1_database(tmp_path):
+    path = populated_v1_db(str(tmp_path / 'vendors.db'))
+    assert db.migrate(path) == LATEST
+
+    conn = db.connect(path)
+    try:
+        rows = conn.execute("SELECT id, vendor_name, moq, price_per_unit, contacted, reply_received, reply_content "
+                            "FROM vendors ORDER BY id").fetchall()
+        assert rows == [
+            (1, 'Shenzhen A Co., Ltd.', 100, 95.0, 0, 1, 'Yes, OEM ok'),
+            (2, 'Shenzhen A Co., Ltd.', 50, 120.0, 0, 1, 'Yes, OEM ok'),
+            (3, 'Guangzhou B Ltd.', 10, 150.0, 0, 0, None),
+        ]
+        assert conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 2
+        # Product ids are the old vendor ids; logs for vanished vendors lose their link
+        assert conn.execute("SELECT vendor_id FROM validation_logs ORDER BY id").fetchall() == [(1,), (3,), (None,)]
+        assert conn.execute("SELECT type FROM sqlite_master WHERE name = 'vendors'").fetchone()[0] == 'view'
+    finally:
+        conn.close()
+
+
+def test_database_stamped_at_v1(tmp_path):
+    """A database migrated by the single-migration layer (indexes only) gets everything after it"""
+    path = populated_v1_db(str(tmp_path / 'vendors.db'))
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE schema_version (version INTEGER PRIMARY KEY, description TEXT,
+                                     applied_at TEXT DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO schema_version (version, description) VALUES (1, 'indexes on hot vendor columns');
+    """)
+    conn.commit()
+    conn.close()
+
+    assert db.migrate(path) == LATEST
+    assert versions(path) == [version for version, _, _ in db.MIGRATIONS]
+    conn = db.connect(path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 3
+        assert db.table_exists(conn, 'seen_cards')
+    finally:
+        conn.close()
+
+
+def test_migrate_is_idempotent(tmp_path):
+    path = populated_v1_db(str(tmp_path / 'vendors.db'))
+    db.migrate(path)
+    assert db.migrate(path) == LATEST
+
+    # Every migration can re-run on an up-to-date schema
+    conn = db.connect(path)
+    try:
+        for _, _, migration in db.MIGRATIONS[1:]:
+            conn.execute("BEGIN")
+            migration(conn)
+            conn.rollback()
+    finally:
+        conn.close()
+
+
+def test_state_tables_come_from_migrations(tmp_path):
+    path = str(tmp_path / 'vendors.db')
+    index = DedupIndex.load(path)
+    index.mark_processed({'raw_text': 'card', 'vendor_name': 'X', 'product_url': None}, 'rejected')
+    assert VendorStats.load(path) is None
+    assert versions(path)[-1] == LATEST
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""near_duplicates MinHash/LSH index and the pipeline's near-duplicate grouping"""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from near_duplicates import MinHasher, NearDuplicateIndex, set_near_duplicate_index, shingles
+
+BASE_CARD = """15.6 inch Android 11 wall mount tablet display, IPS 1920x1080, 10 point capacitive touch,
+RK3566 quad core, 2GB RAM 16GB ROM, WiFi, Ethernet, PoE, front camera 2MP, VESA 100 mount,
+aluminium frame, OEM ODM logo customization, DC 12V, Price US$ 95-110, MOQ 10 pieces"""
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b)
+
+
+def test_signature_similarity_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    rng = random.Random(7)
+    universe = [f"shingle {i}" for i in range(400)]
+    for _ in range(20):
+        a = set(rng.sample(universe, 120))
+        b = set(rng.sample(sorted(a), 80)) | set(rng.sample(universe, 40))
+        estimate = MinHasher.similarity(hasher.signature(a), hasher.signature(b))
+        assert abs(estimate - jaccard(a, b)) < 0.12
+
+
+def test_signatures_are_stable_across_instances():
+    card = shingles(BASE_CARD, 'Shenzhen A Co., Ltd.')
+    assert MinHasher().signature(card) == MinHasher().signature(card)
+    assert MinHasher().signature(set()) == MinHasher().signature(set())
+
+
+def test_query_finds_retitled_listing_only(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / 'minhash.db'))
+    index.add('vendor:1', BASE_CARD, 'Shenzhen A Co., Ltd.')
+
+    retitled = BASE_CARD.replace('15.6 inch Android 11', '15.6" Android 11 POE')
+    match = index.query(retitled, 'Shenzhen A Co., Ltd.')
+    assert match and match[0] == 'vendor:1' and match[1] >= index.threshold
+
+    other = """32 inch floor standing digital signage kiosk, Windows 10, i5 CPU, 8GB RAM,
+    infrared touch, thermal printer, QR scanner, Price US$ 650, MOQ 1 set"""
+    assert index.query(other, 'Guangzhou B Ltd.') is None
+    assert index.stats['queries'] == 2 and index.stats['matches'] == 1
+
+
+def test_only_persisted_cards_survive_a_reload(tmp_path):
+    path = str(tmp_path / 'minhash.db')
+    index = NearDuplicateIndex(path)
+    index.add('vendor:1', BASE_CARD, 'Shenzhen A Co., Ltd.')
+    index.add('run:abc', 'some other card text entirely about kiosks', 'B', persist=False)
+
+    reloaded = NearDuplicateIndex(path)
+    assert set(reloaded.signatures) == {'vendor:1'}
+    assert reloaded.query(BASE_CARD, 'Shenzhen A Co., Ltd.')[0] == 'vendor:1'
+
+
+# ---------- pipeline grouping ----------
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    import pipeline as pipeline_module
+    from dedup_index import DedupIndex
+    from vendor_history import VendorHistory, set_vendor_history
+
+    monkeypatch.setattr(pipeline_module, 'build_agent', lambda *args, **kwargs: None)  # Grouping only, no LLM
+    previous_index = set_near_duplicate_index(NearDuplicateIndex(str(tmp_path / 'minhash.db')))
+    previous_history = set_vendor_history(VendorHistory())
+    yield pipeline_module.VendorPipeline(None, dedup_index=DedupIndex(str(tmp_path / 'vendors.db')))
+    set_vendor_history(previous_history)
+    set_near_duplicate_index(previous_index)
+
+
+def listing(n: int):
+    return {'vendor_name': 'Shenzhen A Co., Ltd.',
+            'raw_text': BASE_CARD.replace('MOQ 10 pieces', f'MOQ 10 pieces listing {n}')}
+
+
+def test_members_wait_for_the_representative(pipeline):
+    representative, first, second = listing(0), listing(1), listing(2)
+    assert pipeline._near_duplicate_of(representative) is None
+    assert pipeline._near_duplicate_of(first)
+    assert pipeline._near_duplicate_of(second)
+
+    # Representative rejected → the next member is tried, the other keeps waiting
+    pipeline._settle_near_duplicates(representative, saved=False)
+    assert pipeline._promoted == [first]
+    assert pipeline.results['promoted'] == 1
+
+    # Promoted member saved → the rest of the group stays skipped, later copies are not held
+    pipeline._settle_near_duplicates(first, saved=True)
+    assert pipeline._near_duplicate_of(listing(3))
+    pipeline._promoted.clear()
+    pipeline._settle_near_duplicates(second, saved=False)
+    assert pipeline._promoted == []
+
+
+def test_saved_representative_suppresses_its_group(pipeline):
+    representative, member = listing(0), listing(1)
+    pipeline._near_duplicate_of(representative)
+    pipeline._near_duplicate_of(member)
+    pipeline._settle_near_duplicates(representative, saved=True)
+    assert pipeline._promoted == []
+    assert len(pipeline.near_duplicate_groups) == 1
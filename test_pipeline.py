@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""pipeline: micro-batching in PipelineStage (incl. pre-formed Batches) and run_batches, as replay drives it"""
+
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import pipeline as pipeline_module
+from near_duplicates import NearDuplicateIndex, set_near_duplicate_index
+from pipeline import Batch, PipelineStage
+
+
+def run_stage(feed, batch_size=3, workers=1):
+    seen = []
+
+    async def handler(items):
+        seen.append(items)
+        return []
+
+    async def main():
+        stage = PipelineStage('extract', handler, workers, queue_size=100, batch_size=batch_size)
+        for item in feed:
+            await stage.queue.put(item)  # Queue everything up front, like a fast producer
+        await stage.close()
+        await stage.run()
+
+    asyncio.run(main())
+    return seen
+
+
+def test_waiting_items_are_batched_up_to_batch_size():
+    assert run_stage(['a', 'b', 'c', 'd']) == [['a', 'b', 'c'], ['d']]
+
+
+def test_batches_are_never_split_or_merged():
+    feed = [Batch(['a', 'b']), 'c', 'd', Batch(['e']), Batch(['f', 'g', 'h', 'i'])]
+    assert run_stage(feed) == [['a', 'b'], ['c', 'd'], ['e'], ['f', 'g', 'h', 'i']]
+
+
+def test_every_item_reaches_some_worker():
+    feed = [Batch([n, n + 1]) if n % 3 == 0 else n for n in range(30)]
+    seen = run_stage(feed, workers=3)
+    expected = sorted(x for item in feed for x in (item if isinstance(item, Batch) else [item]))
+    assert sorted(x for batch in seen for x in batch) == expected
+
+
+@pytest.fixture
+def replay_pipeline(tmp_path, monkeypatch):
+    """VendorPipeline with the LLM and database nodes replaced by recorders"""
+    from dedup_index import DedupIndex
+    from vendor_history import VendorHistory, set_vendor_history
+
+    class Agent:
+        def invoke(self, state):
+            return {**state, 'status': 'extracted'}
+
+    calls = {'batches': [], 'saved': []}
+    monkeypatch.setattr(pipeline_module, 'build_agent', lambda *args, **kwargs: Agent())
+
+    def extract_vendors_batch(texts):
+        calls['batches'].append(texts)
+        return [{} for _ in texts]
+
+    monkeypatch.setattr(pipeline_module, 'extract_vendors_batch', extract_vendors_batch)
+    monkeypatch.setattr(pipeline_module, 'make_initial_state',
+                        lambda raw_text, query='', extracted=None: {'raw_html': raw_text})
+    monkeypatch.setattr(pipeline_module, 'AGENT_NODES', [
+        ('validate', lambda state: state),
+        ('score', lambda state: state),
+        ('save', lambda state: calls['saved'].append(state['raw_html']) or {**state, 'status': 'saved'}),
+        ('notify', lambda state: state),
+    ])
+    monkeypatch.setattr(pipeline_module, 'get_vendor_writer',
+                        lambda: type('Writer', (), {'flush': lambda self: None})())
+    previous_index = set_near_duplicate_index(NearDuplicateIndex(str(tmp_path / 'minhash.db')))
+    previous_history = set_vendor_history(VendorHistory())
+    node_timings = {}
+    yield pipeline_module.VendorPipeline(None, dedup_index=DedupIndex(str(tmp_path / 'vendors.db')),
+                                         node_timings=node_timings), calls, node_timings
+    set_vendor_history(previous_history)
+    set_near_duplicate_index(previous_index)
+
+
+def test_run_batches_keeps_recorded_groups(replay_pipeline):
+    pipeline, calls, node_timings = replay_pipeline
+    groups = [[{'raw_text': f'card {g}.{i}', 'vendor_name': f'V{g}.{i}'} for i in range(size)]
+              for g, size in enumerate([3, 1, 2])]
+
+    assert asyncio.run(pipeline.run_batches(groups)) == 6
+    assert sorted(calls['batches']) == sorted([[v['raw_text'] for v in group] for group in groups])
+    assert sorted(calls['saved']) == sorted(v['raw_text'] for group in groups for v in group)
+    assert len(node_timings['batch']) == 3 and len(node_timings['save']) == 6
+    assert pipeline.stages[0].stats['in'] == 0  # Replay enters at extraction: no dedupe pass
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""prompt_compaction: boilerplate/duplicate removal and priority-ordered budget fitting"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import prompt_compaction
+from prompt_compaction import clean_lines, compact_text, count_tokens
+
+CARD = """PRODUCT LISTING FROM MADE-IN-CHINA SEARCH RESULTS:
+Title: 15.6 inch Android 11 Wall Mount Smart Display
+Vendor/Supplier: Shenzhen TechDisplay Co., Ltd.
+Price: Not found in listing
+MOQ: 10 Pieces
+
+FULL PRODUCT CARD TEXT:
+Home
+Sign In
+15.6 inch Android 11 Wall Mount Smart Display
+Shenzhen TechDisplay   Co.,  Ltd.
+Gold Member Since 2015
+US$ 95-110 / Piece
+Screen: 15.6 inch IPS 1920x1080
+RAM: 2GB
+Great quality and fast shipping from our factory team
+Contact Now
+INSTRUCTIONS FOR EXTRACTION:
+- Extract the vendor name
+- Use null if missing
+"""
+
+
+@pytest.fixture(autouse=True)
+def estimate_tokens(monkeypatch):
+    """Chars-per-token estimate, so budgets don't depend on a downloaded tokenizer"""
+    monkeypatch.setattr(prompt_compaction, '_tokenizer', False)
+
+
+def test_clean_lines_drops_boilerplate_and_repeats():
+    lines = clean_lines(CARD)
+    assert lines == [
+        'Title: 15.6 inch Android 11 Wall Mount Smart Display',
+        'Vendor/Supplier: Shenzhen TechDisplay Co., Ltd.',
+        'MOQ: 10 Pieces',
+        'US$ 95-110 / Piece',
+        'Screen: 15.6 inch IPS 1920x1080',
+        'RAM: 2GB',
+        'Great quality and fast shipping from our factory team',
+    ]
+
+
+def test_everything_kept_when_it_fits():
+    text = compact_text(CARD, 1000)
+    assert text.splitlines() == clean_lines(CARD)
+
+
+def test_key_lines_win_under_a_tight_budget():
+    lines = clean_lines(CARD)
+    key_lines = [lines[0], lines[1], lines[2], lines[3]]
+    budget = sum(count_tokens(line) + 1 for line in key_lines)
+    kept = compact_text(CARD, budget).splitlines()
+    assert kept == key_lines  # Company / price / MOQ / title first, original order
+    assert sum(count_tokens(line) + 1 for line in kept) <= budget
+
+
+def test_spec_lines_before_free_text():
+    lines = clean_lines(CARD)
+    budget = sum(count_tokens(line) + 1 for line in lines[:6])
+    kept = compact_text(CARD, budget).splitlines()
+    assert 'Screen: 15.6 inch IPS 1920x1080' in kept and 'RAM: 2GB' in kept
+    assert not any(line.startswith('Great quality') for line in kept)
+
+
+def test_stats_report():
+    before = dict(prompt_compaction._stats)
+    compact_text(CARD, 1000)
+    assert prompt_compaction._stats['cards'] == before['cards'] + 1
+    assert prompt_compaction._stats['tokens_out'] < prompt_compaction._stats['tokens_in']
+    assert 'estimate' in prompt_compaction.get_stats_report()
+
+
+def test_output_does_not_depend_on_the_tokenizer(monkeypatch):
+    """Replay hashes prompts, so a dev box with tokenizer.json must compact exactly like CI"""
+    estimated = compact_text(CARD, 40)
+
+    class OneTokenPerChar:
+        def encode(self, text, add_special_tokens=False):
+            return type('Encoding', (), {'ids': list(text)})()
+
+    monkeypatch.setattr(prompt_compaction, '_tokenizer', OneTokenPerChar())
+    before = prompt_compaction._stats['tokens_out']
+    assert compact_text(CARD, 40) == estimated
+    assert prompt_compaction._stats['tokens_out'] - before == len(estimated)  # Reported with the tokenizer
+    assert 'tokenizer' in prompt_compaction.get_stats_report()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""rate_limiter: token bucket pacing, arrival order, and hosts that never wait on each other"""
+
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from rate_limiter import HostRateLimiter, TokenBucket
+
+
+def test_burst_then_paced():
+    async def run():
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        waits = [await bucket.acquire() for _ in range(4)]
+        return waits, time.monotonic() - start
+
+    waits, elapsed = asyncio.run(run())
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.05, abs=0.02)
+    assert elapsed == pytest.approx(0.1, abs=0.04)
+
+
+def test_concurrent_waiters_keep_arrival_order_without_serialising_sleeps():
+    async def run():
+        bucket = TokenBucket(rate=20, burst=1)
+        done = []
+
+        async def waiter(i):
+            waited = await bucket.acquire()
+            done.append(i)
+            return waited
+
+        start = time.monotonic()
+        waits = await asyncio.gather(*(waiter(i) for i in range(5)))
+        return done, waits, time.monotonic() - start
+
+    done, waits, elapsed = asyncio.run(run())
+    assert done == [0, 1, 2, 3, 4]
+    assert waits == sorted(waits) and waits[0] == 0.0
+    assert elapsed == pytest.approx(0.2, abs=0.06)  # One token every 50 ms, not more
+
+
+def test_throttled_host_does_not_delay_other_hosts():
+    limiter = HostRateLimiter({'slow.example': {'rate': 2, 'burst': 1}}, default_delay=0.01)
+
+    async def run():
+        finished = {}
+
+        async def fetch(url):
+            await limiter.wait(url)
+            finished.setdefault(limiter.host_of(url), []).append(time.monotonic())
+
+        start = time.monotonic()
+        await asyncio.gather(*[fetch('https://slow.example/search') for _ in range(3)],
+                             fetch('https://fast.example/search'))
+        return {host: [t - start for t in times] for host, times in finished.items()}
+
+    finished = asyncio.run(run())
+    assert finished['fast.example'][0] < 0.05
+    assert finished['slow.example'][-1] == pytest.approx(1.0, abs=0.1)
+    assert limiter.wait_seconds['slow.example'] == pytest.approx(1.5, abs=0.1)  # 0 + 0.5 + 1.0
+
+
+def test_slot_caps_in_flight_fetches_across_hosts():
+    limiter = HostRateLimiter({}, default_delay=0.001, max_concurrent=2)
+
+    async def run():
+        in_flight, peak = 0, 0
+
+        async def fetch(url):
+            nonlocal in_flight, peak
+            await limiter.wait(url)
+            async with limiter.slot():
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.02)
+                in_flight -= 1
+
+        await asyncio.gather(*(fetch(f'https://host{i}.example/') for i in range(6)))
+        return peak
+
+    assert asyncio.run(run()) == 2
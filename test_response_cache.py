@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""response_cache: URL-class TTLs, Cache-Control (no-store / no-cache / max-age), revalidation"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import response_cache
+from response_cache import ResponseCache, cache_control
+
+URL = 'https://www.made-in-china.com/products-search/hot-china-products/tablet.html'
+HTML = {'Content-Type': 'text/html', 'ETag': '"v1"'}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(cache_dir=str(tmp_path / 'http'), offline=False,
+                         ttls={'search': 3600, 'product': 3600, 'profile': 3600, 'default': 3600})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, 'time', lambda: now[0])
+    return now
+
+
+def test_parse_cache_control():
+    assert cache_control({'cache-control': 'public, Max-Age="60", no-cache'}) == \
+        {'public': None, 'max-age': '60', 'no-cache': None}
+    assert cache_control({'Content-Type': 'text/html'}) == {}
+
+
+def test_url_class_ttl_without_cache_control(cache, clock):
+    cache.store(URL, {}, 200, HTML, b'<html>page</html>')
+    clock[0] += 3599
+    assert cache.lookup(URL).fresh
+    clock[0] += 2
+    assert not cache.lookup(URL).fresh
+
+
+def test_no_store_is_never_cached(cache):
+    cache.store(URL, {}, 200, HTML, b'<html>old</html>')
+    cache.store(URL, {}, 200, {**HTML, 'Cache-Control': 'private, no-store'}, b'<html>new</html>')
+    assert cache.lookup(URL) is None  # The older copy is dropped too
+    assert cache.stats['no_store'] == 1 and cache.stats['stored'] == 1
+
+
+def test_no_cache_is_stored_but_always_revalidated(cache):
+    cache.store(URL, {}, 200, {**HTML, 'Cache-Control': 'no-cache'}, b'<html>page</html>')
+    entry = cache.lookup(URL)
+    assert entry is not None and not entry.fresh
+    assert not cache.is_fresh(URL)
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"v1"'}
+
+
+def test_max_age_overrides_the_url_class_ttl(cache, clock):
+    cache.store(URL, {}, 200, {**HTML, 'Cache-Control': 'max-age=60'}, b'<html>page</html>')
+    clock[0] += 59
+    assert cache.is_fresh(URL) and cache.lookup(URL).fresh
+    clock[0] += 2
+    assert not cache.is_fresh(URL)  # Well inside the one-hour search TTL
+
+
+def test_revalidation_takes_the_304_cache_control(cache, clock):
+    cache.store(URL, {}, 200, {**HTML, 'Cache-Control': 'no-cache'}, b'<html>page</html>')
+    cache.mark_revalidated(cache.lookup(URL), {'Cache-Control': 'max-age=120'})
+    clock[0] += 100
+    entry = cache.lookup(URL)
+    assert entry.fresh and entry.headers['Cache-Control'] == 'max-age=120'
+    assert cache.read_body(entry) == b'<html>page</html>'
+
+
+def test_offline_serves_no_cache_entries(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path / 'http'), offline=True)
+    cache.store(URL, {}, 200, {'Cache-Control': 'no-cache'}, b'<html>page</html>')
+    assert cache.is_fresh(URL)
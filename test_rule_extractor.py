@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""RuleBasedExtractor: fields and confidences from scraper cards, uncertain fields, merge, targeted prompts"""
+
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from rule_extractor import ABSENT_CONFIDENCE, RuleBasedExtractor, build_targeted_prompt
+
+CARD = """PRODUCT LISTING FROM MADE-IN-CHINA SEARCH RESULTS:
+Title: 15.6 inch Android 11 Wall Mount Smart Display with PoE
+Vendor/Supplier: Shenzhen TechDisplay Co., Ltd.
+Price: US$ 95-110 / Piece
+MOQ: 10 Pieces
+Product URL: https://www.made-in-china.com/product/abc.html
+
+FULL PRODUCT CARD TEXT:
+15.6" IPS capacitive touchscreen, 2MP front camera, VESA bracket, DC 12V adapter, no battery.
+OEM/ODM logo customization. Contact: sales@techdisplay.com
+Digital signage for meeting rooms.
+INSTRUCTIONS FOR EXTRACTION:
+- Extract the vendor name
+"""
+
+
+@pytest.fixture
+def extractor():
+    return RuleBasedExtractor(min_confidence=0.7)
+
+
+def test_complete_card_needs_no_llm(extractor):
+    data, confidence = extractor.extract(CARD)
+    assert data['vendor_name'] == 'Shenzhen TechDisplay Co., Ltd.'
+    assert data['product_name'] == '15.6 inch Android 11 Wall Mount Smart Display with PoE'
+    assert data['price_per_unit'] == 95.0  # Low end of the range
+    assert data['moq'] == 10
+    assert data['os'] == 'Android 11'
+    assert data['screen_size'] == '15.6 inch'
+    assert (data['touchscreen'], data['camera_front'], data['wall_mount'], data['has_battery']) == \
+        (True, True, True, False)
+    assert data['product_type'] == 'smart screen'
+    assert data['customizable'] is True
+    assert data['contact_email'] == 'sales@techdisplay.com'
+    assert data['product_url'] == 'https://www.made-in-china.com/product/abc.html'
+    assert 'INSTRUCTIONS' not in data['description'] and 'Title:' not in data['description']
+    assert extractor.uncertain_fields(confidence) == []
+
+
+def test_missing_and_ambiguous_fields_go_to_the_llm(extractor):
+    card = """Shenzhen Foo Electronics Co., Ltd.
+Portable 10.1 inch tablet pc / 15.6 inch version, wall mount bracket optional
+Price negotiable, contact supplier"""
+    data, confidence = extractor.extract(card)
+    uncertain = extractor.uncertain_fields(confidence)
+    assert data['price_per_unit'] is None and 'price_per_unit' in uncertain  # "price" hint present
+    assert data['screen_size'] == '10.1 inch' and 'screen_size' in uncertain  # Two sizes
+    assert data['wall_mount'] is True and 'wall_mount' in uncertain  # Wall and portable
+    assert 'vendor_name' not in uncertain
+
+
+def test_fields_without_any_hint_are_confidently_absent(extractor):
+    _, confidence = extractor.extract("Shenzhen Foo Co., Ltd. 21.5 inch panel, US$ 80, MOQ 5")
+    for field in ('touchscreen', 'camera_front', 'has_battery', 'customizable', 'os'):
+        assert confidence[field] == ABSENT_CONFIDENCE
+
+
+def test_negative_keywords_win(extractor):
+    data, _ = extractor.extract("Non-touch 32 inch advertising display, built-in battery free design")
+    assert data['touchscreen'] is False
+    assert data['has_battery'] is False
+
+
+def test_junk_emails_are_skipped(extractor):
+    data, _ = extractor.extract("noreply@made-in-china.com test@test.com sales@vendor.cn")
+    assert data['contact_email'] == 'sales@vendor.cn'
+
+
+def test_merge_takes_only_asked_fields():
+    rule_data = {'vendor_name': 'Rule Co., Ltd.', 'price_per_unit': None, 'contact_email': 'a@b.com'}
+    llm_data = {'vendor_name': 'LLM Co.', 'price_per_unit': 99.0, 'contact_email': 'made@up.com'}
+    merged = RuleBasedExtractor.merge(rule_data, llm_data, ['price_per_unit'])
+    assert merged == {'vendor_name': 'Rule Co., Ltd.', 'price_per_unit': 99.0, 'contact_email': 'a@b.com'}
+    assert RuleBasedExtractor.merge(rule_data, {'price_per_unit': None}, ['price_per_unit']) == rule_data
+
+
+def test_targeted_prompt_and_stats(extractor):
+    data, _ = extractor.extract(CARD)
+    prompt = build_targeted_prompt(CARD, ['price_per_unit', 'moq'], data)
+    assert '{"price_per_unit":null,"moq":null}' in prompt
+    assert '- vendor_name: Shenzhen TechDisplay Co., Ltd.' in prompt  # Known fields as context
+    assert '- moq: 10' not in prompt
+
+    extractor.record([])
+    extractor.record(['price_per_unit', 'moq'])
+    assert extractor.stats == {'llm_skipped': 1, 'targeted_llm': 1, 'fields_asked': 2}
+    assert '1/2 cards without LLM' in extractor.get_stats_report()
+
+
+def test_stats_survive_concurrent_workers(extractor):
+    def worker():
+        for i in range(2000):
+            extractor.record(['moq'] if i % 2 else [])
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert extractor.stats == {'llm_skipped': 8000, 'targeted_llm': 8000, 'fields_asked': 8000}
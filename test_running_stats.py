@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""running_stats: P² quantiles against exact quantiles, Welford moments, anomaly verdicts, persistence"""
+
+import bisect
+import json
+import math
+import os
+import random
+import statistics
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import running_stats
+from running_stats import P2Quantile, RunningStats, VendorStats, parse_number
+
+
+def rank_of(sorted_values, value) -> float:
+    """Fraction of the samples below value"""
+    return bisect.bisect_left(sorted_values, value) / len(sorted_values)
+
+
+@pytest.mark.parametrize('distribution', [
+    lambda rng: rng.uniform(0, 100),
+    lambda rng: rng.gauss(50, 10),
+    lambda rng: rng.lognormvariate(4, 0.8),  # Prices: long right tail
+])
+@pytest.mark.parametrize('p', [0.25, 0.5, 0.75])
+def test_p2_tracks_exact_quantile(distribution, p):
+    rng = random.Random(42)
+    values = [distribution(rng) for _ in range(5000)]
+    sketch = P2Quantile(p)
+    for value in values:
+        sketch.add(value)
+
+    ordered = sorted(values)
+    exact = ordered[int(p * (len(ordered) - 1))]
+    assert abs(rank_of(ordered, sketch.value()) - p) < 0.02, (sketch.value(), exact)
+
+
+def test_p2_is_exact_below_five_samples():
+    sketch = P2Quantile(0.5)
+    assert sketch.value() is None
+    for value in (30.0, 10.0, 20.0):
+        sketch.add(value)
+    assert sketch.value() == 20.0
+
+
+def test_p2_resumes_from_dict():
+    rng = random.Random(1)
+    values = [rng.uniform(0, 1) for _ in range(500)]
+    uninterrupted = P2Quantile(0.75)
+    for value in values:
+        uninterrupted.add(value)
+
+    resumed = P2Quantile(0.75)
+    for value in values[:200]:
+        resumed.add(value)
+    resumed = P2Quantile.from_dict(json.loads(json.dumps(resumed.to_dict())))
+    for value in values[200:]:
+        resumed.add(value)
+    assert resumed.value() == pytest.approx(uninterrupted.value())
+
+
+def test_welford_matches_statistics_on_log_scale():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(4, 0.5) for _ in range(1000)]
+    stats = RunningStats()
+    for value in values + [None, 0, -5]:  # Missing / non-positive values are ignored
+        stats.add(value)
+
+    logs = [math.log(v) for v in values]
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.fmean(logs))
+    assert stats.std == pytest.approx(statistics.stdev(logs))
+    assert stats.quantile(1) == pytest.approx(statistics.median(values), rel=0.05)
+
+
+def test_anomaly_verdicts():
+    rng = random.Random(5)
+    stats = RunningStats()
+    for _ in range(9):
+        stats.add(rng.uniform(90, 130))
+    assert stats.is_anomaly(10000) == (False, None)  # Not before min_samples
+
+    for _ in range(200):
+        stats.add(rng.uniform(90, 130))
+    assert not stats.is_anomaly(115)[0]
+    assert stats.is_anomaly(1100)[0]
+    assert stats.is_anomaly(11)[0]
+    assert stats.iqr_outlier(1100) and not stats.iqr_outlier(100)
+
+
+def test_iqr_method(monkeypatch):
+    rng = random.Random(5)
+    stats = RunningStats()
+    for _ in range(209):
+        stats.add(rng.uniform(90, 130))
+    assert stats.is_anomaly(190)[0]  # Beyond 3.5 robust sigmas...
+
+    monkeypatch.setitem(running_stats.ANOMALY_DETECTION, 'method', 'iqr')
+    assert not stats.is_anomaly(190)[0]  # ...but inside the far-out fences
+    assert stats.is_anomaly(1100)[0] and stats.is_anomaly(11)[0]
+    assert not stats.is_anomaly(115)[0]
+
+
+def test_parse_number():
+    assert parse_number('US$ 1,200') == 1200.0
+    assert parse_number('MOQ: 10 pieces') == 10.0
+    assert parse_number(95) == 95.0
+    assert parse_number(True) is None
+    assert parse_number('negotiable') is None
+
+
+def test_vendor_stats_persist(tmp_path):
+    db_path = str(tmp_path / 'vendors.db')
+    assert VendorStats.load(db_path) is None
+
+    stats = VendorStats()
+    for n in range(20):
+        stats.add({'price_per_unit': f'US$ {100 + n}', 'moq': 10 + n})
+    stats.save(db_path)
+
+    loaded = VendorStats.load(db_path)
+    assert loaded['price_per_unit'].count == 20
+    assert loaded['moq'].quantile(1) == pytest.approx(stats['moq'].quantile(1))
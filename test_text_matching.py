@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""text_matching: keyword groups (Aho-Corasick and substring fallback), compiled pattern lists, Myers search"""
+
+import os
+import random
+import re
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import text_matching
+from text_matching import KeywordMatcher, compile_any, keyword_matcher
+
+GROUPS = {
+    'wall_mount': ['Wall Mount', 'VESA', 'wall-mounted'],
+    'battery': ['battery', 'mAh'],
+    'os': ['android', 'linux', 'windows'],
+}
+CARD = "15.6 inch ANDROID 11 panel, VESA 100 bracket, DC 12V (no battery), wall-mounted kiosk"
+
+
+@pytest.fixture(params=['automaton', 'substring'])
+def matcher(request, monkeypatch):
+    if request.param == 'substring':
+        monkeypatch.setattr(text_matching, 'AHOCORASICK_AVAILABLE', False)
+    elif not text_matching.AHOCORASICK_AVAILABLE:
+        pytest.skip('pyahocorasick not installed')
+    return KeywordMatcher(GROUPS)
+
+
+def test_groups_found_in_one_scan(matcher):
+    hits = matcher.scan(CARD)
+    assert hits.any('wall_mount') and hits.any('battery') and hits.any('os')
+    assert hits.all('wall_mount') == ['vesa', 'wall-mounted']  # Declared order, lowercased
+    assert hits.first('os') == 'android'
+    assert hits.first('battery') == 'battery'
+
+
+def test_scan_misses_and_pre_lowered_text(matcher):
+    hits = matcher.scan("21.5 inch LINUX signage", lowered=False)
+    assert not hits.any('wall_mount') and hits.first('os') == 'linux'
+    assert matcher.scan("LINUX", lowered=True).first('os') is None  # Caller promised lowercase text
+    assert not matcher.scan(None).any('os')
+
+
+def test_overlapping_keywords(matcher):
+    overlapping = KeywordMatcher({'mount': ['wall mount', 'mount', 'wall']})
+    assert overlapping.scan('WALL MOUNTING').all('mount') == ['wall mount', 'mount', 'wall']
+
+
+def test_keyword_matcher_is_cached():
+    assert keyword_matcher(('loop video', 'no customization')) is keyword_matcher(('loop video', 'no customization'))
+
+
+def test_compile_any():
+    pattern = compile_any([r'moq|minimum order', r'^title:'], re.IGNORECASE)
+    assert pattern.search('Minimum Order: 10')
+    assert pattern.search('TITLE: 15.6 inch')
+    assert not pattern.search('no title: here')
+
+
+# ---------- approximate substring search ----------
+def reference_distance(pattern: str, text: str) -> int:
+    """Textbook DP: edit distance of pattern to its best-matching substring of text"""
+    previous = list(range(len(pattern) + 1))
+    best = previous[-1]
+    for char in text:
+        current = [0]  # A match may start anywhere in the text
+        for i, pattern_char in enumerate(pattern, 1):
+            current.append(min(previous[i] + 1, current[i - 1] + 1, previous[i - 1] + (pattern_char != char)))
+        best = min(best, current[-1])
+        previous = current
+    return best
+
+
+def mutate(rng, value: str, edits: int, alphabet: str) -> str:
+    chars = list(value)
+    for _ in range(edits):
+        op, i = rng.randrange(3), rng.randrange(len(chars) + 1)
+        if op == 0 or not chars:
+            chars.insert(i, rng.choice(alphabet))
+        elif op == 1:
+            del chars[min(i, len(chars) - 1)]
+        else:
+            chars[min(i, len(chars) - 1)] = rng.choice(alphabet)
+    return ''.join(chars)
+
+
+@pytest.mark.parametrize('alphabet', ['ab', 'acgt', 'abcdefghijklmnopqrstuvwxyz0123456789'])
+def test_myers_distance_matches_reference(alphabet):
+    rng = random.Random(len(alphabet))
+    for _ in range(300):
+        pattern = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 80)))
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 120)))
+        if pattern and rng.random() < 0.5:  # Plant a near copy so small distances are covered too
+            position = rng.randrange(len(text) + 1)
+            text = text[:position] + mutate(rng, pattern, rng.randrange(4), alphabet) + text[position:]
+        assert text_matching.myers_distance(pattern, text) == reference_distance(pattern, text), (pattern, text)
+
+
+def test_myers_distance_long_pattern():
+    pattern = 'shenzhentechdisplaycoltd' * 5  # > 64 characters: Python ints are not limited to a word
+    text = 'companyprofile' + pattern.replace('display', 'dispaly', 1) + 'mainproducts'
+    assert text_matching.myers_distance(pattern, text) == reference_distance(pattern, text) == 2
+
+
+@pytest.mark.parametrize('min_similarity', [0.7, 0.8, 0.9])
+def test_fuzzy_similarity_matches_reference(min_similarity):
+    rng = random.Random(int(min_similarity * 10))
+    alphabet = 'abcdefghijklmnopqrstuvwxyz0123456789'
+    for _ in range(400):
+        value = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(1, 40)))
+        source = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 200)))
+        if rng.random() < 0.7:
+            position = rng.randrange(len(source) + 1)
+            source = source[:position] + mutate(rng, value, rng.randrange(len(value) // 3 + 1), alphabet) \
+                + source[position:]
+
+        expected = 1 - reference_distance(value, source) / len(value)
+        expected = expected if expected >= min_similarity else 0.0
+        assert text_matching.fuzzy_similarity(value, source, min_similarity) == pytest.approx(expected), \
+            (value, source)
+
+
+def test_fuzzy_similarity_on_vendor_names():
+    source = text_matching.normalize_alnum("Supplier: Shenzhen Tech-Display Co., Ltd. | Gold Member")
+    assert text_matching.normalize_alnum('Co., Ltd.') == 'coltd'
+    assert text_matching.fuzzy_similarity(text_matching.normalize_alnum('Shenzhen TechDisplay Co'), source) == 1.0
+    assert text_matching.fuzzy_similarity('shenzentechdisplay', source) == pytest.approx(1 - 1 / 18)
+    assert text_matching.fuzzy_similarity('guangzhouabcltd', source) == 0.0
+    assert text_matching.fuzzy_similarity('', source) == 0.0
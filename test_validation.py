@@ -25,7 +25,9 @@ test_vendor = {
     "screen_size": "15.6 inch",
     "touchscreen": "capacitive touchscreen",
     "camera_front": "2MP front camera",
-    "esim_support": "eSIM",
+    "wall_mount": None,
+    "has_battery": None,
+    "product_type": "display",
     "description": "15.6 inch Android Tablet Display with IPS LCD 1920x1080 touchscreen"
 }
 
@@ -53,7 +55,9 @@ schema = {
     "screen_size": (str, type(None)),
     "touchscreen": (bool, type(None)),
     "camera_front": (bool, type(None)),
-    "esim_support": (bool, type(None)),
+    "wall_mount": (bool, type(None)),
+    "has_battery": (bool, type(None)),
+    "product_type": (str, type(None)),
     "description": str,
 }
 
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""vendor_history / check_data_uniqueness: counts and duplicates match the old list-of-dicts scan"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from anti_hallucination import DataQualityChecker
+from vendor_history import VendorHistory
+
+
+def rows(n, **fields):
+    return [{'vendor_name': 'Shenzhen TechDisplay Co., Ltd.', 'product_url': f'https://x.com/p{i}', **fields}
+            for i in range(n)]
+
+
+def test_email_threshold_counts_rows():
+    # One supplier saving four products with the same email: four rows, as the list scan counted
+    history = VendorHistory(rows(4, contact_email='sales@techdisplay.com'))
+    assert history.email_count('sales@techdisplay.com') == 4
+    ok, reason = DataQualityChecker.check_data_uniqueness({'contact_email': 'sales@techdisplay.com'}, history)
+    assert not ok and 'appears in 4 vendors' in reason
+
+    ok, _ = DataQualityChecker.check_data_uniqueness(
+        {'contact_email': 'sales@techdisplay.com'}, VendorHistory(rows(3, contact_email='sales@techdisplay.com')))
+    assert ok
+
+
+def test_price_threshold_counts_rows():
+    assert DataQualityChecker.check_data_uniqueness({'price_per_unit': 99.0},
+                                                    VendorHistory(rows(5, price_per_unit=99.0)))[0]
+    assert not DataQualityChecker.check_data_uniqueness({'price_per_unit': 99.0},
+                                                        VendorHistory(rows(6, price_per_unit=99.0)))[0]
+
+
+@pytest.mark.parametrize('record, expected', [
+    ({'contact_email': 'sales@techdisplay.com'}, False),
+    ({'price_per_unit': 99.0}, False),
+    ({'vendor_name': 'Shenzhen TechDisplay Co., Ltd.', 'product_url': 'https://x.com/p2'}, False),
+    ({'vendor_name': 'Shenzhen TechDisplay Co., Ltd.', 'product_url': 'https://x.com/new'}, True),
+])
+def test_history_and_plain_list_agree(record, expected):
+    saved = rows(6, contact_email='sales@techdisplay.com', price_per_unit=99.0)
+    assert DataQualityChecker.check_data_uniqueness(record, saved)[0] is expected
+    assert DataQualityChecker.check_data_uniqueness(record, VendorHistory(saved))[0] is expected
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""VendorWriter: batched commits, duplicate products, one bad row failing alone"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import db
+from vendor_history import VendorHistory, set_vendor_history
+from vendor_writer import VENDOR_COLUMNS, VendorWriter
+
+
+def make_row(n: int, **overrides):
+    values = {column: None for column in VENDOR_COLUMNS}
+    values.update({
+        'vendor_name': f'Shenzhen {n} Display Co., Ltd.',
+        'url': f'https://vendor{n}.example.com',
+        'platform': 'made-in-china',
+        'contact_email': f'sales@vendor{n}.com',
+        'product_name': f'15.6 inch display {n}',
+        'product_url': f'https://www.made-in-china.com/product/{n}.html',
+        'price_per_unit': 80.0 + n,
+        'moq': 10,
+        'score': 70,
+        'status': 'validated',
+        'discovered_date': '2026-01-01T00:00:00',
+    })
+    values.update(overrides)
+    record = {k: values[k] for k in ('vendor_name', 'product_url', 'contact_email', 'price_per_unit', 'moq')}
+    return record, tuple(values[column] for column in VENDOR_COLUMNS)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    db_path = str(tmp_path / 'vendors.db')
+    db.ensure_schema(db_path)
+    previous_history = set_vendor_history(VendorHistory())
+    writer = VendorWriter(db_path, batch_size=100, flush_interval=60)
+    yield writer
+    writer.close()
+    set_vendor_history(previous_history)
+
+
+def count(writer, table: str) -> int:
+    conn = db.connect(writer.db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_batch_is_one_transaction(writer):
+    futures = [writer.submit(*make_row(n), layer_results='[]') for n in range(12)]
+    writer.flush()
+    results = [future.result(timeout=5) for future in futures]
+
+    assert all(inserted for _, inserted in results)
+    assert len({vendor_id for vendor_id, _ in results}) == 12
+    assert writer.stats['flushes'] == 1
+    assert count(writer, 'products') == 12
+    assert count(writer, 'validation_logs') == 12
+
+
+def test_duplicate_product_resolves_to_existing_id(writer):
+    first = writer.submit(*make_row(1), layer_results='[]')
+    again = writer.submit(*make_row(1), layer_results='[]')
+    writer.flush()
+
+    vendor_id, inserted = first.result(timeout=5)
+    assert inserted
+    assert again.result(timeout=5) == (vendor_id, False)
+    assert count(writer, 'products') == 1
+    assert count(writer, 'companies') == 1
+
+
+def test_bad_row_fails_alone(writer):
+    good_before = writer.submit(*make_row(1), layer_results='[]')
+    bad = writer.submit(*make_row(2, price_per_unit={'not': 'bindable'}), layer_results='[]')
+    good_after = writer.submit(*make_row(3), layer_results='[]')
+    writer.flush()
+
+    assert good_before.result(timeout=5)[1]
+    assert good_after.result(timeout=5)[1]
+    with pytest.raises(Exception):
+        bad.result(timeout=5)
+    assert writer.stats['errors'] == 1
+    assert count(writer, 'products') == 2
+    assert count(writer, 'validation_logs') == 2
+    # The failed vendor's company row was rolled back with it
+    assert count(writer, 'companies') == 2
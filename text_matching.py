@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Text Matching - Shared keyword / pattern scanning
+- Text is lowercased once per document
+- All keyword groups of a matcher are found in one scan:
+  Aho-Corasick automaton when pyahocorasick is installed,
+  otherwise one C-level substring search per distinct keyword
+- Regex pattern lists are compiled once at import (compile_any)
+
+Usage:
+    FEATURES = KeywordMatcher({'wall_mount': ['wall mount', 'vesa'], 'battery': ['battery']})
+    hits = FEATURES.scan(raw_text)
+    if hits.any('wall_mount'): ...
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def compile_any(patterns: Iterable[str], flags: int = 0) -> Pattern:
+    """One compiled regex matching any of the patterns"""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), flags)
+
+
+class KeywordHits:
+    """Keywords found in one document, queried per group"""
+
+    def __init__(self, matcher: 'KeywordMatcher', found: set):
+        self.matcher = matcher
+        self.found = found
+
+    def any(self, group: str) -> bool:
+        return any(keyword in self.found for keyword in self.matcher.groups[group])
+
+    def first(self, group: str) -> Optional[str]:
+        """First keyword of the group (in declared order) that occurs"""
+        return next((keyword for keyword in self.matcher.groups[group] if keyword in self.found), None)
+
+    def all(self, group: str) -> List[str]:
+        return [keyword for keyword in self.matcher.groups[group] if keyword in self.found]
+
+
+class KeywordMatcher:
+    """Named keyword groups, matched case-insensitively as substrings"""
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups: Dict[str, Tuple[str, ...]] = {
+            name: tuple(keyword.lower() for keyword in keywords) for name, keywords in groups.items()
+        }
+        self.keywords = sorted({keyword for keywords in self.groups.values() for keyword in keywords})
+
+        self.automaton = None
+        if AHOCORASICK_AVAILABLE and self.keywords:
+            self.automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+
+    def scan(self, text: str, lowered: bool = False) -> KeywordHits:
+        """lowered=True when the caller already has the lowercase text"""
+        text_lower = text if lowered else str(text or '').lower()
+        if self.automaton is not None:
+            found = {keyword for _, keyword in self.automaton.iter(text_lower)}
+        else:
+            found = {keyword for keyword in self.keywords if keyword in text_lower}
+        return KeywordHits(self, found)
+
+
+@lru_cache(maxsize=32)
+def keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Cached single-group matcher for keyword lists passed in at call time (e.g. red flags)"""
+    return KeywordMatcher({'keywords': keywords})
+
+
+# ==================== APPROXIMATE SUBSTRING SEARCH ====================
+NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+def normalize_alnum(text: str) -> str:
+    """Lowercase letters and digits only ('Co., Ltd.' → 'coltd')"""
+    return NON_ALNUM.sub('', str(text or '').lower())
+
+
+def myers_distance(pattern: str, text: str) -> int:
+    """
+    Smallest edit distance between `pattern` and any substring of `text`
+    Myers' bit-parallel algorithm: O(len(text)) word operations for the whole pattern
+    """
+    m = len(pattern)
+    if m == 0:
+        return 0
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    best = m
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+            if score < best:
+                best = score
+                if best == 0:
+                    break
+        ph = (ph << 1) & full  # No carry-in: a match may start anywhere in the text
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return best
+
+
+def fuzzy_similarity(value: str, source: str, min_similarity: float = 0.8) -> float:
+    """
+    1 - edit distance / len(value) of the best match of `value` inside `source`
+    (both already normalize_alnum'ed); 0.0 when below min_similarity
+    Pigeonhole filter: each edit breaks at most one of the k+1 pieces of the value,
+    so Myers only runs around exact piece hits, best-supported candidates first
+    """
+    m = len(value)
+    if m == 0 or not source:
+        return 0.0
+    if value in source:
+        return 1.0
+
+    max_edits = int(round(m * (1 - min_similarity), 9))  # round: 10 * 0.2 is 1.999...9
+    pieces = max_edits + 1
+    piece_len = m // pieces
+    if piece_len == 0:
+        return 0.0
+
+    # (offset where the value would begin, piece index) for every exact piece hit
+    hits = []
+    for p in range(pieces):
+        start = p * piece_len
+        piece = value[start:start + piece_len] if p < pieces - 1 else value[start:]
+        position = source.find(piece)
+        while position != -1:
+            hits.append((position - start, p))
+            position = source.find(piece, position + 1)
+    if not hits:
+        return 0.0
+
+    # Hits of one alignment lie within max_edits of each other
+    hits.sort()
+    candidates = []
+    first, last, found = hits[0][0], hits[0][0], {hits[0][1]}
+    for offset, p in hits[1:] + [(len(source) + m + max_edits + 1, None)]:
+        if offset - last <= max_edits:
+            last = offset
+            found.add(p)
+            continue
+        candidates.append((len(found), first, last))
+        first, last, found = offset, offset, {p}
+
+    best = max_edits + 1
+    for found_pieces, first, last in sorted(candidates, reverse=True):
+        if pieces - found_pieces >= best:  # Can't beat the best match so far
+            break
+        window = source[max(0, first - max_edits):last + m + max_edits]
+        best = min(best, myers_distance(value, window))
+
+    similarity = 1 - best / m
+    return similarity if similarity >= min_similarity else 0.0
@@ -6,6 +6,11 @@ import json
 from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
+from text_matching import KeywordMatcher, keyword_matcher, normalize_alnum, fuzzy_similarity
+from vendor_history import VendorHistory
+
+DESCRIPTION_KEYWORDS = KeywordMatcher({'mounted': ['wall', 'mount', 'signage']})
+
 class ValidationResult:
     """Result of a validation check"""
     def __init__(self, passed: bool, reason: str = "", confidence: float = 0.0):
@@ -73,6 +78,8 @@ class MultiLayerValidator:
             confidence_score = 0.0
             total_checks = 0
             failed_checks = []
+            source_lower = source_text.lower()
+            source_normalized = None  # Only built if a fuzzy match is needed
             
             # Only validate CRITICAL fields that must exist in source
             critical_fields = ['vendor_name', 'price_per_unit']
@@ -87,13 +94,17 @@ class MultiLayerValidator:
                 
                 total_checks += 1
                 value_str = str(value).lower()
-                source_lower = source_text.lower()
                 
                 # Check if the value or close variant exists in source
                 if value_str in source_lower:
                     confidence_score += 1.0
-                elif self._fuzzy_match(value_str, source_lower):
-                    confidence_score += 0.7
+                    continue
+                
+                if source_normalized is None:
+                    source_normalized = normalize_alnum(source_text)
+                similarity = self._fuzzy_match(value_str, source_normalized)
+                if similarity:
+                    confidence_score += similarity
                 else:
                     failed_checks.append(f"{field}='{value}' not found in source")
             
@@ -115,20 +126,15 @@ class MultiLayerValidator:
         except Exception as e:
             return ValidationResult(passed=False, reason=f"Factual check error: {str(e)}", confidence=0.0)
     
-    def _fuzzy_match(self, value: str, source: str) -> bool:
-        """Check if value exists with minor variations"""
-        # Remove common variations
-        value_clean = re.sub(r'[^a-z0-9]', '', value)
-        
-        # Check for partial matches (at least 80% of the value)
-        if len(value_clean) > 5:
-            chunk_size = int(len(value_clean) * 0.8)
-            for i in range(len(value_clean) - chunk_size + 1):
-                chunk = value_clean[i:i + chunk_size]
-                if chunk in source:
-                    return True
-        
-        return False
+    def _fuzzy_match(self, value: str, source_normalized: str) -> float:
+        """
+        Similarity (0.8-1.0) of the closest variant of value in the source, 0.0 if none
+        Both sides compared as lowercase letters/digits; source_normalized = normalize_alnum(source)
+        """
+        value_clean = normalize_alnum(value)
+        if len(value_clean) <= 5:
+            return 0.0
+        return fuzzy_similarity(value_clean, source_normalized, min_similarity=0.8)
     
     # ==================== LAYER 3: Constraint Check ====================
     def layer3_constraint_check(self, vendor_data: Dict[str, Any], requirements: Dict[str, Any]) -> ValidationResult:
@@ -152,7 +158,7 @@ class MultiLayerValidator:
             # Check product type - reject pure tablets
             product_type = str(vendor_data.get('product_type', '')).lower()
             desc = str(vendor_data.get('description', '')).lower()
-            if 'tablet' in product_type and 'wall' not in desc and 'mount' not in desc and 'signage' not in desc:
+            if 'tablet' in product_type and not DESCRIPTION_KEYWORDS.scan(desc, lowered=True).any('mounted'):
                 violations.append("CRITICAL: Product is a tablet, not a wall-mounted smart display")
             
             # Check MOQ
@@ -171,10 +177,12 @@ class MultiLayerValidator:
                         violations.append(f"Price too high: ${price} > ${max_price * 3.0}")
             
             # Check for red flags
-            description = str(vendor_data.get('description', '')).lower()
-            for red_flag in requirements.get('red_flags', []):
-                if red_flag.lower() in description:
-                    violations.append(f"Red flag detected: '{red_flag}'")
+            red_flags = tuple(requirements.get('red_flags', []))
+            if red_flags:
+                flag_hits = keyword_matcher(red_flags).scan(desc, lowered=True)
+                for red_flag in red_flags:
+                    if red_flag.lower() in flag_hits.found:
+                        violations.append(f"Red flag detected: '{red_flag}'")
             
             if violations:
                 return ValidationResult(
@@ -214,35 +222,34 @@ class MultiLayerValidator:
         try:
             if not historical_data:
                 return ValidationResult(passed=True, reason="No history to compare", confidence=0.8)
+            history = VendorHistory.of(historical_data)
             
-            # Check for duplicate vendors
+            # Check for duplicate vendors (token index instead of comparing every name)
             current_name = str(current_data.get('vendor_name', '')).lower()
-            for hist in historical_data:
-                hist_name = str(hist.get('vendor_name', '')).lower()
-                if current_name and hist_name and self._similar_strings(current_name, hist_name):
+            hist_name = history.duplicate_of(current_name, current_data.get('product_url'))
+            if current_name and hist_name:
+                return ValidationResult(
+                    passed=False,
+                    reason=f"Duplicate vendor detected: '{current_name}' similar to '{hist_name}'",
+                    confidence=0.0
+                )
+            
+            # Check for price / MOQ anomalies (robust z-score or IQR fences against running statistics)
+            for field, label, unit in (('price_per_unit', 'Price', '$'), ('moq', 'MOQ', '')):
+                current_value = self._extract_number(current_data.get(field)) if current_data.get(field) else None
+                if not current_value:
+                    continue
+                stats = history.stats[field]
+                is_anomaly, z = stats.is_anomaly(current_value)
+                if is_anomaly:
+                    detail = f"robust z {z:+.1f}" if z is not None else "outside the IQR fences"
                     return ValidationResult(
                         passed=False,
-                        reason=f"Duplicate vendor detected: '{current_name}' similar to '{hist_name}'",
-                        confidence=0.0
+                        reason=f"{label} anomaly: {unit}{current_value} vs median {unit}{stats.quantile(1):.2f} "
+                               f"({detail})",
+                        confidence=0.3
                     )
             
-            # Check for price anomalies
-            if current_data.get('price_per_unit'):
-                current_price = self._extract_number(current_data['price_per_unit'])
-                if current_price:
-                    prices = [self._extract_number(h.get('price_per_unit')) for h in historical_data if h.get('price_per_unit')]
-                    prices = [p for p in prices if p is not None]
-                    
-                    if len(prices) >= 3:
-                        avg_price = sum(prices) / len(prices)
-                        # Flag if price is 3x higher or 3x lower than average
-                        if current_price > avg_price * 3 or current_price < avg_price / 3:
-                            return ValidationResult(
-                                passed=False,
-                                reason=f"Price anomaly: ${current_price} vs avg ${avg_price:.2f}",
-                                confidence=0.3
-                            )
-            
             return ValidationResult(passed=True, reason="Consistency check passed", confidence=0.9)
         
         except Exception as e:
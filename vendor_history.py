@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Vendor History - Indexed in-memory snapshot of saved vendors
+Loaded once per run and passed to the agent as `historical_vendors`, so the
+consistency / uniqueness checks see the whole table without scanning it:
+- hash maps: email → row count, price → row count, (name, product_url) pairs
+- running price / MOQ statistics (running_stats.py, persisted)
+- name-token inverted index for similar-name lookups
+Updated on each save
+"""
+
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import db
+from config import VENDORS_DB
+from running_stats import VendorStats
+
+
+class VendorHistory:
+    """Answers the history questions of validators / DataQualityChecker in O(1) or O(log n)"""
+
+    FIELDS = ('vendor_name', 'product_url', 'contact_email', 'price_per_unit', 'moq')
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = (), stats: VendorStats = None):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.email_rows: Dict[str, int] = {}
+        self.price_rows: Dict[Any, int] = {}
+        self.pairs = set()  # (vendor_name, product_url)
+        self.products_by_name: Dict[str, set] = {}  # lowercase name → product URLs
+        self.name_tokens: Dict[str, set] = {}  # token → lowercase names
+        # Persisted statistics already include the records; otherwise build them here
+        self.stats = stats or VendorStats()
+        for record in records:
+            self.add(record, update_stats=stats is None)
+
+    @classmethod
+    def load(cls, db_path: str = None) -> 'VendorHistory':
+        """Snapshot of the vendors table (empty if it doesn't exist yet)"""
+        db_path = db_path or VENDORS_DB
+        conn = db.connect(db_path)
+        try:
+            rows = conn.execute(f"SELECT {', '.join(cls.FIELDS)} FROM vendors").fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            conn.close()
+
+        stats = VendorStats.load(db_path)
+        history = cls((dict(zip(cls.FIELDS, row)) for row in rows), stats)
+        if stats is None and rows:  # First run with statistics: backfill once
+            history.stats.save(db_path)
+        return history
+
+    @classmethod
+    def of(cls, history) -> 'VendorHistory':
+        """Accepts a VendorHistory or a plain list of vendor dicts"""
+        return history if isinstance(history, cls) else cls(history or [])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, record: Dict[str, Any], update_stats: bool = True):
+        """Register a saved vendor"""
+        vendor_name = record.get('vendor_name')
+        product_url = record.get('product_url')
+        name = str(vendor_name or '').lower()
+        email = record.get('contact_email')
+        price = record.get('price_per_unit')
+
+        with self._lock:
+            self.count += 1
+            if email:
+                self.email_rows[email] = self.email_rows.get(email, 0) + 1
+            if price:
+                self.price_rows[price] = self.price_rows.get(price, 0) + 1
+            self.pairs.add((vendor_name, product_url))
+            if name:
+                self.products_by_name.setdefault(name, set()).add(product_url)
+                for token in set(name.split()):
+                    self.name_tokens.setdefault(token, set()).add(name)
+            if update_stats:
+                self.stats.add(record)
+
+    # ---------- uniqueness ----------
+    def email_count(self, email: str) -> int:
+        """Saved rows using this email (same meaning as the old list scan)"""
+        return self.email_rows.get(email, 0) if email else 0
+
+    def price_count(self, price: Any) -> int:
+        """Saved rows quoting exactly this price"""
+        return self.price_rows.get(price, 0) if price else 0
+
+    def has_pair(self, vendor_name: str, product_url: str) -> bool:
+        return (vendor_name, product_url) in self.pairs
+
+    # ---------- similarity ----------
+    def similar_names(self, name: str, threshold: float = 0.8) -> List[str]:
+        """Known names with word-Jaccard >= threshold, via the token index"""
+        tokens = set(str(name or '').lower().split())
+        if not tokens:
+            return []
+        overlap: Dict[str, int] = {}
+        with self._lock:
+            for token in tokens:
+                for candidate in self.name_tokens.get(token, ()):
+                    overlap[candidate] = overlap.get(candidate, 0) + 1
+        return [
+            candidate for candidate, shared in overlap.items()
+            if shared / (len(tokens) + len(set(candidate.split())) - shared) >= threshold
+        ]
+
+    def duplicate_of(self, name: str, product_url: str = None, threshold: float = 0.8) -> Optional[str]:
+        """
+        Similar-named vendor already saved with the same product
+        (the same supplier with a different product is not a duplicate)
+        """
+        for candidate in self.similar_names(name, threshold):
+            if not product_url or product_url in self.products_by_name.get(candidate, ()):
+                return candidate
+        return None
+
+
+_shared_history: Optional[VendorHistory] = None
+
+
+def get_vendor_history() -> VendorHistory:
+    """Process-wide snapshot, loaded on first use"""
+    global _shared_history
+    if _shared_history is None:
+        _shared_history = VendorHistory.load()
+    return _shared_history
+
+
+def set_vendor_history(history: Optional[VendorHistory]) -> Optional[VendorHistory]:
+    """Swap the process-wide snapshot (replay uses an empty one); returns the previous one"""
+    global _shared_history
+    previous, _shared_history = _shared_history, history
+    return previous
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Vendor Writer - Write-behind buffer for saved vendors
+save_to_database() queues the vendor row + validation log and returns at once;
+a background thread writes the queue in ONE transaction every N vendors or T seconds
+- One commit (fsync) per batch instead of per vendor
+- Rows go to the normalized companies / contacts / products tables
+- Each vendor is its own SAVEPOINT: a bad row fails alone, the rest of the batch commits
+- Each submit() returns a Future of (vendor_id, inserted) for callers that need the id
+- Flushed on close() / interpreter exit
+"""
+
+import atexit
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import db
+from config import VENDORS_DB, VENDOR_WRITER
+from vendor_history import get_vendor_history
+
+VENDOR_COLUMNS = (
+    'vendor_name', 'url', 'platform', 'moq', 'price_per_unit',
+    'customizable', 'os', 'screen_size', 'touchscreen',
+    'camera_front', 'wall_mount', 'has_battery', 'product_type',
+    'contact_email', 'product_description', 'product_name', 'product_url',
+    'score', 'status', 'raw_data',
+    'discovered_date', 'content_fingerprint',
+)
+COMPANY_COLUMNS = ('vendor_name', 'url', 'platform')
+PRODUCT_COLUMNS = tuple(c for c in VENDOR_COLUMNS if c not in COMPANY_COLUMNS and c != 'contact_email')
+INSERT_PRODUCT = (f"INSERT OR IGNORE INTO products (company_id, contact_id, {', '.join(PRODUCT_COLUMNS)}) "
+                  f"VALUES (?, ?, {', '.join('?' * len(PRODUCT_COLUMNS))})")
+
+
+class VendorWriter:
+    """Batches vendor inserts; the only writer of products during a run"""
+
+    def __init__(self, db_path: str = None, batch_size: int = None, flush_interval: float = None):
+        self.db_path = db_path or VENDORS_DB
+        self.batch_size = batch_size or VENDOR_WRITER['batch_size']
+        self.flush_interval = flush_interval if flush_interval is not None else VENDOR_WRITER['flush_interval']
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_since = 0.0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # One batch in flight at a time
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self.stats = {'vendors': 0, 'inserted': 0, 'flushes': 0, 'errors': 0}
+
+    def submit(self, record: Dict[str, Any], row: Tuple, layer_results: str) -> Future:
+        """
+        Queue one vendor (row in VENDOR_COLUMNS order, i.e. the vendors view) and its validation log
+        The Future resolves to (vendor_id, inserted) once the batch is committed;
+        inserted is False when the vendor already had this product_url
+        """
+        future = Future()
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("VendorWriter is closed")
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append({'record': record, 'row': row, 'log': layer_results, 'future': future})
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='vendor-writer', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = self._pending_since + self.flush_interval
+                while len(self._pending) < self.batch_size and not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self.flush()
+
+    def flush(self):
+        """Write everything pending now (blocks until committed)"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        """
+        One transaction per batch, one SAVEPOINT per vendor: a row that fails is rolled back
+        on its own and only its future gets the exception; the rest of the batch is committed
+        """
+        conn = db.connect(self.db_path)
+        written = []  # (entry, (vendor_id, inserted))
+        try:
+            cursor = conn.cursor()
+            if not conn.in_transaction:
+                cursor.execute("BEGIN")  # Else releasing the first savepoint would commit on its own
+            for entry in batch:
+                cursor.execute("SAVEPOINT vendor")
+                try:
+                    result = self._write_one(cursor, conn, entry)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT vendor")
+                    cursor.execute("RELEASE SAVEPOINT vendor")
+                    self.stats['errors'] += 1
+                    print(f"✗ Database error (vendor {entry['record'].get('vendor_name', '?')}): {e}")
+                    entry['future'].set_exception(e)
+                    continue
+                cursor.execute("RELEASE SAVEPOINT vendor")
+                written.append((entry, result))
+            conn.commit()
+        except Exception as e:  # Commit itself failed: nothing of this batch is stored
+            conn.rollback()
+            self.stats['errors'] += len(written)
+            print(f"✗ Database error (batch of {len(batch)} vendors): {e}")
+            for entry, _ in written:
+                entry['future'].set_exception(e)
+            return
+        finally:
+            conn.close()
+
+        # Keep the history snapshot in step with the vendors table
+        history = get_vendor_history()
+        inserted = 0
+        for entry, (vendor_id, is_new) in written:
+            if is_new:
+                history.add(entry['record'])
+                inserted += 1
+        if inserted:
+            history.stats.save(self.db_path)
+
+        self.stats['vendors'] += len(written)
+        self.stats['inserted'] += inserted
+        self.stats['flushes'] += 1
+        for entry, result in written:
+            entry['future'].set_result(result)
+
+    @staticmethod
+    def _write_one(cursor, conn, entry: Dict[str, Any]) -> Tuple[Optional[int], bool]:
+        """Company, contact, product and validation log of one vendor → (vendor_id, inserted)"""
+        # Normalized tables (db.py migration 4): company and contact rows are shared
+        row = dict(zip(VENDOR_COLUMNS, entry['row']))
+        company_id = db.upsert_company(conn, row['vendor_name'], row['url'], row['platform'])
+        contact_id = db.upsert_contact(conn, company_id, row['contact_email']) if row['contact_email'] else None
+        cursor.execute(INSERT_PRODUCT, (company_id, contact_id, *(row[c] for c in PRODUCT_COLUMNS)))
+        if cursor.rowcount == 1:
+            vendor_id, inserted = cursor.lastrowid, True
+        else:  # Already saved: point the log (and caller) at the existing product
+            existing = cursor.execute(
+                "SELECT id FROM products WHERE company_id = ? AND product_url IS ?",
+                (company_id, row['product_url'])
+            ).fetchone()
+            vendor_id, inserted = (existing[0] if existing else None), False
+        cursor.execute(
+            "INSERT INTO validation_logs (vendor_id, validation_passed, layer_results) VALUES (?, ?, ?)",
+            (vendor_id, True, entry['log'])
+        )
+        return vendor_id, inserted
+
+    def close(self):
+        """Flush and stop the background thread"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def get_stats_report(self) -> str:
+        s = self.stats
+        per_flush = s['vendors'] / s['flushes'] if s['flushes'] else 0.0
+        return (f"Vendor writes: {s['vendors']} vendors ({s['inserted']} new) in {s['flushes']} "
+                f"transactions ({per_flush:.1f}/commit), {s['errors']} failed")
+
+
+_shared_writer: Optional[VendorWriter] = None
+_shared_lock = threading.Lock()
+
+
+def get_vendor_writer() -> VendorWriter:
+    """Process-wide writer, created on first use"""
+    global _shared_writer
+    with _shared_lock:
+        if _shared_writer is None:
+            _shared_writer = VendorWriter()
+        return _shared_writer
+
+
+def set_vendor_writer(writer: Optional[VendorWriter]) -> Optional[VendorWriter]:
+    """Swap the process-wide writer (replay uses a scratch one); returns the previous one"""
+    global _shared_writer
+    with _shared_lock:
+        previous, _shared_writer = _shared_writer, writer
+    return previous
+
+
+def _close_shared_writer():
+    if _shared_writer is not None:
+        _shared_writer.close()
+
+
+# Registered after db.close_all, so it runs before the final WAL checkpoint
+atexit.register(_close_shared_writer)